@@ -0,0 +1,189 @@
+"""
+Benchmarks of data access and rendering hot paths. They are run by pytest with pytest-benchmark plugin::
+
+    pytest benchmarks [--bench-rows 100000] [--bench-tables 50]
+
+Synthetic SQLite database of requested size is generated once and kept in pytest cache. Results are kept in
+``benchmarks/.results`` (not tracked by git): save run with commit id in file name to compare commits later::
+
+    pytest benchmarks --benchmark-autosave
+    pytest benchmarks --benchmark-compare --benchmark-compare-fail=median:10%
+    pytest-benchmark --storage benchmarks/.results compare --group-by=name
+
+Qt runs with ``offscreen`` platform unless ``QT_QPA_PLATFORM`` is set.
+"""
+
+import os
+import random
+import sqlite3
+import time
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+RESULTS_PATH = Path(__file__).parent / ".results"
+DATABASE_VERSION = 1  # change when schema or data of synthetic database changes
+
+STATUSES = ("new", "paid", "shipped", "delivered", "cancelled")
+WORDS = "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore".split()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("seeqler benchmarks")
+    group.addoption("--bench-rows", type=int, default=100_000, help="rows in the biggest table of synthetic database")
+    group.addoption("--bench-tables", type=int, default=50, help="number of extra tables for metadata loading")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    # saved runs are kept next to benchmarks whatever directory pytest is run from
+    if hasattr(config.option, "benchmark_storage"):
+        if config.option.benchmark_storage == "file://./.benchmarks":
+            config.option.benchmark_storage = f"file://{RESULTS_PATH}"
+
+
+def make_database(path: Path, rows: int, tables: int) -> None:
+    """
+    Generate database: ``users`` (``rows`` / 10 rows), ``orders`` (``rows`` rows, indexed and referencing users) and
+    ``tables`` small tables with several columns, indexes and foreign keys.
+    """
+    rnd = random.Random(42)
+    path.unlink(missing_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        create table users (
+            id integer primary key, name text not null, email text, age integer, score real, created_at text, bio text
+        );
+        create table orders (
+            id integer primary key, user_id integer not null references users (id), amount real, status text,
+            created_at text, note text
+        );
+        """)
+
+    def text(words: int) -> str:
+        return " ".join(rnd.choice(WORDS) for _ in range(words))
+
+    users = max(rows // 10, 1)
+    started = time.mktime((2020, 1, 1, 0, 0, 0, 0, 0, -1))
+    conn.executemany(
+        "insert into users values (?, ?, ?, ?, ?, ?, ?)",
+        (
+            (
+                idx,
+                f"user {idx}",
+                f"user{idx}@example.com",
+                rnd.randint(18, 90),
+                rnd.random() * 100,
+                time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(started + rnd.random() * 1e8)),
+                text(rnd.randint(0, 40)) or None,
+            )
+            for idx in range(1, users + 1)
+        ),
+    )
+    conn.executemany(
+        "insert into orders values (?, ?, ?, ?, ?, ?)",
+        (
+            (
+                idx,
+                rnd.randint(1, users),
+                round(rnd.random() * 1000, 2),
+                rnd.choice(STATUSES),
+                time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(started + rnd.random() * 1e8)),
+                text(rnd.randint(0, 10)) or None,
+            )
+            for idx in range(1, rows + 1)
+        ),
+    )
+    conn.execute("create index ix_orders_user on orders (user_id)")
+    conn.execute("create index ix_orders_created on orders (created_at)")
+
+    for idx in range(tables):
+        conn.execute(
+            f"create table extra_{idx} (id integer primary key, user_id integer references users (id), "
+            f"code text unique, value real, comment text)"
+        )
+        conn.execute(f"create index ix_extra_{idx}_user on extra_{idx} (user_id)")
+        conn.executemany(
+            f"insert into extra_{idx} (user_id, code, value, comment) values (?, ?, ?, ?)",
+            ((rnd.randint(1, users), f"{idx}-{row}", rnd.random(), text(3)) for row in range(100)),
+        )
+
+    conn.commit()
+    conn.execute("analyze")
+    conn.close()
+
+
+@pytest.fixture(scope="session")
+def database(request, tmp_path_factory) -> Path:
+    rows, tables = request.config.getoption("--bench-rows"), request.config.getoption("--bench-tables")
+    cache = request.config.cache if hasattr(request.config, "cache") else None
+    directory = cache.mkdir("seeqler-benchmarks") if cache else tmp_path_factory.mktemp("database")
+    path = directory / f"synthetic-v{DATABASE_VERSION}-{rows}-{tables}.sqlite"
+    if not path.exists():
+        make_database(path, rows, tables)
+    return path
+
+
+@pytest.fixture(scope="session")
+def connection_string(database) -> str:
+    return f"sqlite:///{database}"
+
+
+@pytest.fixture(scope="session")
+def driver(connection_string):
+    from seeqler.sql.sqlite import SQLite
+
+    driver = SQLite()
+    driver.connect(connection_string)
+    yield driver
+    driver.disconnect()
+
+
+@pytest.fixture(scope="session")
+def app(tmp_path_factory):
+    """
+    Qt application with settings and language; application database and caches are kept in temporary directory.
+    """
+    from PyQt6 import QtWidgets as widget
+
+    from seeqler.common.language import Language
+    from seeqler.common.resources import RESOURCES_PATH, ResourceCache
+    from seeqler.common.storage import Storage
+    from seeqler.settings import Settings
+
+    home = tmp_path_factory.mktemp("home")
+    ResourceCache(RESOURCES_PATH, home / "resources.cache")
+    Storage(home / "seeqler.sqlite")
+    Settings(Language("en-us"), RESOURCES_PATH)
+    return widget.QApplication.instance() or widget.QApplication([])
+
+
+def wait_for(app, condition, timeout: float = 30) -> None:
+    """
+    Process Qt events until condition is met.
+    """
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("Condition was not met")
+        app.processEvents()
+        time.sleep(0.0005)
+    app.processEvents()
+
+
+@pytest.fixture(scope="session")
+def schema_window(app, connection_string):
+    from seeqler.common.connection_manager import Connection
+    from seeqler.settings import Settings
+    from seeqler.ui.app import MainWindow
+
+    settings = Settings()
+    settings.connection = Connection("benchmark", connection_string)
+    main_window = MainWindow(settings)
+    window = main_window.windows.schema_windows[0]
+    wait_for(app, lambda: hasattr(window, "widget_table_list") and window.widget_table_list.count() > 0)
+    yield window
+    window.set_defaults()
+    window.clear()
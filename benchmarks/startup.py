@@ -0,0 +1,76 @@
+"""
+Launch time benchmark.
+
+Starts the application several times with ``--profile-startup`` and reports startup milestones (time to first window
+and so on). Application runs with a temporary home directory, so neither saved connections nor caches of the user are
+used. Qt uses the ``offscreen`` platform unless ``QT_QPA_PLATFORM`` is set.
+
+Usage::
+
+    python benchmarks/startup.py [--runs 10] [--cold] [connection_string]
+
+``--cold`` removes resource cache before every run to measure the first launch after update.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).parents[1]
+LAST_MILESTONE = "first window shown"
+
+
+def launch(home: Path, connection_string: str | None) -> dict[str, float]:
+    env = os.environ | {"HOME": str(home), "PYTHONPATH": str(ROOT)}
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    command = [sys.executable, "-m", "seeqler", "--profile-startup"] + (
+        [connection_string] if connection_string else []
+    )
+
+    milestones = {}
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stderr=subprocess.PIPE, text=True)
+    try:
+        for line in process.stderr:
+            moment, _, name = line.strip().partition("  ")
+            try:
+                milestones[name] = float(moment)
+            except ValueError:
+                continue
+            if name == LAST_MILESTONE:
+                break
+    finally:
+        process.kill()
+        process.wait()
+
+    if LAST_MILESTONE not in milestones:
+        raise RuntimeError("Application exited before showing a window")
+    return milestones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("connection_string", nargs="?")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--cold", action="store_true", help="remove resource cache before every run")
+    args = parser.parse_args()
+
+    results: dict[str, list[float]] = {}
+    with tempfile.TemporaryDirectory() as home:
+        launch(Path(home), args.connection_string)  # warm up Python bytecode cache and application database
+        for _ in range(args.runs):
+            if args.cold:
+                (Path(home) / ".config" / "seeqler" / "resources.cache").unlink(missing_ok=True)
+            for name, moment in launch(Path(home), args.connection_string).items():
+                results.setdefault(name, []).append(moment)
+
+    print(f"{'milestone':<30}{'median, ms':>12}{'min, ms':>12}{'max, ms':>12}")
+    for name, moments in results.items():
+        print(f"{name:<30}{statistics.median(moments):>12.1f}{min(moments):>12.1f}{max(moments):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
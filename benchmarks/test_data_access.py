@@ -0,0 +1,77 @@
+import pytest
+import sqlalchemy as sa
+
+from seeqler.sql.metadata import MetadataCache
+
+
+@pytest.mark.benchmark(group="select")
+@pytest.mark.parametrize("page", ["first", "middle", "last"])
+def test_select_page(benchmark, driver, request, page):
+    rows = request.config.getoption("--bench-rows")
+    offset = {"first": 0, "middle": rows // 2, "last": rows - 100}[page]
+    data, _ = benchmark(driver.select, from_="orders", limit=100, offset=offset)
+    assert len(data) == 100
+
+
+@pytest.mark.benchmark(group="select")
+def test_select_count(benchmark, driver, request):
+    data, _ = benchmark(driver.select, what="count(*)", from_="orders")
+    assert data[0][0] == request.config.getoption("--bench-rows")
+
+
+@pytest.mark.benchmark(group="select")
+def test_select_filtered_sorted(benchmark, driver, request):
+    # the same request as table tab makes with column filter and sorting by indexed column
+    data, _ = benchmark(
+        driver.select,
+        from_="orders",
+        where=["status = :filter_0"],
+        order='"created_at" desc',
+        limit=100,
+        offset=request.config.getoption("--bench-rows") // 50,
+        params={"filter_0": "paid"},
+    )
+    assert len(data) == 100
+
+
+@pytest.mark.benchmark(group="select")
+def test_sample(benchmark, driver):
+    data, _ = benchmark(driver.sample, "orders", size=100)
+    assert len(data) == 100
+
+
+@pytest.mark.benchmark(group="raw")
+def test_raw_full_table(benchmark, driver, request):
+    data, _ = benchmark(driver.raw, "select * from users")
+    assert len(data) == max(request.config.getoption("--bench-rows") // 10, 1)
+
+
+@pytest.mark.benchmark(group="raw")
+def test_raw_join(benchmark, driver):
+    request = sa.text(
+        "select u.name, count(*), sum(o.amount) from orders o join users u on u.id = o.user_id "
+        "where u.age between :low and :high group by u.id order by 3 desc limit 100"
+    )
+    data, _ = benchmark(driver.raw, request, {"low": 30, "high": 40})
+    assert data
+
+
+@pytest.mark.benchmark(group="metadata")
+def test_metadata_load_schema(benchmark, driver, request):
+    # fresh inspector every round: its own cache must not be measured
+    def setup():
+        return (MetadataCache(sa.inspect(driver.engine)),), {}
+
+    tables = benchmark.pedantic(lambda cache: cache.load_schema("main"), setup=setup, rounds=10)
+    # SQLAlchemy 1.4 lists sqlite_stat1 made by ANALYZE as well
+    expected = {"users", "orders", *(f"extra_{idx}" for idx in range(request.config.getoption("--bench-tables")))}
+    assert expected <= set(tables) and not set(tables) - expected - {"sqlite_stat1"}
+
+
+@pytest.mark.benchmark(group="metadata")
+def test_metadata_single_table(benchmark, driver):
+    def setup():
+        return (MetadataCache(sa.inspect(driver.engine)),), {}
+
+    meta = benchmark.pedantic(lambda cache: cache.table("orders", "main"), setup=setup, rounds=50)
+    assert meta.foreign_keys
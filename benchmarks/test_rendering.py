@@ -0,0 +1,76 @@
+import pytest
+from conftest import wait_for
+
+
+@pytest.fixture(scope="module")
+def orders_tab(app, schema_window):
+    schema_window.open_table("orders")
+    key = (schema_window.params_get_schema(), "orders")
+    wait_for(app, lambda: key in getattr(schema_window, "widget_tabs", {}) and schema_window.tasks.idle)
+    wait_for(app, lambda: schema_window.tasks.idle)
+    return schema_window.widget_tabs[key]
+
+
+@pytest.fixture(scope="module")
+def page(driver, request):
+    data, columns = driver.select(from_="orders", limit=100, offset=1000)
+    return {"contents": data, "rows": request.config.getoption("--bench-rows")}, list(columns)
+
+
+@pytest.mark.benchmark(group="rendering")
+def test_format_page(benchmark, app, orders_tab, page):
+    """
+    Formatting of page cells (worker thread part of rendering).
+    """
+    from seeqler.ui.formatting import format_page
+
+    data, columns = page
+    kinds = [orders_tab.paged_table.kinds.get(x, "text") for x in columns]
+    formatted = benchmark(format_page, data["contents"], kinds, [])
+    assert formatted.rows == 100
+
+
+@pytest.mark.benchmark(group="rendering")
+def test_fillup_table(benchmark, app, orders_tab, page):
+    """
+    Filling the table with formatted page (GUI thread part of rendering).
+    """
+    data, _ = page
+    paged_table = orders_tab.paged_table
+    data = data | {"page": paged_table.page_formatter()(data["contents"])}
+    benchmark(paged_table.fillup_table, data)
+    assert paged_table.model.rowCount() == 100
+
+
+@pytest.mark.benchmark(group="rendering")
+def test_page_flip(benchmark, app, schema_window, orders_tab, request):
+    """
+    Whole page switch: query of background task, select and count in worker thread and filling the table.
+    """
+    rows = request.config.getoption("--bench-rows")
+    paged_table = orders_tab.paged_table
+    offsets = iter(range(0, 10**9, paged_table.limit))
+
+    def flip():
+        paged_table.offset = next(offsets) % (rows - paged_table.limit)
+        orders_tab.load_table_contents()
+        wait_for(app, lambda: schema_window.tasks.idle)
+
+    benchmark.pedantic(flip, rounds=30, warmup_rounds=2)
+    assert paged_table.model.rowCount() == paged_table.limit
+
+
+@pytest.mark.benchmark(group="rendering")
+def test_page_flip_sample(benchmark, app, schema_window, orders_tab):
+    paged_table = orders_tab.paged_table
+
+    def flip():
+        orders_tab.load_table_contents()
+        wait_for(app, lambda: schema_window.tasks.idle)
+
+    paged_table.sample_mode = True
+    try:
+        benchmark.pedantic(flip, rounds=30, warmup_rounds=2)
+    finally:
+        paged_table.sample_mode = False
+    assert paged_table.model.rowCount() == paged_table.limit
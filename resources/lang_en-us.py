@@ -48,6 +48,19 @@ sw_btn_schema_tab = "Show schema"
 sw_widget_filter_placeholder = "Filter items…"
 sw_widget_tab_holder_empty = "Empty"
 sw_widget_tab_holder_raw = "SQL"
+sw_btn_search = "Search"
+sw_btn_history = "History"
+sw_btn_connections = "Connections"
+sw_btn_diff = "Compare"
+sw_act_diff_tables = "Tables…"
+sw_act_diff_schemas = "Schemas…"
+sw_tip_attach = "Attach database file as schema"
+sw_act_attach = "Attach database…"
+sw_act_detach = "Detach current schema"
+sw_lbl_attach_name = "Schema name:"
+sw_attach_restore_error = "Database files are not attached again:\n\n{errors}"
+sw_task_error_title = "Background task failed"
+sw_task_error = "An error occurred while executing background task:\n\n{error}"
 # endregion
 
 # region ui/custom/seeqlertab.py
@@ -56,6 +69,9 @@ qst_statusbar_left = "<"
 qst_statusbar_right = ">"
 qst_switchview_data = "Data"
 qst_switchview_meta = "Description"
+qst_switchview_profile = "Profile"
+qst_profile_sampled = "Profiled by sample: {scanned} of ~{rows} rows"
+qst_profile_error = "Table is not profiled: {error}"
 
 qst_btn_config = "⚙"
 qst_btn_edit_columns = "Change selected columns"
@@ -63,6 +79,28 @@ qst_inp_edit_columns = "Change selected columns"
 qst_lbl_edit_columns = "Choose columns to select by from table"
 qst_hdr_edit_columns = "Select all columns"
 qst_btn_edit_limit = "Change selection limit"
+qst_btn_export_csv = "Export result to CSV…"
+qst_export_no_result = "Run statement returning rows first"
+qst_export_done = "Result is exported to {path}"
+qst_btn_snapshot = "Snapshot results"
+qst_tip_snapshot = "Write results to local file: pages, sorting and filters do not run statement again"
+qst_snapshot_progress = "Writing snapshot: {rows} rows"
+qst_warn_snapshot_required = "⚠ Results are sorted and filtered in snapshot only: turn on «Snapshot results»"
+qst_btn_sample_mode = "Sample mode"
+qst_statusbar_sample = "Sample: {rows} rows"
+qst_btn_watch = "Watch changes"
+qst_btn_watch_interval = "Change watch interval"
+qst_inp_watch_interval = "Change watch interval"
+qst_lbl_watch_interval = "Check table for changes every … seconds"
+qst_watch_error = "Table is not checked for changes: {error}"
+qst_btn_filters = "Column filters"
+qst_tip_filter = "Text to search for, comparison (=, !=, <, >, <=, >= and value) or null / !null. Enter to apply"
+qst_warn_sort_scan = "⚠ No index starts with «{column}»: sorting requires full table scan"
+qst_tip_memory = "Cached data: ≈ {size}"
+qst_tip_cut_value = "Value is cut, double click to open it"
+qst_tip_reference_missing = "Referred row is not found"
+qst_tip_reference_open = "Double click to open referred row"
+qst_no_row_key = "Table has no key to find the row again: only the beginning of value is available"
 qst_inp_edit_limit = "Change selection limit"
 qst_lbl_edit_limit = "Load data from table by … rows"
 qst_inp_ok = "Apply"
@@ -72,4 +110,127 @@ qst_tab_raw_run = "Execute"
 qst_tab_raw_col_error = "An error occured"
 qst_tab_raw_col_result = "Query successfully executed"
 qst_tab_raw_matched_rows = "Matched rows: {rows}"
+qst_tab_raw_evicted = "Result is dropped to free memory. Press «Execute» to run the statement again."
+# endregion
+
+# region ui/search.py
+srch_win_title = "Search"
+srch_inp_placeholder = "Table, column or value…"
+srch_btn_data = "Search in data"
+srch_btn_stop = "Stop"
+srch_hdr_kind = "Found"
+srch_hdr_table = "Table"
+srch_hdr_column = "Column"
+srch_hdr_value = "Value"
+srch_kind_table = "table"
+srch_kind_column = "column"
+srch_kind_data = "value"
+srch_status_loading = "Loading schema…"
+srch_status_searching = "Searching in data…"
+srch_status_found = "Found: {count}"
+srch_status_done = "Search finished, found: {count}"
+srch_status_error = "Search failed: {error}"
+srch_btn_index = "Index…"
+srch_win_title_index = "Full-text index"
+srch_lbl_index = "Columns to keep in local full-text index"
+srch_hdr_index = "Select all columns"
+srch_lbl_index_updates = (
+    "Changes of already indexed rows are not noticed, so index may miss their new values. To index table again, "
+    "uncheck its columns, save and check them again."
+)
+srch_status_indexing = "Indexing {table}: {rows} rows more"
+srch_status_indexed = "Full-text index is up to date"
+srch_status_index_error = "Full-text index is not updated: {error}"
+# endregion
+
+# region ui/history.py
+hist_win_title = "Query history"
+hist_inp_placeholder = "Start of query or any of its characters…"
+hist_btn_run = "Run"
+hist_btn_clear = "Clear"
+hist_hdr_statement = "Query"
+hist_hdr_started = "Started"
+hist_hdr_duration = "Duration"
+hist_hdr_rows = "Rows"
+hist_status_error = "error"
+hist_status_found = "Queries: {count}"
+hist_tip_timings = "Runs: {runs}, min {min:.1f} ms, median {median:.1f} ms, max {max:.1f} ms"
+hist_tip_slow = "⚠ This run is much slower than usual"
+hist_msg_clear = "Clear query history of this connection?"
+# endregion
+
+# region ui/devpanel.py
+dev_win_title = "Developer panel"
+dev_tab_tasks = "Background tasks"
+dev_tab_statements = "Statements"
+dev_order_total = "By total time"
+dev_order_count = "Most frequent"
+dev_order_max = "Slowest single run"
+dev_order_average = "By average time"
+dev_hdr_shape = "Statement"
+dev_hdr_count = "Runs"
+dev_hdr_total = "Total, ms"
+dev_hdr_average = "Average, ms"
+dev_hdr_max = "Max, ms"
+dev_hdr_affected = "Affected rows"
+dev_btn_refresh = "Refresh"
+dev_btn_clear = "Clear"
+dev_btn_json = "Save JSON…"
+dev_btn_chrome = "Save Chrome trace…"
+dev_hdr_task = "Task"
+dev_hdr_wait = "Queue, ms"
+dev_hdr_execution = "Execution, ms"
+dev_hdr_rendering = "Rendering, ms"
+dev_hdr_rows = "Rows"
+dev_hdr_bytes = "Bytes"
+dev_hdr_error = "Error"
+dev_status_total = "Tasks: {count}; in queue {wait:.1f} ms, executing {execution:.1f} ms, rendering {rendering:.1f} ms"
+# endregion
+
+# region ui/custom/valueviewer.py
+val_btn_more = "Load more"
+val_btn_save = "Save to file…"
+val_status = "Shown {shown} of {total}"
+val_saving = "Saved {saved} of {total}"
+val_saved = "Value is saved to {path}"
+val_error = "Error: {error}"
+# endregion
+
+# region ui/diff.py
+diff_win_title = "Compare tables"
+diff_lbl_with = "with"
+diff_inp_same_table = "The same table"
+diff_item_current = "{label} (current)"
+diff_btn_compare = "Compare"
+diff_btn_stop = "Stop"
+diff_hdr_kind = "Difference"
+diff_hdr_key = "Key"
+diff_hdr_columns = "Changed columns"
+diff_kind_added = "added"
+diff_kind_removed = "removed"
+diff_kind_changed = "changed"
+diff_status_started = "Comparing…"
+diff_status_progress = "Checked rows: {rows}; added {added}, removed {removed}, changed {changed}"
+diff_status_done = "Checked rows: {rows}; added {added}, removed {removed}, changed {changed}. Equal by checksum: {skipped} of {segments} parts"
+diff_status_identical = "Tables are identical"
+diff_status_columns = "Columns only in the first table: {left}; only in the second one: {right}"
+diff_status_sample = "Only the first {count} rows of every kind are listed"
+diff_status_cancelled = "Comparison was stopped"
+diff_status_error = "Tables cannot be compared: {error}"
+diff_win_title_schema = "Compare schemas"
+diff_lbl_schema_with = "Compare current schema with"
+diff_inp_default_schema = "Default schema"
+diff_hdr_schema_table = "Table"
+diff_hdr_schema_kind = "Difference"
+diff_hdr_schema_name = "Name"
+diff_hdr_schema_left = "Current schema"
+diff_hdr_schema_right = "Other schema"
+diff_kind_table = "table"
+diff_kind_column = "column"
+diff_kind_primary_key = "primary key"
+diff_kind_index = "index"
+diff_kind_foreign_key = "foreign key"
+diff_val_exists = "exists"
+diff_status_schema = "Tables in both schemas: {tables}; only in the current one: {left}, only in the other one: {right}; differences: {changes}"
+diff_status_schema_identical = "Schemas are identical"
 # endregion
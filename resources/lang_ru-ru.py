@@ -48,6 +48,19 @@ sw_btn_schema_tab = "Схема"
 sw_widget_filter_placeholder = "Поиск…"
 sw_widget_tab_holder_empty = "Пусто"
 sw_widget_tab_holder_raw = "SQL"
+sw_btn_search = "Поиск"
+sw_btn_history = "История"
+sw_btn_connections = "Подключения"
+sw_btn_diff = "Сравнить"
+sw_act_diff_tables = "Таблицы…"
+sw_act_diff_schemas = "Схемы…"
+sw_tip_attach = "Подключить файл базы данных как схему"
+sw_act_attach = "Подключить базу данных…"
+sw_act_detach = "Отключить текущую схему"
+sw_lbl_attach_name = "Имя схемы:"
+sw_attach_restore_error = "Не удалось заново подключить файлы баз данных:\n\n{errors}"
+sw_task_error_title = "Ошибка фоновой задачи"
+sw_task_error = "При выполнении фоновой задачи произошла ошибка:\n\n{error}"
 # endregion
 
 # region ui/custom/seeqlertab.py
@@ -56,6 +69,9 @@ qst_statusbar_left = "‹"
 qst_statusbar_right = "›"
 qst_switchview_data = "Данные"
 qst_switchview_meta = "Описание"
+qst_switchview_profile = "Профиль"
+qst_profile_sampled = "Профиль по выборке: {scanned} из ~{rows} строк"
+qst_profile_error = "Профиль таблицы не построен: {error}"
 
 qst_btn_config = "⚙"
 qst_btn_edit_columns = "Выбрать колонки"
@@ -63,6 +79,28 @@ qst_inp_edit_columns = "Изменить колонки для отображе
 qst_lbl_edit_columns = "Выберите колонки для отображения"
 qst_hdr_edit_columns = "Выбрать все колонки"
 qst_btn_edit_limit = "Изменить лимит выгрузки"
+qst_btn_export_csv = "Экспорт результата в CSV…"
+qst_export_no_result = "Сначала выполните запрос, возвращающий строки"
+qst_export_done = "Результат выгружен в {path}"
+qst_btn_snapshot = "Снимок результатов"
+qst_tip_snapshot = "Записывать результаты в локальный файл: страницы, сортировка и фильтры не выполняют запрос повторно"
+qst_snapshot_progress = "Запись снимка: {rows} строк"
+qst_warn_snapshot_required = "⚠ Сортировка и фильтры работают только для снимка: включите «Снимок результатов»"
+qst_btn_sample_mode = "Режим выборки"
+qst_statusbar_sample = "Выборка: {rows} строк"
+qst_btn_watch = "Следить за изменениями"
+qst_btn_watch_interval = "Изменить интервал слежения"
+qst_inp_watch_interval = "Изменить интервал слежения"
+qst_lbl_watch_interval = "Проверять таблицу на изменения каждые … секунд"
+qst_watch_error = "Таблица не проверена на изменения: {error}"
+qst_btn_filters = "Фильтры колонок"
+qst_tip_filter = "Текст для поиска, сравнение (=, !=, <, >, <=, >= и значение) или null / !null. Enter — применить"
+qst_warn_sort_scan = "⚠ Нет индекса по «{column}»: для сортировки нужен полный просмотр таблицы"
+qst_tip_memory = "Данные в памяти: ≈ {size}"
+qst_tip_cut_value = "Значение обрезано, откройте двойным щелчком"
+qst_tip_reference_missing = "Строка, на которую ссылается значение, не найдена"
+qst_tip_reference_open = "Двойной щелчок откроет строку, на которую ссылается значение"
+qst_no_row_key = "У таблицы нет ключа, чтобы снова найти строку: доступно только начало значения"
 qst_inp_edit_limit = "Изменить лимит выгрузки"
 qst_lbl_edit_limit = "Загружать данные по … строк"
 qst_inp_ok = "Применить"
@@ -72,4 +110,127 @@ qst_tab_raw_run = "Исполнить"
 qst_tab_raw_col_error = "Произошла ошибка"
 qst_tab_raw_col_result = "Запрос успешно исполнен"
 qst_tab_raw_matched_rows = "Изменено строк: {rows}"
+qst_tab_raw_evicted = "Результат удален из памяти. Нажмите «Исполнить», чтобы выполнить запрос снова."
+# endregion
+
+# region ui/search.py
+srch_win_title = "Поиск"
+srch_inp_placeholder = "Таблица, колонка или значение…"
+srch_btn_data = "Искать в данных"
+srch_btn_stop = "Остановить"
+srch_hdr_kind = "Найдено"
+srch_hdr_table = "Таблица"
+srch_hdr_column = "Колонка"
+srch_hdr_value = "Значение"
+srch_kind_table = "таблица"
+srch_kind_column = "колонка"
+srch_kind_data = "значение"
+srch_status_loading = "Загрузка схемы…"
+srch_status_searching = "Поиск в данных…"
+srch_status_found = "Найдено: {count}"
+srch_status_done = "Поиск завершен, найдено: {count}"
+srch_status_error = "Ошибка поиска: {error}"
+srch_btn_index = "Индекс…"
+srch_win_title_index = "Полнотекстовый индекс"
+srch_lbl_index = "Колонки для локального полнотекстового индекса"
+srch_hdr_index = "Выбрать все колонки"
+srch_lbl_index_updates = (
+    "Изменения уже проиндексированных строк не отслеживаются, поэтому новые значения могут не найтись. Чтобы "
+    "проиндексировать таблицу заново, снимите отметки с ее колонок, сохраните и отметьте их снова."
+)
+srch_status_indexing = "Индексация {table}: еще {rows} строк"
+srch_status_indexed = "Полнотекстовый индекс актуален"
+srch_status_index_error = "Полнотекстовый индекс не обновлен: {error}"
+# endregion
+
+# region ui/history.py
+hist_win_title = "История запросов"
+hist_inp_placeholder = "Начало запроса или любые его символы…"
+hist_btn_run = "Выполнить"
+hist_btn_clear = "Очистить"
+hist_hdr_statement = "Запрос"
+hist_hdr_started = "Запущен"
+hist_hdr_duration = "Длительность"
+hist_hdr_rows = "Строк"
+hist_status_error = "ошибка"
+hist_status_found = "Запросов: {count}"
+hist_tip_timings = "Запусков: {runs}, мин. {min:.1f} мс, медиана {median:.1f} мс, макс. {max:.1f} мс"
+hist_tip_slow = "⚠ Этот запуск намного медленнее обычного"
+hist_msg_clear = "Очистить историю запросов этого подключения?"
+# endregion
+
+# region ui/devpanel.py
+dev_win_title = "Панель разработчика"
+dev_tab_tasks = "Фоновые задачи"
+dev_tab_statements = "Запросы"
+dev_order_total = "По общему времени"
+dev_order_count = "Самые частые"
+dev_order_max = "Самый медленный запуск"
+dev_order_average = "По среднему времени"
+dev_hdr_shape = "Запрос"
+dev_hdr_count = "Запусков"
+dev_hdr_total = "Всего, мс"
+dev_hdr_average = "В среднем, мс"
+dev_hdr_max = "Максимум, мс"
+dev_hdr_affected = "Изменено строк"
+dev_btn_refresh = "Обновить"
+dev_btn_clear = "Очистить"
+dev_btn_json = "Сохранить JSON…"
+dev_btn_chrome = "Сохранить Chrome trace…"
+dev_hdr_task = "Задача"
+dev_hdr_wait = "Очередь, мс"
+dev_hdr_execution = "Выполнение, мс"
+dev_hdr_rendering = "Отрисовка, мс"
+dev_hdr_rows = "Строк"
+dev_hdr_bytes = "Байт"
+dev_hdr_error = "Ошибка"
+dev_status_total = "Задач: {count}; в очереди {wait:.1f} мс, выполнение {execution:.1f} мс, отрисовка {rendering:.1f} мс"
+# endregion
+
+# region ui/custom/valueviewer.py
+val_btn_more = "Загрузить ещё"
+val_btn_save = "Сохранить в файл…"
+val_status = "Показано {shown} из {total}"
+val_saving = "Сохранено {saved} из {total}"
+val_saved = "Значение сохранено в {path}"
+val_error = "Ошибка: {error}"
+# endregion
+
+# region ui/diff.py
+diff_win_title = "Сравнение таблиц"
+diff_lbl_with = "с"
+diff_inp_same_table = "Та же таблица"
+diff_item_current = "{label} (текущее)"
+diff_btn_compare = "Сравнить"
+diff_btn_stop = "Остановить"
+diff_hdr_kind = "Различие"
+diff_hdr_key = "Ключ"
+diff_hdr_columns = "Изменённые столбцы"
+diff_kind_added = "добавлена"
+diff_kind_removed = "удалена"
+diff_kind_changed = "изменена"
+diff_status_started = "Сравнение…"
+diff_status_progress = "Проверено строк: {rows}; добавлено {added}, удалено {removed}, изменено {changed}"
+diff_status_done = "Проверено строк: {rows}; добавлено {added}, удалено {removed}, изменено {changed}. Совпало по контрольной сумме: {skipped} из {segments} частей"
+diff_status_identical = "Таблицы совпадают"
+diff_status_columns = "Столбцы только в первой таблице: {left}; только во второй: {right}"
+diff_status_sample = "Показаны только первые {count} строк каждого вида"
+diff_status_cancelled = "Сравнение остановлено"
+diff_status_error = "Таблицы нельзя сравнить: {error}"
+diff_win_title_schema = "Сравнение схем"
+diff_lbl_schema_with = "Сравнить текущую схему с"
+diff_inp_default_schema = "Схема по умолчанию"
+diff_hdr_schema_table = "Таблица"
+diff_hdr_schema_kind = "Различие"
+diff_hdr_schema_name = "Имя"
+diff_hdr_schema_left = "Текущая схема"
+diff_hdr_schema_right = "Другая схема"
+diff_kind_table = "таблица"
+diff_kind_column = "столбец"
+diff_kind_primary_key = "первичный ключ"
+diff_kind_index = "индекс"
+diff_kind_foreign_key = "внешний ключ"
+diff_val_exists = "есть"
+diff_status_schema = "Таблиц в обеих схемах: {tables}; только в текущей: {left}, только в другой: {right}; различий: {changes}"
+diff_status_schema_identical = "Схемы совпадают"
 # endregion
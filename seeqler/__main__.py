@@ -1,16 +1,25 @@
 import argparse
 
-from .app import Seeqler
-
 
 def main():
     # Create the parser and add arguments
     parser = argparse.ArgumentParser()
     parser.add_argument("connection_string", nargs="?")
+    parser.add_argument(
+        "--profile-startup", action="store_true", help="print import time breakdown after first window is shown"
+    )
 
     # Parse and print the results
     args = parser.parse_args()
 
+    if args.profile_startup:
+        from .common.startup import StartupProfiler
+
+        StartupProfiler().install()
+
+    # application is imported after profiler is installed, so its imports are measured too
+    from .app import Seeqler
+
     app = Seeqler(args.connection_string)
     app.run()
 
@@ -1,7 +1,11 @@
 from pathlib import Path
 
+from PyQt6.QtCore import QTimer
+
 from .common.connection_manager import Connection, ConnectionManager
 from .common.language import Language
+from .common.resources import ResourceCache
+from .common.startup import StartupProfiler, mark
 from .settings import Settings
 from .ui.app import get_app
 
@@ -11,6 +15,7 @@ LANGUAGE = "RU-RU"  # TODO: replace with preferences
 
 class Seeqler:
     def __init__(self, connection_string: str | None = None):
+        ResourceCache(RESOURCES_PATH)
         self.settings = Settings(Language(LANGUAGE), RESOURCES_PATH)
 
         if connection_string:
@@ -22,5 +27,9 @@ class Seeqler:
                 self.settings.connection = Connection(name, connection_string)
 
     def run(self):
+        mark("application imported")
         app, main_window = get_app(self.settings)
+        if profiler := StartupProfiler.active:
+            # timer fires when event loop has shown the first window
+            QTimer.singleShot(0, lambda: (profiler.mark("first window shown"), profiler.report()))
         app.exec()
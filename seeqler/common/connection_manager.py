@@ -1,8 +1,13 @@
 import json
+import os
+import tempfile
+import time
 import uuid as uuid_lib
-from dataclasses import asdict, dataclass, field
+from dataclasses import asdict, dataclass, field, replace
 from pathlib import Path
+from threading import RLock
 
+from .storage import Storage
 from .types import SingletonMeta
 
 
@@ -13,80 +18,224 @@ class Connection:
     uuid: str = field(default_factory=lambda: str(uuid_lib.uuid4()))
 
 
-DEFAULT_PATH = Path.home() / ".config" / "seeqler" / "connections.json"
+JSON_PATH = Path.home() / ".config" / "seeqler" / "connections.json"
+JSON_STAMP_KEY = "connections_json_stamp"  # state key of the last JSON file written or imported
 
 
 class JsonAccessor:
-    def __init__(self, path):
+    """
+    Connection list mirrored to JSON file: it is read by previous versions and can be edited by hand.
+    """
+
+    def __init__(self, path: Path):
         self.path = path
-        self.loading = None
-        self.dumping = None
 
-    def __enter__(self):
+    def stamp(self) -> list[int] | None:
+        """
+        File modification mark: changes every time file is rewritten.
+        """
         try:
-            self.loading = json.load(self.path.open())
-        except json.JSONDecodeError:
-            self.loading = []
-        return self
-
-    def __exit__(self, *exit_args):
-        if self.dumping:
-            json.dump(self.dumping, self.path.open("w"))
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def load(self) -> list[dict] | None:
+        """
+        Get connection list or None if file is missing or broken.
+        """
+        try:
+            with self.path.open() as file:
+                data = json.load(file)
+        except (json.JSONDecodeError, FileNotFoundError):
+            return None
+        if not isinstance(data, list) or not all(
+            isinstance(x, dict) and {"uuid", "label", "connection_string"} <= x.keys() for x in data
+        ):
+            return None
+        return data
+
+    def dump(self, data: list[dict]) -> None:
+        # write to temporary file and replace the original one with it: readers never see half-written file
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as file:
+                json.dump(data, file)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp, self.path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
 
 
 class ConnectionManager(metaclass=SingletonMeta):
-    def __init__(self, path: Path = DEFAULT_PATH):
-        self.path = path
-        if not self.path.exists():
-            self.path.parent.mkdir(parents=True, exist_ok=True)
-            self.path.open("w").write("[]")
-        self.json_wrapper = JsonAccessor(self.path)
+    """
+    Saved connections storage.
+
+    Connections are loaded once and kept in memory indexed by uuid, label and connection string; every change is
+    written through to application database as a single row change and mirrored to JSON file. Database data version
+    and file modification time are checked before every access, so changes made by other processes and edits of the
+    file are picked up.
+    """
+
+    def __init__(self, storage: Storage | None = None, json_path: Path = JSON_PATH):
+        self.storage = storage or Storage()
+        self.json_wrapper = JsonAccessor(json_path)
+
+        self._lock = RLock()
+        self._stamp = None
+        self._json_stamp = None
+        self._connections: dict[str, Connection] = {}  # by uuid, in saved order
+        self._by_label: dict[str, set[str]] = {}
+        self._by_connection_string: dict[str, set[str]] = {}
+
+        if self.storage.get_state("connections_imported") and self.storage.get_state(JSON_STAMP_KEY) is None:
+            # connections were saved by version which did not mirror them: database is newer than the file
+            self._json_stamp = self.json_wrapper.stamp()
+            with self._lock:
+                self._sync()
+                self._export()
 
     def __iter__(self):
         yield from self.list()
 
+    # region in-memory index
+
+    def _index(self, connection: Connection) -> None:
+        self._connections[connection.uuid] = connection
+        self._by_label.setdefault(connection.label, set()).add(connection.uuid)
+        self._by_connection_string.setdefault(connection.connection_string, set()).add(connection.uuid)
+
+    def _unindex(self, uuid: str) -> Connection | None:
+        connection = self._connections.pop(uuid, None)
+        if connection is not None:
+            self._by_label[connection.label].discard(uuid)
+            self._by_connection_string[connection.connection_string].discard(uuid)
+        return connection
+
+    def _sync(self) -> None:
+        # JSON file was changed outside (edited by hand or by previous version): its list replaces saved one
+        json_stamp = self.json_wrapper.stamp()
+        if json_stamp != self._json_stamp:
+            if json_stamp is not None and json_stamp != self.storage.get_state(JSON_STAMP_KEY):
+                self._import(json_stamp)
+            self._json_stamp = json_stamp
+
+        # reload connections if database was changed by another connection since last read
+        stamp = self.storage.data_version()
+        if stamp == self._stamp:
+            return
+
+        self._connections, self._by_label, self._by_connection_string = {}, {}, {}
+        rows = self.storage.connection.execute(
+            "select label, connection_string, uuid from connections order by position"
+        ).fetchall()
+        for row in rows:
+            self._index(Connection(*row))
+        self._stamp = stamp
+
+    def _import(self, json_stamp: list[int]) -> None:
+        if (items := self.json_wrapper.load()) is None:
+            return  # file is being written or broken: saved connections are kept
+
+        with self.storage.transaction() as conn:
+            uuids = [item["uuid"] for item in items]
+            conn.execute(f"delete from connections where uuid not in ({', '.join('?' * len(uuids))})", uuids)
+            # time of last use is kept for connections which are still there
+            conn.executemany(
+                "insert into connections (uuid, label, connection_string, position) values (?, ?, ?, ?) "
+                "on conflict (uuid) do update set "
+                "label = excluded.label, connection_string = excluded.connection_string, position = excluded.position",
+                [(x["uuid"], x["label"], x["connection_string"], position) for position, x in enumerate(items)],
+            )
+            self.storage.set_state(JSON_STAMP_KEY, json_stamp)
+        self._stamp = None  # connections are read again
+
+    def _export(self) -> None:
+        self.json_wrapper.dump([asdict(conn) for conn in self._connections.values()])
+        self._json_stamp = self.json_wrapper.stamp()
+        self.storage.set_state(JSON_STAMP_KEY, self._json_stamp)
+
+    # endregion
+
     def list(self) -> list[Connection]:
-        with self.json_wrapper as jsw:
-            return [Connection(**i) for i in jsw.loading]
+        with self._lock:
+            self._sync()
+            return [replace(conn) for conn in self._connections.values()]
 
     def add(self, connection: Connection) -> None:
-        with self.json_wrapper as jsw:
-            data = jsw.loading
-            data.append(asdict(connection))
-            jsw.dumping = data
+        with self._lock, self.storage.transaction() as conn:
+            self._sync()
+            conn.execute(
+                "insert or replace into connections (uuid, label, connection_string, position) "
+                "values (?, ?, ?, (select coalesce(max(position), -1) + 1 from connections))",
+                (connection.uuid, connection.label, connection.connection_string),
+            )
+            self._unindex(connection.uuid)
+            self._index(replace(connection))
+            self._export()
 
     def update(self, connection: Connection) -> None:
-        with self.json_wrapper as jsw:
-            data = jsw.loading
-            for i, c in enumerate(data):
-                if c["uuid"] == connection.uuid:
-                    data[i] = asdict(connection)
-                    break
-            jsw.dumping = data
+        with self._lock, self.storage.transaction() as conn:
+            self._sync()
+            if connection.uuid not in self._connections:
+                return
+
+            conn.execute(
+                "update connections set label = ?, connection_string = ? where uuid = ?",
+                (connection.label, connection.connection_string, connection.uuid),
+            )
+            # keep position of connection in list
+            order = list(self._connections)
+            self._unindex(connection.uuid)
+            self._index(replace(connection))
+            self._connections = {uuid: self._connections[uuid] for uuid in order}
+            self._export()
 
     def remove(self, connection: Connection) -> None:
-        with self.json_wrapper as jsw:
-            data = jsw.loading
-            for i, c in enumerate(data):
-                if c["uuid"] == connection.uuid:
-                    del data[i]
-                    break
-            jsw.dumping = data
+        with self._lock, self.storage.transaction() as conn:
+            self._sync()
+            conn.execute("delete from connections where uuid = ?", (connection.uuid,))
+            self._unindex(connection.uuid)
+            self._export()
+
+    def touch(self, connection: Connection) -> None:
+        """
+        Mark connection as used right now.
+        """
+        with self.storage.transaction() as conn:
+            conn.execute("update connections set used_at = ? where uuid = ?", (time.time(), connection.uuid))
+
+    def recent(self, count: int = 10) -> "list[Connection]":
+        with self._lock:
+            self._sync()
+            rows = self.storage.connection.execute(
+                "select uuid from connections where used_at is not null order by used_at desc limit ?", (count,)
+            ).fetchall()
+            return [replace(self._connections[uuid]) for (uuid,) in rows if uuid in self._connections]
 
     def get(
         self, *, label: str | None = None, uuid: str | None = None, connection_string: str | None = None
     ) -> Connection:
-        conns = self.list()
         match label, uuid, connection_string:
-            case (None, str(req), None) | (str(req), None, None) | (None, None, str(req)):
-                appropriate = list(
-                    filter(
-                        lambda conn: (conn.label if label else conn.uuid if uuid else conn.connection_string) == req,
-                        conns,
-                    )
-                )
-                if len(appropriate) != 1:
-                    raise ValueError("No or multiple connections found")
-                return appropriate[0]
+            case (None, str(req), None):
+                key = "uuid"
+            case (str(req), None, None):
+                key = "label"
+            case (None, None, str(req)):
+                key = "connection_string"
             case _:
                 raise ValueError("Incorrect arguments")
+
+        with self._lock:
+            self._sync()
+            if key == "uuid":
+                appropriate = [req] if req in self._connections else []
+            else:
+                appropriate = list(getattr(self, f"_by_{key}").get(req, ()))
+
+            if len(appropriate) != 1:
+                raise ValueError("No or multiple connections found")
+            return replace(self._connections[appropriate[0]])
@@ -0,0 +1,157 @@
+import re
+import statistics
+from dataclasses import dataclass
+
+from .storage import Storage
+from .types import SingletonMeta
+
+__all__ = ("HistoryEntry", "QueryHistory", "TimingStats")
+
+
+SEARCH_WINDOW = 5000  # most recent statements to search in
+REGRESSION_FACTOR = 2  # run is slow if it is that many times slower than median of the same statement
+REGRESSION_MIN_RUNS = 3
+
+
+@dataclass
+class TimingStats:
+    runs: int
+    min: float
+    median: float
+    max: float
+
+
+@dataclass
+class HistoryEntry:
+    id: int
+    connection: str | None
+    statement: str
+    started_at: float
+    duration: float | None
+    row_count: int | None
+    error: str | None
+    stats: TimingStats | None = None  # timings of successful runs of the same statement
+    slow: bool = False  # run regressed comparing to other runs of the same statement
+
+
+def _fuzzy_score(text: str, statement: str) -> int | None:
+    """
+    Check that all characters of ``text`` appear in ``statement`` in the same order. Returns the length of the
+    first window of the statement containing them (smaller is better) or None if they do not.
+    """
+    position, start = 0, None
+    for char in text:
+        position = statement.find(char, position)
+        if position < 0:
+            return None
+        start = position if start is None else start
+        position += 1
+    return position - (start or 0)
+
+
+class QueryHistory(metaclass=SingletonMeta):
+    """
+    Executed statements with their timings, kept in application database.
+    """
+
+    def __init__(self, storage: Storage | None = None):
+        self.storage = storage or Storage()
+
+    def record(
+        self,
+        connection: str | None,
+        statement: str,
+        started_at: float,
+        duration: float | None,
+        row_count: int | None = None,
+        error: str | None = None,
+    ) -> None:
+        with self.storage.transaction() as conn:
+            conn.execute(
+                "insert into history (connection, statement, started_at, duration, row_count, error) "
+                "values (?, ?, ?, ?, ?, ?)",
+                (connection, statement.strip(), started_at, duration, row_count, error),
+            )
+
+    def clear(self, connection: str | None = None) -> None:
+        with self.storage.transaction() as conn:
+            if connection is None:
+                conn.execute("delete from history")
+            else:
+                conn.execute("delete from history where connection = ?", (connection,))
+
+    def recent(self, connection: str | None = None, limit: int = SEARCH_WINDOW, text: str = "") -> list[HistoryEntry]:
+        """
+        Get the most recent entries. If ``text`` is set, only statements containing all its characters in the same
+        order are returned (case-insensitive).
+        """
+        where, params = [], []
+        if connection is not None:
+            where.append("connection = ?")
+            params.append(connection)
+        if text:
+            where.append("unicode_lower(statement) like ? escape '\\'")
+            params.append("%" + "%".join(re.sub(r"([\\%_])", r"\\\1", char) for char in text.lower()) + "%")
+
+        condition = f" where {' and '.join(where)}" if where else ""
+        rows = self.storage.connection.execute(
+            f"select * from history{condition} order by started_at desc limit ?", (*params, limit)
+        ).fetchall()
+        return [HistoryEntry(*row) for row in rows]
+
+    def search(self, text: str = "", connection: str | None = None, limit: int = 200) -> list[HistoryEntry]:
+        """
+        Search for statements among the most recent ones. Statements starting with ``text`` go first, then the ones
+        containing it and then the ones matched fuzzily (all characters of ``text`` in the same order). Runs that are
+        much slower than other runs of the same statement are marked as ``slow``, timings of the statement are put into
+        ``stats``.
+
+        Args:
+            text: text to search for (case-insensitive)
+            connection: connection to search statements of (all connections by default)
+            limit: max number of entries to return
+
+        Returns:
+            list[HistoryEntry]: found entries
+        """
+        # database filters statements, so only matching ones are read; all runs of a statement match or do not
+        # together, so their timings are complete
+        text = text.strip().lower()
+        entries = self.recent(connection, text=text)
+        self._mark_regressions(entries)
+        if not text:
+            return entries[:limit]
+
+        prefix, substring, fuzzy = [], [], []
+        for entry in entries:
+            statement = entry.statement.lower()
+            if statement.startswith(text):
+                prefix.append(entry)
+            elif text in statement:
+                substring.append(entry)
+            elif (score := _fuzzy_score(text, statement)) is not None:
+                fuzzy.append((score, entry))
+
+        fuzzy.sort(key=lambda x: x[0])
+        return (prefix + substring + [entry for _, entry in fuzzy])[:limit]
+
+    @staticmethod
+    def _mark_regressions(entries: list[HistoryEntry]) -> None:
+        durations: dict[tuple[str | None, str], list[float]] = {}
+        for entry in entries:
+            if entry.duration is not None and entry.error is None:
+                durations.setdefault((entry.connection, entry.statement), []).append(entry.duration)
+
+        stats = {
+            key: TimingStats(len(values), min(values), statistics.median(values), max(values))
+            for key, values in durations.items()
+        }
+        for entry in entries:
+            entry.stats = stats.get((entry.connection, entry.statement))
+            if (
+                entry.stats
+                and entry.stats.runs >= REGRESSION_MIN_RUNS
+                and entry.duration is not None
+                and entry.duration > REGRESSION_FACTOR * entry.stats.median
+            ):
+                entry.slow = True
@@ -1,5 +1,4 @@
-import importlib
-
+from .resources import ResourceCache
 from .types import SingletonMeta
 
 
@@ -9,13 +8,13 @@ class Language(metaclass=SingletonMeta):
         self.errors = ""
 
         try:
-            module = importlib.import_module(f"resources.lang_{lang.lower()}")
-        except ModuleNotFoundError:
-            module = importlib.import_module(f"resources.lang_en-us")
+            strings = ResourceCache().language(lang)
+        except FileNotFoundError:
+            strings = ResourceCache().language("en-us")
             self.errors = f'Language module for "{self.lang}" was not found'
             self.lang = "en-us"
 
-        self.__dict__.update(module.__dict__)
+        self.__dict__.update(strings)
 
     def __getattr__(self, name):
         # return "$value" if value is not in language module
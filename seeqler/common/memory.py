@@ -0,0 +1,98 @@
+import sys
+import time
+import weakref
+from typing import Any, Protocol, Sequence
+
+from .types import SingletonMeta
+
+__all__ = ("Evictable", "MemoryBudget", "estimate_rows", "format_size")
+
+
+ESTIMATE_SAMPLE = 1000  # rows to measure, size of bigger results is extrapolated
+
+
+def estimate_rows(rows: Sequence[Sequence[Any]]) -> int:
+    """
+    Estimate memory taken by result rows and their values (Python objects only).
+    """
+    if hasattr(rows, "nbytes"):
+        return rows.nbytes  # columnar result knows its size
+    if not rows:
+        return 0
+
+    step = max(len(rows) // ESTIMATE_SAMPLE, 1)
+    sample = rows[::step]
+    size = sum(sys.getsizeof(row) + sum(sys.getsizeof(cell) for cell in row) for row in sample)
+    return size * len(rows) // len(sample) + sys.getsizeof(rows)
+
+
+def format_size(size: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+class Evictable(Protocol):
+    def memory_usage(self) -> int:
+        """
+        Get estimated size of cached data in bytes.
+        """
+
+    def evict(self) -> None:
+        """
+        Drop cached data: it is fetched again when needed.
+        """
+
+
+class MemoryBudget(metaclass=SingletonMeta):
+    """
+    Accounting of data cached by registered objects (tabs) and eviction of the least recently used ones when their
+    total size exceeds the budget.
+    """
+
+    def __init__(self, budget: int | None = None):
+        self.budget = budget
+        self._used: "weakref.WeakKeyDictionary[Evictable, float]" = weakref.WeakKeyDictionary()
+
+    def _budget(self) -> int:
+        if self.budget is None:
+            from ..settings import Settings
+
+            return Settings().memory_budget
+        return self.budget
+
+    def touch(self, item: Evictable) -> None:
+        """
+        Register item or mark it as used right now.
+        """
+        self._used[item] = time.monotonic()
+
+    def forget(self, item: Evictable) -> None:
+        self._used.pop(item, None)
+
+    def usage(self) -> int:
+        return sum(item.memory_usage() for item in list(self._used.keys()))
+
+    def enforce(self, *keep: Evictable) -> int:
+        """
+        Evict the least recently used items until total size fits the budget.
+
+        Args:
+            keep: items not to evict (e.g. visible ones)
+
+        Returns:
+            int: number of bytes freed
+        """
+        items = sorted(self._used.items(), key=lambda x: x[1])
+        usage, budget, freed = sum(item.memory_usage() for item, _ in items), self._budget(), 0
+
+        for item, _ in items:
+            if usage <= budget:
+                break
+            if item in keep or not (size := item.memory_usage()):
+                continue
+            item.evict()
+            usage, freed = usage - size, freed + size
+        return freed
@@ -0,0 +1,94 @@
+import marshal
+import os
+import runpy
+from pathlib import Path
+from typing import Any, Callable
+
+from .types import SingletonMeta
+
+__all__ = ("ResourceCache",)
+
+
+RESOURCES_PATH = Path(__file__).parents[2] / "resources"
+CACHE_PATH = Path.home() / ".config" / "seeqler" / "resources.cache"
+CACHE_VERSION = 1
+
+
+def _load_language(path: Path) -> dict[str, Any]:
+    # only plain values are kept, module internals and imports are dropped
+    return {
+        key: value
+        for key, value in runpy.run_path(str(path)).items()
+        if not key.startswith("_") and isinstance(value, (str, int, float, bool, tuple))
+    }
+
+
+def _load_text(path: Path) -> str:
+    return path.read_text()
+
+
+class ResourceCache(metaclass=SingletonMeta):
+    """
+    Binary cache of resources needed at startup: stylesheet and language packs.
+
+    All the resources are kept in a single ``marshal`` file, every entry is keyed by modification time and size of its
+    source file, so reading the cache costs one small file read and changed sources are picked up automatically.
+    """
+
+    def __init__(self, resources_path: Path = RESOURCES_PATH, path: Path = CACHE_PATH):
+        self.resources_path = resources_path
+        self.path = path
+        self._entries: dict[str, tuple[tuple[int, int], Any]] | None = None
+
+    @property
+    def entries(self) -> dict[str, tuple[tuple[int, int], Any]]:
+        if self._entries is None:
+            try:
+                version, entries = marshal.loads(self.path.read_bytes())
+                self._entries = entries if version == CACHE_VERSION else {}
+            except (OSError, EOFError, ValueError, TypeError):
+                self._entries = {}
+        return self._entries
+
+    def _save(self) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp = self.path.with_suffix(".tmp")
+            temp.write_bytes(marshal.dumps((CACHE_VERSION, self.entries)))
+            os.replace(temp, self.path)
+        except (OSError, ValueError):
+            pass  # cache is optional, sources are read next time
+
+    def get(self, name: str, loader: Callable[[Path], Any]) -> Any:
+        """
+        Get resource from cache or load it from its source file if the file was changed since it was cached.
+
+        Args:
+            name: file name in resources directory
+            loader: function to read resource from file, its result must be serializable by ``marshal``
+
+        Returns:
+            Any: loaded resource
+        """
+        source = self.resources_path / name
+        stat = source.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+
+        cached = self.entries.get(name)
+        if cached is not None and tuple(cached[0]) == stamp:
+            return cached[1]
+
+        value = loader(source)
+        self.entries[name] = (stamp, value)
+        self._save()
+        return value
+
+    def language(self, lang: str) -> dict[str, Any]:
+        """
+        Raises:
+            FileNotFoundError: if there is no language pack
+        """
+        return self.get(f"lang_{lang.lower()}.py", _load_language)
+
+    def stylesheet(self) -> str:
+        return self.get("app_style.qss", _load_text)
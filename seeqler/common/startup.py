@@ -0,0 +1,97 @@
+import importlib._bootstrap as bootstrap
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import TextIO
+
+__all__ = ("StartupProfiler", "mark")
+
+
+@dataclass
+class ImportRecord:
+    name: str
+    cumulative: float = 0
+    children: float = 0  # time spent importing modules imported by this one
+
+    @property
+    def own(self) -> float:
+        return self.cumulative - self.children
+
+
+@dataclass
+class StartupProfiler:
+    """
+    Measures time spent on importing every module (as ``python -X importtime`` does) and time of startup milestones.
+
+    Installed profiler wraps the function of import machinery that loads modules absent in ``sys.modules``, so only
+    the first import of module is measured.
+    """
+
+    started: float = field(default_factory=time.perf_counter)
+    imports: list[ImportRecord] = field(default_factory=list)
+    marks: list[tuple[str, float]] = field(default_factory=list)
+    _stack: list[ImportRecord] = field(default_factory=list)
+    _original = None
+
+    active = None  # installed profiler
+
+    def install(self) -> "StartupProfiler":
+        self._original = original = bootstrap._find_and_load
+
+        def find_and_load(name, import_):
+            record = ImportRecord(name)
+            self._stack.append(record)
+            start = time.perf_counter()
+            try:
+                return original(name, import_)
+            finally:
+                record.cumulative = time.perf_counter() - start
+                self._stack.pop()
+                if self._stack:
+                    self._stack[-1].children += record.cumulative
+                self.imports.append(record)
+
+        bootstrap._find_and_load = find_and_load
+        StartupProfiler.active = self
+        return self
+
+    def uninstall(self) -> None:
+        if self._original is not None:
+            bootstrap._find_and_load = self._original
+            self._original = None
+        if StartupProfiler.active is self:
+            StartupProfiler.active = None
+
+    def mark(self, name: str) -> None:
+        self.marks.append((name, time.perf_counter() - self.started))
+
+    def report(self, file: TextIO = sys.stderr, top: int = 20) -> None:
+        """
+        Print time of startup milestones, import time grouped by top-level package and the slowest modules.
+        """
+        packages: dict[str, float] = {}
+        for record in self.imports:
+            package = record.name.split(".")[0]
+            packages[package] = packages.get(package, 0) + record.own
+        total = sum(packages.values())
+
+        print("Startup milestones, ms since start:", file=file)
+        for name, moment in self.marks:
+            print(f"{moment * 1000:10.1f}  {name}", file=file)
+
+        print(f"\nImport time by package, ms (total {total * 1000:.1f}):", file=file)
+        for package, spent in sorted(packages.items(), key=lambda x: -x[1])[:top]:
+            print(f"{spent * 1000:10.1f}  {package}", file=file)
+
+        print("\nSlowest modules, ms (cumulative | own):", file=file)
+        for record in sorted(self.imports, key=lambda x: -x.cumulative)[:top]:
+            print(f"{record.cumulative * 1000:10.1f} | {record.own * 1000:8.1f}  {record.name}", file=file)
+        file.flush()
+
+
+def mark(name: str) -> None:
+    """
+    Save startup milestone if startup is being profiled.
+    """
+    if StartupProfiler.active is not None:
+        StartupProfiler.active.mark(name)
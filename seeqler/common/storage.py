@@ -0,0 +1,151 @@
+import json
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+from .types import SingletonMeta
+
+__all__ = ("Storage",)
+
+
+DEFAULT_PATH = Path.home() / ".config" / "seeqler" / "seeqler.sqlite"
+
+SCHEMA = """
+create table if not exists connections (
+    uuid text primary key,
+    label text not null,
+    connection_string text not null,
+    position integer not null,
+    used_at real
+);
+create index if not exists ix_connections_label on connections (label);
+create index if not exists ix_connections_string on connections (connection_string);
+create index if not exists ix_connections_used on connections (used_at desc);
+
+create table if not exists history (
+    id integer primary key,
+    connection text,
+    statement text not null,
+    started_at real not null,
+    duration real,
+    row_count integer,
+    error text
+);
+create index if not exists ix_history_recent on history (connection, started_at desc);
+create index if not exists ix_history_started on history (started_at desc);
+
+create table if not exists metadata_cache (
+    connection text not null,
+    key text not null,
+    value blob,
+    updated_at real not null,
+    primary key (connection, key)
+);
+
+create table if not exists ui_state (
+    key text primary key,
+    value text
+);
+"""
+
+
+def _unicode_lower(value: Any) -> Any:
+    return value.lower() if isinstance(value, str) else value
+
+
+class Storage(metaclass=SingletonMeta):
+    """
+    Local application database: saved connections, query history, per-connection cached metadata and UI state.
+
+    Database works in WAL mode, so several seeqler processes can read and write it at the same time. Every thread gets
+    its own SQLite connection.
+    """
+
+    def __init__(self, path: Path = DEFAULT_PATH):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+
+        self.connection.executescript(SCHEMA)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "connection", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("pragma journal_mode = wal")
+            conn.execute("pragma synchronous = normal")
+            # built-in lower() and LIKE fold ASCII letters only
+            conn.create_function("unicode_lower", 1, _unicode_lower, deterministic=True)
+            self._local.connection = conn
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self.connection
+        if conn.in_transaction:  # nested call
+            yield conn
+            return
+
+        conn.execute("begin immediate")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("rollback")
+            raise
+        conn.execute("commit")
+
+    def data_version(self) -> int:
+        """
+        Get number that changes every time another connection (thread or process) commits changes to database.
+        """
+        return self.connection.execute("pragma data_version").fetchone()[0]
+
+    # region UI state
+
+    def get_state(self, key: str, default: Any = None) -> Any:
+        row = self.connection.execute("select value from ui_state where key = ?", (key,)).fetchone()
+        return default if row is None else json.loads(row[0])
+
+    def set_state(self, key: str, value: Any) -> None:
+        with self.transaction() as conn:
+            conn.execute("insert or replace into ui_state (key, value) values (?, ?)", (key, json.dumps(value)))
+
+    # endregion
+
+    # region metadata cache
+
+    def get_cached(self, connection: str, key: str, max_age: float | None = None) -> Any:
+        """
+        Get cached value for connection or None if it is absent, older than ``max_age`` seconds or can not be read
+        (e.g. it was saved by version with other classes layout), the latter is deleted.
+        """
+        row = self.connection.execute(
+            "select value, updated_at from metadata_cache where connection = ? and key = ?", (connection, key)
+        ).fetchone()
+        if row is None or max_age is not None and time.time() - row[1] > max_age:
+            return None
+
+        try:
+            return pickle.loads(row[0])
+        except (pickle.UnpicklingError, AttributeError, ImportError, EOFError):
+            with self.transaction() as conn:
+                conn.execute("delete from metadata_cache where connection = ? and key = ?", (connection, key))
+            return None
+
+    def set_cached(self, connection: str, key: str, value: Any) -> None:
+        with self.transaction() as conn:
+            conn.execute(
+                "insert or replace into metadata_cache (connection, key, value, updated_at) values (?, ?, ?, ?)",
+                (connection, key, pickle.dumps(value), time.time()),
+            )
+
+    def clear_cached(self, connection: str) -> None:
+        with self.transaction() as conn:
+            conn.execute("delete from metadata_cache where connection = ?", (connection,))
+
+    # endregion
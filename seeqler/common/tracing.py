@@ -0,0 +1,176 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass, field
+from itertools import count
+from pathlib import Path
+from typing import Any
+
+from .types import SingletonMeta
+
+__all__ = ("TaskTrace", "Tracer", "measure_result", "task_name")
+
+
+MAX_TRACES = 1000
+
+
+@dataclass
+class TaskTrace:
+    """
+    Timings of background task. All the moments are ``time.perf_counter`` values in seconds.
+    """
+
+    id: int
+    name: str
+    queued_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
+    rendered_at: float | None = None  # callback of task result finished at main thread
+    thread: int | None = None
+    rows: int | None = None
+    bytes: int | None = None
+    error: str | None = None
+    traceback: str | None = field(default=None, repr=False)  # formatted traceback of error
+
+    @property
+    def wait(self) -> float | None:
+        return None if self.started_at is None else self.started_at - self.queued_at
+
+    @property
+    def execution(self) -> float | None:
+        return None if self.finished_at is None or self.started_at is None else self.finished_at - self.started_at
+
+    @property
+    def rendering(self) -> float | None:
+        return None if self.rendered_at is None or self.finished_at is None else self.rendered_at - self.finished_at
+
+
+def _is_row(value: Any) -> bool:
+    return isinstance(value, Sequence) and not isinstance(value, (str, bytes))
+
+
+def _find_rows(data: Any, depth: int = 0) -> Sequence | None:
+    # rows are looked for in result itself and in dicts and tuples containing it, e.g. (rows, columns)
+    if depth > 2:
+        return None
+    if hasattr(data, "nbytes") and hasattr(data, "columns"):
+        return data  # ColumnarResult
+    if isinstance(data, list) and (not data or _is_row(data[0])):
+        return data
+    if isinstance(data, dict):
+        children = data.values()
+    elif isinstance(data, tuple):
+        children = data
+    else:
+        return None
+    for child in children:
+        if (rows := _find_rows(child, depth + 1)) is not None:
+            return rows
+    return None
+
+
+def _cell_size(value: Any) -> int:
+    match value:
+        case None:
+            return 0
+        case str() | bytes() | bytearray() | memoryview():
+            return len(value)
+        case _:
+            return 8
+
+
+def measure_result(data: Any) -> tuple[int | None, int | None]:
+    """
+    Estimate number of rows and their size in bytes in result of background task.
+
+    Returns:
+        tuple[int | None, int | None]: rows and bytes or Nones if result contains no rows
+    """
+    rows = _find_rows(data)
+    if rows is None:
+        return None, None
+    if hasattr(rows, "nbytes"):
+        return len(rows), rows.nbytes  # columnar result knows its size
+    return len(rows), sum(_cell_size(cell) for row in rows for cell in row)
+
+
+def task_name(method: Any) -> str:
+    name = getattr(method, "__qualname__", None) or repr(method)
+    return name.replace("<locals>.", "")
+
+
+class Tracer(metaclass=SingletonMeta):
+    """
+    Keeps timings of the most recent background tasks.
+    """
+
+    def __init__(self, size: int = MAX_TRACES):
+        self.origin = time.perf_counter()
+        self.traces: deque[TaskTrace] = deque(maxlen=size)
+        self._ids = count()
+        self._lock = threading.Lock()
+
+    def queued(self, name: str) -> TaskTrace:
+        trace = TaskTrace(next(self._ids), name, time.perf_counter())
+        with self._lock:
+            self.traces.append(trace)
+        return trace
+
+    def clear(self) -> None:
+        with self._lock:
+            self.traces.clear()
+
+    def snapshot(self) -> list[TaskTrace]:
+        with self._lock:
+            return list(self.traces)
+
+    def to_json(self) -> list[dict]:
+        result = []
+        for trace in self.snapshot():
+            item = asdict(trace)
+            item.update(wait=trace.wait, execution=trace.execution, rendering=trace.rendering)
+            result.append(item)
+        return result
+
+    def to_chrome_trace(self) -> dict:
+        """
+        Convert traces to Chrome trace event format (can be opened with chrome://tracing or Perfetto UI). Every task
+        becomes up to three spans: waiting in queue, execution in worker thread and rendering in main thread.
+        """
+        pid, main = os.getpid(), threading.main_thread().ident
+
+        def span(name, trace, start, end, tid):
+            return {
+                "name": name,
+                "cat": trace.name,
+                "ph": "X",
+                "ts": (start - self.origin) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": pid,
+                "tid": tid,
+                "args": {"task": trace.name, "id": trace.id, "rows": trace.rows, "bytes": trace.bytes},
+            }
+
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": "queue"}},
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": main, "args": {"name": "main"}},
+        ]
+        for trace in self.snapshot():
+            if trace.started_at is not None:
+                events.append(span(f"wait {trace.name}", trace, trace.queued_at, trace.started_at, 0))
+            if trace.finished_at is not None:
+                event = span(trace.name, trace, trace.started_at, trace.finished_at, trace.thread or 1)
+                if trace.error:
+                    event["args"]["error"] = trace.error
+                events.append(event)
+            if trace.rendered_at is not None:
+                events.append(span(f"render {trace.name}", trace, trace.finished_at, trace.rendered_at, main))
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def dump(self, path: Path, chrome: bool = False) -> None:
+        data = self.to_chrome_trace() if chrome else self.to_json()
+        with Path(path).open("w") as file:
+            json.dump(data, file, indent=1, default=str)
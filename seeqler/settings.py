@@ -16,6 +16,8 @@ class Settings(metaclass=SingletonMeta):
     lang: "Language"
     resources_path: "Path"
     rows_per_page: int = 100
+    memory_budget: int = 256 * 1024 * 1024  # bytes of data cached by all the tabs
+    watch_interval: int = 5  # seconds between checks of watched tabs for changes
     connection: Optional["Connection"] = None
     screen_width: int = 1024
     screen_height: int = 768
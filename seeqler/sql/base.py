@@ -1,15 +1,50 @@
-from typing import TYPE_CHECKING, Optional, Type
+from typing import TYPE_CHECKING, Any, Optional, Type
 
 import sqlalchemy.exc
 
+from .result import ColumnarResult
+from .statements import StatementProfiler
+
 if TYPE_CHECKING:
     from sqlalchemy.engine import CursorResult, Engine, Inspector
 
+    from .diff import TableSnapshot
+
+
+__all__ = ("BaseSQL", "BaseNoSQL", "quote_table")
 
-__all__ = ("BaseSQL", "BaseNoSQL")
 
+SAMPLE_PERCENT = 1  # percent of table pages to read by default TABLESAMPLE sampling
+WATERMARK_COLUMNS = ("updated_at", "modified_at", "changed_at", "updated", "modified")  # modification time columns
 
-_DRIVER_METHODS = {"connect", "raw", "select", "update", "insert", "delete", "alter"}
+_DRIVER_METHODS = {
+    "connect",
+    "raw",
+    "select",
+    "sample",
+    "estimate_rows",
+    "row_key",
+    "read_value",
+    "schema_version",
+    "schema_snapshot",
+    "attach",
+    "detach",
+    "change_marker",
+    "update",
+    "insert",
+    "delete",
+    "alter",
+}
+
+
+def quote_table(engine: "Engine", table: str, schema: str | None = None) -> str:
+    """
+    Get quoted (and schema-qualified if ``schema`` is set) table name to put into SQL request.
+    """
+    preparer = engine.dialect.identifier_preparer
+    if schema:
+        return f"{preparer.quote_schema(schema)}.{preparer.quote(table)}"
+    return preparer.quote(table)
 
 
 class BaseSQLMeta(type):
@@ -54,13 +89,28 @@ class BaseSQL(metaclass=BaseSQLMeta):
 
     engine: Optional["Engine"] = None
     inspector: Optional["Inspector"] = None
+    statements: Optional[StatementProfiler] = None
+    row_hash_function: str | None = None  # SQL function computing ``diff.row_hash`` of its arguments, if any
+
+    def profile_statements(self) -> None:
+        """
+        Start collecting every statement executed by engine. Drivers call it right after engine is created.
+        """
+        self.statements = StatementProfiler()
+        self.statements.attach(self.engine)
 
-    def raw(self, request, *args, **kwargs) -> tuple[list | str | int, list | str]:
+    def raw(self, request, params: dict | None = None) -> tuple[ColumnarResult | str | int, list | str]:
         try:
             with self.engine.connect() as conn:
-                cursor: "CursorResult" = conn.execute(request, *args, **kwargs)
+                if isinstance(request, str):
+                    # plain strings are passed to DBAPI as is: no bind parameters parsing
+                    cursor: "CursorResult" = conn.exec_driver_sql(request)
+                else:
+                    cursor: "CursorResult" = conn.execute(request, params or {})
                 if cursor.returns_rows:
-                    return cursor.all(), cursor.keys()
+                    # rows are packed by columns batch by batch: row objects of the whole result never exist at once
+                    result = ColumnarResult.from_cursor(cursor)
+                    return result, result.columns
                 return cursor.rowcount, "norows"
         except sqlalchemy.exc.OperationalError as e:
             return str(e), "error"
@@ -87,7 +137,8 @@ class BaseSQL(metaclass=BaseSQLMeta):
         order: str | list[str] | None = None,
         limit: int | str | None = None,
         offset: int | str | None = None,
-    ) -> tuple[list, list]:
+        params: dict | None = None,
+    ) -> tuple[ColumnarResult, list]:
         request = "select "
         if distinct:
             request += "distinct "
@@ -101,8 +152,111 @@ class BaseSQL(metaclass=BaseSQLMeta):
         request += self._stringify(offset, "offset ")
         request += ";"
 
+        if params:
+            return self.raw(sqlalchemy.text(request), params)
         return self.raw(request)
 
+    def sample(
+        self, from_: str, what: str = "*", size: int = 100, schema: str | None = None, stratified: bool = True
+    ) -> tuple[ColumnarResult, list]:
+        """
+        Get sample of ``size`` rows from table without scanning it. Default implementation relies on SQL:2003
+        ``TABLESAMPLE SYSTEM`` clause (1% of table pages), drivers should provide engine-specific ways.
+
+        Args:
+            from_: table name
+            what: columns to select
+            size: number of rows to return
+            schema: schema name
+            stratified: spread sample evenly over table (if driver supports it) or take completely random rows
+
+        Returns:
+            tuple[ColumnarResult, list]: rows and column names like ``raw`` does
+        """
+        table = quote_table(self.engine, from_, schema)
+        request = f"select {what} from {table} tablesample system ({SAMPLE_PERCENT}) limit :size"
+        return self.raw(sqlalchemy.text(request), {"size": size})
+
+    def estimate_rows(self, table: str, schema: str | None = None) -> int | None:
+        """
+        Get approximate number of table rows without scanning it, so big tables are sampled instead of being counted.
+        None means that database does not provide it.
+        """
+        return None
+
+    def schema_version(self, schema: str | None = None) -> int | None:
+        """
+        Get number changed by database on every change of schema definitions, so saved metadata can be checked for
+        being up to date. None means that database does not provide it.
+        """
+        return None
+
+    def schema_snapshot(self, schema: str | None = None) -> dict[str, "TableSnapshot"] | None:
+        """
+        Get definitions of all the tables of schema compared by ``diff.diff_schemas`` in bulk. None means that driver
+        has no faster way than inspector: snapshots are made of table metadata then.
+        """
+        return None
+
+    def change_marker(self, table: str, schema: str | None = None) -> Any:
+        """
+        Get value which differs after table is changed, so watched table is requested again only then. Default is
+        watermark of table: the greatest row key and modification time (see ``WATERMARK_COLUMNS``), so appended rows
+        and updates of modification time are noticed; table without them is counted.
+        """
+        preparer = self.engine.dialect.identifier_preparer
+        columns = {x["name"].lower(): x["name"] for x in self.inspector.get_columns(table, schema=schema)}
+        marks = self.row_key(table, schema)[:1] + [columns[x] for x in WATERMARK_COLUMNS if x in columns]
+        what = ", ".join(f"max({preparer.quote(x)})" for x in marks) or "count(*)"
+        with self.engine.connect() as conn:
+            return tuple(conn.exec_driver_sql(f"select {what} from {quote_table(self.engine, table, schema)}").one())
+
+    # part of value and size of the whole value in bytes, used by ``read_value``
+    value_chunk_sql = "substring({column} from :start for :size)"
+    value_length_sql = "octet_length({column})"
+
+    def row_key(self, table: str, schema: str | None = None) -> list[str]:
+        """
+        Get columns (or pseudo-columns) identifying rows of table, so values of a row can be read again later by
+        ``read_value``. Default is primary key.
+        """
+        return list(self.inspector.get_pk_constraint(table, schema=schema).get("constrained_columns") or [])
+
+    def read_value(
+        self,
+        table: str,
+        column: str,
+        key: dict[str, Any],
+        offset: int,
+        size: int,
+        schema: str | None = None,
+        length: int | None = None,
+    ) -> tuple[bytes | str, int]:
+        """
+        Read part of (large) value without fetching the whole value.
+
+        Args:
+            table: table name
+            column: column name
+            key: values of ``row_key`` columns of the row
+            offset: offset of part in bytes
+            size: size of part in bytes
+            schema: schema name
+            length: size of the whole value returned by previous call, so it is not computed again
+
+        Returns:
+            tuple[bytes | str, int]: part of value and size of the whole value in bytes
+        """
+        preparer = self.engine.dialect.identifier_preparer
+        where = " and ".join(f"{preparer.quote(name)} = :key{idx}" for idx, name in enumerate(key))
+        what = self.value_chunk_sql.format(column=preparer.quote(column))
+        if length is None:
+            what += f", {self.value_length_sql.format(column=preparer.quote(column))}"
+        request = f"select {what} from {quote_table(self.engine, table, schema)} where {where}"
+        params = {f"key{idx}": value for idx, value in enumerate(key.values())} | {"start": offset + 1, "size": size}
+        with self.engine.connect() as conn:
+            row = conn.execute(sqlalchemy.text(request), params).one()
+        return row[0] or b"", (row[1] or 0) if length is None else length
+
 
-class BaseNoSQL:
-    ...
+class BaseNoSQL: ...
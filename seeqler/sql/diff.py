@@ -0,0 +1,383 @@
+import zlib
+from dataclasses import dataclass, field
+from threading import Event
+from typing import TYPE_CHECKING, Any, Iterator
+
+import sqlalchemy as sa
+
+from .base import quote_table
+from .result import ColumnarResult
+
+if TYPE_CHECKING:
+    from PyQt6.QtCore import pyqtBoundSignal
+
+    from .interface import Interface
+    from .metadata import TableMeta
+
+
+__all__ = (
+    "RowDiff",
+    "SchemaChange",
+    "SchemaDiff",
+    "TableDiff",
+    "TableSnapshot",
+    "describe_column",
+    "diff_schemas",
+    "diff_tables",
+    "row_hash",
+    "snapshot_schema",
+)
+
+
+DIFF_CHUNK = 10_000  # rows of segment compared by checksum at once
+DIFF_BATCH = 5_000  # rows fetched from cursor at once when segments differ
+DIFF_SAMPLE = 1_000  # differences of every kind kept to show, the others are only counted
+EXPRESSION = "<expression>"  # index column which is an expression
+
+
+def row_hash(*values: Any) -> int:
+    """
+    32-bit hash of row values. Drivers register it as SQL function (see ``BaseSQL.row_hash_function``), so checksums
+    of row ranges are computed by database and equal ranges are never fetched.
+    """
+    return zlib.crc32(repr(values).encode())
+
+
+def _order(key: tuple) -> tuple:
+    # keys of both sides are compared the way SQLite orders values: NULL, numbers, text, blobs
+    return tuple(
+        (0, 0) if x is None else (1, x) if isinstance(x, (int, float)) else (2, x) if isinstance(x, str) else (3, x)
+        for x in key
+    )
+
+
+@dataclass
+class RowDiff:
+    kind: str  # "added", "removed" or "changed"
+    key: tuple
+    columns: list[str] = field(default_factory=list)  # changed columns
+
+
+@dataclass
+class TableDiff:
+    """
+    Differences of the second (right) table against the first (left) one: rows are "added" to the right table,
+    "removed" from it or "changed". Counts are exact, but only the first ``DIFF_SAMPLE`` rows of every kind are kept.
+    """
+
+    table: str
+    other_table: str
+    key: list[str]
+    columns: list[str]  # compared columns besides key
+    only_left: list[str] = field(default_factory=list)  # columns not compared
+    only_right: list[str] = field(default_factory=list)
+    added: int = 0
+    removed: int = 0
+    changed: int = 0
+    checked: int = 0  # rows of the left table
+    segments: int = 0
+    skipped: int = 0  # segments found equal by checksum
+    cancelled: bool = False
+    rows: list[RowDiff] = field(default_factory=list, repr=False)
+
+    def add(self, kind: str, key: tuple, columns: list[str] | None = None) -> None:
+        count = getattr(self, kind) + 1
+        setattr(self, kind, count)
+        if count <= DIFF_SAMPLE:
+            self.rows.append(RowDiff(kind, key, columns or []))
+
+    @property
+    def identical(self) -> bool:
+        return not (self.added or self.removed or self.changed or self.only_left or self.only_right)
+
+
+class _Side:
+    """
+    Requests to one of compared tables: key boundaries of segments, checksums and rows of segments.
+    """
+
+    def __init__(self, interface: "Interface", table: str, schema: str | None, key: list[str], columns: list[str]):
+        preparer = interface.engine.dialect.identifier_preparer
+        self.interface = interface
+        self.table = quote_table(interface.engine, table, schema)
+        self.key = ", ".join(preparer.quote(x) for x in key)
+        self.what = ", ".join(preparer.quote(x) for x in key + columns)
+        self.width = len(key)
+        self.hash_function = interface.row_hash_function
+
+    def _compare(self, sign: str, name: str, values: tuple) -> tuple[str, dict]:
+        params = {f"{name}{idx}": value for idx, value in enumerate(values)}
+        if self.width == 1:
+            return f"{self.key} {sign} :{name}0", params
+        # row values comparison follows composite key order
+        return f"({self.key}) {sign} ({', '.join(':' + x for x in params)})", params
+
+    def _where(self, low: tuple | None, high: tuple | None) -> tuple[str, dict]:
+        where, params = [], {}
+        for sign, name, values in ((">", "low", low), ("<=", "high", high)):
+            if values is not None:
+                condition, values_params = self._compare(sign, name, values)
+                where.append(condition)
+                params |= values_params
+        return (f" where {' and '.join(where)}" if where else ""), params
+
+    def boundary(self, after: tuple | None, chunk: int) -> tuple | None:
+        """
+        Get key of ``chunk``-th row after ``after`` key, it is found by key index without reading rows.
+        """
+        where, params = self._where(after, None)
+        request = f"select {self.key} from {self.table}{where} order by {self.key} limit 1 offset {chunk - 1}"
+        with self.interface.engine.connect() as conn:
+            row = conn.execute(sa.text(request), params).first()
+        return tuple(row) if row is not None else None
+
+    def checksum(self, low: tuple | None, high: tuple | None) -> tuple[int, int | None]:
+        where, params = self._where(low, high)
+        request = f"select count(*), sum({self.hash_function}({self.what})) from {self.table}{where}"
+        with self.interface.engine.connect() as conn:
+            count, checksum = conn.execute(sa.text(request), params).one()
+        return count, checksum
+
+    def rows(self, low: tuple | None, high: tuple | None) -> Iterator[tuple]:
+        where, params = self._where(low, high)
+        request = f"select {self.what} from {self.table}{where} order by {self.key}"
+        with self.interface.engine.connect() as conn:
+            result = conn.execution_options(stream_results=True).execute(sa.text(request), params)
+            for partition in ColumnarResult.iter_cursor(result, DIFF_BATCH):
+                yield from partition
+
+
+def _merge(result: TableDiff, left_rows: Iterator[tuple], right_rows: Iterator[tuple], width: int) -> None:
+    # both sides are ordered by key: rows are joined in a single pass
+    left_row, right_row = next(left_rows, None), next(right_rows, None)
+    while left_row is not None or right_row is not None:
+        left_key = left_row[:width] if left_row is not None else None
+        right_key = right_row[:width] if right_row is not None else None
+
+        if right_key is None or left_key is not None and _order(left_key) < _order(right_key):
+            result.add("removed", left_key)
+            result.checked += 1
+            left_row = next(left_rows, None)
+        elif left_key is None or _order(right_key) < _order(left_key):
+            result.add("added", right_key)
+            right_row = next(right_rows, None)
+        else:
+            changed = [name for name, a, b in zip(result.columns, left_row[width:], right_row[width:]) if a != b]
+            if changed:
+                result.add("changed", left_key, changed)
+            result.checked += 1
+            left_row, right_row = next(left_rows, None), next(right_rows, None)
+
+
+def diff_tables(
+    left: "Interface",
+    right: "Interface",
+    table: str,
+    other_table: str | None = None,
+    schema: str | None = None,
+    other_schema: str | None = None,
+    cancel: Event | None = None,
+    signal: "pyqtBoundSignal | None" = None,
+    chunk: int = DIFF_CHUNK,
+) -> TableDiff:
+    """
+    Compare rows of two tables with the same primary key, the tables may belong to different connections.
+
+    Key range of the left table is split into segments of ``chunk`` rows. If both databases can hash rows (see
+    ``BaseSQL.row_hash_function``), row count and checksum of every segment are compared first and equal segments are
+    skipped. Rows of other segments are streamed from both tables ordered by key and merge-joined, so memory does not
+    depend on table size.
+
+    Args:
+        left: connected interface of the first table
+        right: connected interface of the second table (may be the same as ``left``)
+        table: name of the first table
+        other_table: name of the second table (the same as ``table`` by default)
+        schema: schema of the first table
+        other_schema: schema of the second table
+        cancel: event to stop comparison
+        signal: Retriever progress signal, receives counts of checked rows and differences
+        chunk: rows of the left table in segment
+
+    Returns:
+        TableDiff: differences of the second table
+
+    Raises:
+        ValueError: if the tables have no primary key or their keys differ
+    """
+    other_table = other_table or table
+    left_meta, right_meta = left.metadata.table(table, schema), right.metadata.table(other_table, other_schema)
+
+    key = left_meta.primary_key
+    if not key or key != right_meta.primary_key:
+        raise ValueError(f"Tables {table} and {other_table} must have the same primary key to be compared")
+
+    right_columns = set(right_meta.column_names)
+    columns = [x for x in left_meta.column_names if x in right_columns and x not in key]
+    result = TableDiff(
+        table,
+        other_table,
+        key,
+        columns,
+        only_left=[x for x in left_meta.column_names if x not in right_columns],
+        only_right=[x for x in right_meta.column_names if x not in set(left_meta.column_names)],
+    )
+
+    left_side = _Side(left, table, schema, key, columns)
+    right_side = _Side(right, other_table, other_schema, key, columns)
+    hashed = left_side.hash_function is not None and right_side.hash_function is not None
+    width = len(key)
+
+    low = None
+    while True:
+        if cancel and cancel.is_set():
+            result.cancelled = True
+            break
+
+        # the last segment is open: it takes rows of the right table after the last key of the left one
+        high = left_side.boundary(low, chunk)
+        result.segments += 1
+
+        if hashed and (counts := left_side.checksum(low, high)) == right_side.checksum(low, high):
+            result.checked += counts[0]
+            result.skipped += 1
+        else:
+            _merge(result, left_side.rows(low, high), right_side.rows(low, high), width)
+
+        if signal is not None:
+            signal.emit(
+                {"rows": result.checked, "added": result.added, "removed": result.removed, "changed": result.changed}
+            )
+        low = high
+        if high is None:
+            break
+
+    return result
+
+
+# region schema diff
+
+
+@dataclass
+class TableSnapshot:
+    """
+    Definition of table compared by ``diff_schemas``: it is much smaller than ``TableMeta``, so snapshots of big
+    schemas are cheap to keep between sessions.
+    """
+
+    columns: dict[str, str]  # descriptions of columns by names, in table order
+    primary_key: tuple[str, ...]
+    foreign_keys: frozenset[tuple]  # (columns, referred table, referred columns)
+    indexes: frozenset[tuple]  # (columns, unique)
+
+    @classmethod
+    def from_meta(cls, meta: "TableMeta") -> "TableSnapshot":
+        return cls(
+            columns={col["name"]: describe_column(col) for col in meta.columns},
+            primary_key=tuple(meta.primary_key),
+            foreign_keys=frozenset(
+                (tuple(fk["constrained_columns"]), fk["referred_table"], tuple(fk["referred_columns"]))
+                for fk in meta.foreign_keys
+            ),
+            indexes=frozenset(
+                (tuple(x or EXPRESSION for x in index["column_names"]), bool(index["unique"])) for index in meta.indexes
+            ),
+        )
+
+
+def describe_column(column: dict) -> str:
+    """
+    Describe column of snapshot by type, nullability and default value (like ``Inspector.get_columns`` reports them).
+    """
+    text = str(column["type"])
+    if not column.get("nullable", True):
+        text += " not null"
+    if column.get("default") is not None:
+        text += f" default {column['default']}"
+    return text
+
+
+def snapshot_schema(interface: "Interface", schema: str | None = None) -> dict[str, TableSnapshot]:
+    """
+    Get snapshots of all the tables of schema: in bulk from driver if it can make them (see
+    ``BaseSQL.schema_snapshot``) or from metadata loaded by ``MetadataCache.load_schema``.
+    """
+    snapshot = interface.schema_snapshot(schema)
+    if snapshot is None:
+        snapshot = {
+            name: TableSnapshot.from_meta(meta) for name, meta in interface.metadata.load_schema(schema).items()
+        }
+    return snapshot
+
+
+def _describe_key(kind: str, key: tuple) -> str:
+    if kind == "index":
+        columns, unique = key
+        return f"{'unique ' if unique else ''}({', '.join(columns)})"
+    columns, table, referred = key
+    return f"({', '.join(columns)}) → {table}({', '.join(referred)})"
+
+
+@dataclass
+class SchemaChange:
+    table: str
+    kind: str  # "column", "primary_key", "index" or "foreign_key"
+    name: str
+    left: str | None  # definition in the first schema, None if it is missing there
+    right: str | None
+
+
+@dataclass
+class SchemaDiff:
+    only_left: list[str] = field(default_factory=list)  # tables missing in the second schema
+    only_right: list[str] = field(default_factory=list)
+    changes: list[SchemaChange] = field(default_factory=list)
+    tables: int = 0  # tables of both schemas
+
+    @property
+    def identical(self) -> bool:
+        return not (self.only_left or self.only_right or self.changes)
+
+
+def diff_schemas(left: dict[str, TableSnapshot], right: dict[str, TableSnapshot]) -> SchemaDiff:
+    """
+    Compare snapshots of two schemas: missing tables, columns with different definitions, primary keys, indexes and
+    foreign keys. Equal tables are skipped by a single comparison of their snapshots.
+
+    Args:
+        left: snapshots of tables of the first schema by names
+        right: snapshots of tables of the second schema by names
+
+    Returns:
+        SchemaDiff: differences of the second schema
+    """
+    result = SchemaDiff(sorted(left.keys() - right.keys()), sorted(right.keys() - left.keys()))
+    common = sorted(left.keys() & right.keys())
+    result.tables = len(common)
+
+    for table in common:
+        first, second = left[table], right[table]
+        if first == second:
+            continue
+
+        for name in first.columns | second.columns:
+            if (definition := first.columns.get(name)) != second.columns.get(name):
+                result.changes.append(SchemaChange(table, "column", name, definition, second.columns.get(name)))
+
+        if first.primary_key != second.primary_key:
+            key = (", ".join(first.primary_key) or None, ", ".join(second.primary_key) or None)
+            result.changes.append(SchemaChange(table, "primary_key", "", *key))
+
+        for kind, attribute in (("index", "indexes"), ("foreign_key", "foreign_keys")):
+            first_keys, second_keys = getattr(first, attribute), getattr(second, attribute)
+            for key in sorted(first_keys - second_keys):
+                text = _describe_key(kind, key)
+                result.changes.append(SchemaChange(table, kind, text, text, None))
+            for key in sorted(second_keys - first_keys):
+                text = _describe_key(kind, key)
+                result.changes.append(SchemaChange(table, kind, text, None, text))
+
+    return result
+
+
+# endregion
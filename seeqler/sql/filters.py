@@ -0,0 +1,79 @@
+from typing import Any, Callable
+
+__all__ = ("escape_like", "parse_filter", "exact_filter", "build_filters")
+
+
+OPERATORS = ("<=", ">=", "!=", "<>", "=", "<", ">")  # longer operators go first
+
+
+def escape_like(text: str, escape: str = "\\") -> str:
+    return text.replace(escape, escape * 2).replace("%", escape + "%").replace("_", escape + "_")
+
+
+def _literal(value: str) -> int | float | str:
+    for kind in (int, float):
+        try:
+            return kind(value)
+        except ValueError:
+            pass
+    return value
+
+
+def parse_filter(column: str, text: str, param: str) -> tuple[str, dict]:
+    """
+    Make SQL condition with bound parameter from user-typed column filter.
+
+    Supported syntax: ``null`` / ``!null`` to check for NULL, comparison operator (``=``, ``!=``, ``<``, ``>=`` etc.)
+    followed by value and plain text to search for substring with ``LIKE``.
+
+    Args:
+        column: quoted column name
+        text: filter text
+        param: bound parameter name
+
+    Returns:
+        tuple[str, dict]: SQL condition and its parameters
+    """
+    text = text.strip()
+    match text.lower():
+        case "null" | "is null":
+            return f"{column} is null", {}
+        case "!null" | "not null" | "is not null":
+            return f"{column} is not null", {}
+
+    for operator in OPERATORS:
+        if text.startswith(operator):
+            return f"{column} {operator} :{param}", {param: _literal(text[len(operator) :].strip())}
+
+    return f"{column} like :{param} escape '\\'", {param: f"%{escape_like(text)}%"}
+
+
+def exact_filter(value: Any) -> str:
+    """
+    Get filter text shown for value compared as is (see ``build_filters``).
+    """
+    return f"={value}"
+
+
+def build_filters(
+    filters: dict[str, str], quote: Callable[[str], str], exact: dict[str, Any] | None = None
+) -> tuple[list[str], dict]:
+    """
+    Make list of SQL conditions (to join with ``and``) and their parameters from filters by column name.
+
+    Values of ``exact`` (e.g. keys of referred rows) are passed to database as they are, without parsing of filter
+    text: "007" stays a string and 1.0 stays a float. They are used while filter of column is ``exact_filter`` of the
+    value, i.e. until user changes it.
+    """
+    conditions, params = [], {}
+    for idx, (column, text) in enumerate(filters.items()):
+        if not text.strip():
+            continue
+        if exact and column in exact and text == exact_filter(exact[column]):
+            conditions.append(f"{quote(column)} = :filter_{idx}")
+            params[f"filter_{idx}"] = exact[column]
+            continue
+        condition, param = parse_filter(quote(column), text, f"filter_{idx}")
+        conditions.append(condition)
+        params |= param
+    return conditions, params
@@ -0,0 +1,251 @@
+import hashlib
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from threading import RLock
+from typing import TYPE_CHECKING
+
+import sqlalchemy as sa
+
+from .base import quote_table
+from .filters import escape_like
+from .search import SearchHit
+
+if TYPE_CHECKING:
+    from .interface import Interface
+
+
+__all__ = ("IndexedTable", "FullTextIndex")
+
+
+DEFAULT_PATH = Path.home() / ".config" / "seeqler" / "fulltext"
+BATCH_SIZE = 5000  # rows to index in one background step
+
+
+@dataclass
+class IndexedTable:
+    schema: str
+    table: str
+    columns: list[str]
+    last_key: int | None = None  # greatest indexed rowid
+    row_count: int = 0  # number of indexed rows
+
+
+class FullTextIndex:
+    """
+    Local FTS5 index over selected text columns of connection tables.
+
+    Index is stored in a separate SQLite file and filled by rowid ranges: every ``index_step`` call indexes at most
+    ``BATCH_SIZE`` rows of one table, so building a big index never blocks other background tasks for long. Tables are
+    checked for changes by (row count, max rowid) watermark: appended rows are indexed incrementally, deletions cause
+    table reindexing. In-place updates are not detected — use ``reset`` to reindex a table.
+    """
+
+    def __init__(self, connection_string: str, path: Path = DEFAULT_PATH):
+        path.mkdir(parents=True, exist_ok=True)
+        self.path = path / f"{hashlib.sha1(connection_string.encode()).hexdigest()[:16]}.sqlite"
+        self._lock = RLock()
+        self._fresh: set[tuple[str, str]] = set()  # checked and up to date
+        self._appending: set[tuple[str, str]] = set()  # checked and partially indexed
+        self._unindexable: set[tuple[str, str]] = set()  # checked but can not be indexed by ranges
+
+        with self._connect() as conn:
+            conn.execute(
+                "create table if not exists indexed_tables (schema text not null, tbl text not null, columns text, "
+                "last_key integer, row_count integer not null default 0, primary key (schema, tbl))"
+            )
+            conn.execute(
+                "create virtual table if not exists entries "
+                "using fts5(value, schema unindexed, tbl unindexed, col unindexed, rid unindexed, tokenize='trigram')"
+            )
+
+    @contextmanager
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path)
+        try:
+            with conn:  # commit or rollback
+                yield conn
+        finally:
+            conn.close()
+
+    def tables(self, schema: str | None = None) -> dict[str, IndexedTable]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "select schema, tbl, columns, last_key, row_count from indexed_tables where schema = ?",
+                (schema or "",),
+            ).fetchall()
+        return {row[1]: IndexedTable(row[0], row[1], row[2].split("\n"), row[3], row[4]) for row in rows}
+
+    def complete(self, schema: str | None = None) -> dict[str, IndexedTable]:
+        """
+        Get tables which are completely indexed and checked to be up to date since the last ``start_update``, so their
+        columns can be searched in index only. Tables which are being indexed or can not be indexed are not included.
+        """
+        schema = schema or ""
+        with self._lock:
+            complete = {table for table_schema, table in self._fresh - self._unindexable if table_schema == schema}
+        return {name: indexed for name, indexed in self.tables(schema).items() if name in complete}
+
+    def configure(self, schema: str | None, selection: dict[str, list[str]]) -> None:
+        """
+        Set tables and columns to index. Tables with changed column set are reindexed, tables not presented in
+        ``selection`` are removed from index.
+
+        Args:
+            schema: schema name
+            selection: list of text columns by table name
+        """
+        schema = schema or ""
+        current = self.tables(schema)
+
+        with self._lock, self._connect() as conn:
+            for table, indexed in current.items():
+                if selection.get(table) != indexed.columns:
+                    conn.execute("delete from entries where schema = ? and tbl = ?", (schema, table))
+                    conn.execute("delete from indexed_tables where schema = ? and tbl = ?", (schema, table))
+                    self._fresh.discard((schema, table))
+
+            for table, columns in selection.items():
+                if columns and (table not in current or current[table].columns != columns):
+                    conn.execute(
+                        "insert into indexed_tables (schema, tbl, columns) values (?, ?, ?)",
+                        (schema, table, "\n".join(columns)),
+                    )
+
+    def reset(self, schema: str | None, table: str) -> None:
+        schema = schema or ""
+        with self._lock, self._connect() as conn:
+            conn.execute("delete from entries where schema = ? and tbl = ?", (schema, table))
+            conn.execute(
+                "update indexed_tables set last_key = null, row_count = 0 where schema = ? and tbl = ?",
+                (schema, table),
+            )
+        self._fresh.discard((schema, table))
+        self._appending.discard((schema, table))
+
+    def start_update(self) -> None:
+        """
+        Forget which tables were checked for changes: next ``index_step`` calls will check all of them again.
+        """
+        self._fresh.clear()
+        self._appending.clear()
+        self._unindexable.clear()
+
+    @staticmethod
+    def _key_column(interface: "Interface", schema: str, table: str) -> str | None:
+        meta = interface.metadata.table(table, schema or None)
+        if len(meta.primary_key) == 1 and isinstance(meta.column(meta.primary_key[0])["type"], sa.types.Integer):
+            return interface.engine.dialect.identifier_preparer.quote(meta.primary_key[0])
+        if interface.engine.dialect.name == "sqlite" and interface.row_key(table, schema or None) == ["rowid"]:
+            return "rowid"  # WITHOUT ROWID tables and views have no rowid
+        return None
+
+    def _is_changed(self, interface: "Interface", indexed: IndexedTable, key: str) -> bool | None:
+        """
+        Compare watermark of source table with index state.
+
+        Returns:
+            bool | None: None if table is up to date, True if it has to be reindexed, False if new rows were appended
+        """
+        table = quote_table(interface.engine, indexed.table, indexed.schema or None)
+        request = f"select count(*), max({key}), count(case when {key} > :last_key then 1 end) from {table}"
+        with interface.engine.connect() as conn:
+            count, max_key, appended = conn.execute(sa.text(request), {"last_key": indexed.last_key or 0}).one()
+
+        if count == indexed.row_count and max_key == indexed.last_key:
+            return None
+        if indexed.last_key is None or count - appended == indexed.row_count:
+            return False
+        return True
+
+    def index_step(self, interface: "Interface", schema: str | None = None, batch: int = BATCH_SIZE) -> dict | None:
+        """
+        Index next batch of rows of the first table that is not up to date.
+
+        Args:
+            interface: connected interface of indexed database
+            schema: schema name
+            batch: max number of rows to index
+
+        Returns:
+            dict | None: indexed table name and count of indexed rows or None if the whole index is up to date
+        """
+        schema = schema or ""
+
+        with self._lock:
+            for indexed in self.tables(schema).values():
+                if (schema, indexed.table) in self._fresh:
+                    continue
+
+                key = self._key_column(interface, schema, indexed.table)
+                if key is None:
+                    self._fresh.add((schema, indexed.table))  # can not be indexed by ranges
+                    self._unindexable.add((schema, indexed.table))
+                    continue
+
+                if (schema, indexed.table) not in self._appending:
+                    match self._is_changed(interface, indexed, key):
+                        case None:
+                            self._fresh.add((schema, indexed.table))
+                            continue
+                        case True:
+                            self.reset(schema, indexed.table)
+                            indexed.last_key, indexed.row_count = None, 0
+
+                return self._index_range(interface, indexed, key, batch)
+        return None
+
+    def _index_range(self, interface: "Interface", indexed: IndexedTable, key: str, batch: int) -> dict:
+        preparer = interface.engine.dialect.identifier_preparer
+        request = "select {key}, {columns} from {table} {where} order by {key} limit :batch".format(
+            key=key,
+            columns=", ".join(preparer.quote(col) for col in indexed.columns),
+            table=quote_table(interface.engine, indexed.table, indexed.schema or None),
+            where="" if indexed.last_key is None else f"where {key} > :last_key",
+        )
+
+        with interface.engine.connect() as conn:
+            rows = conn.execute(sa.text(request), {"batch": batch, "last_key": indexed.last_key}).all()
+
+        if len(rows) < batch:
+            self._fresh.add((indexed.schema, indexed.table))
+            self._appending.discard((indexed.schema, indexed.table))
+        else:
+            self._appending.add((indexed.schema, indexed.table))
+
+        if not rows:
+            return {"table": indexed.table, "rows": 0}
+
+        entries = (
+            (str(value), indexed.schema, indexed.table, column, row[0])
+            for row in rows
+            for column, value in zip(indexed.columns, row[1:])
+            if value is not None
+        )
+        with self._connect() as conn:
+            conn.executemany("insert into entries (value, schema, tbl, col, rid) values (?, ?, ?, ?, ?)", entries)
+            conn.execute(
+                "update indexed_tables set last_key = ?, row_count = row_count + ? where schema = ? and tbl = ?",
+                (rows[-1][0], len(rows), indexed.schema, indexed.table),
+            )
+        return {"table": indexed.table, "rows": len(rows)}
+
+    def search(self, text: str, schema: str | None = None, limit: int = 20) -> list[SearchHit]:
+        """
+        Search for ``text`` in indexed values, at most ``limit`` values per table.
+        """
+        schema = schema or ""
+        if len(text) >= 3:
+            # trigram tokenizer matches any substring of at least 3 characters
+            condition, value = "entries match ?", '"{}"'.format(text.replace('"', '""'))
+        else:
+            condition, value = "value like ? escape '\\'", f"%{escape_like(text)}%"
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                "select tbl, col, value from (select tbl, col, value, row_number() over (partition by tbl) as num "
+                f"from entries where {condition} and schema = ?) where num <= ?",
+                (value, schema, limit),
+            ).fetchall()
+        return [SearchHit("data", table, schema or None, column, value) for table, column, value in rows]
@@ -1,6 +1,7 @@
+import threading
 from typing import TYPE_CHECKING, Type
 
-from .sqlite import SQLite
+from ..common.types import SingletonMeta
 
 if TYPE_CHECKING:
     from ..common.connection_manager import Connection
@@ -20,8 +21,11 @@ def driver_factory(dbms: str) -> Type["BaseSQL"] | Type["BaseNoSQL"]:
     Raises:
         NotImplementedError: if driver is not implemented
     """
+    # drivers are imported on demand: they pull in SQLAlchemy and DBMS client libraries
     match dbms:
         case "sqlite":
+            from .sqlite import SQLite
+
             return SQLite
         case _:
             raise NotImplementedError(f"{dbms} driver is not implemented (yet?)")
@@ -52,6 +56,7 @@ class Interface:
         self._impl = (driver_factory(self._type))()
         self.provide_implementation()
         self.connected = False
+        self._lock = threading.Lock()
 
     def provide_implementation(self) -> None:
         for method in self._impl.methods:
@@ -67,14 +72,73 @@ class Interface:
 
             setattr(self, method, make_func(method).__get__(self, Interface))
 
+    def supports(self, method: str) -> bool:
+        """
+        Check whether driver implements optional method (e.g. ``attach``), so UI shows related actions only then.
+        """
+        return method in self._impl.methods and not hasattr(getattr(self._impl, method), "is_stub")
+
     def connect(self, conn: "Connection"):
         # basic entrypoint to work with connections
         # may need to have some common preparations here
+        with self._lock:
+            # interface is shared by windows of the same database (see EngineRegistry): it is connected once
+            if not self.connected:
+                self._connect(conn)
+
+    def _connect(self, conn: "Connection"):
         self._impl.connect(conn.connection_string)
         self.engine = self._impl.engine
         self.inspector = self._impl.inspector
+        self.statements = self._impl.statements
+        self.row_hash_function = self._impl.row_hash_function
+
+        from .metadata import MetadataCache
+
+        self.metadata = MetadataCache(self.inspector)
         self.connected = True
 
     @ensure_connected
     def disconnect(self):
-        self._impl.disconnect()
+        with self._lock:
+            self._impl.disconnect()
+            self.connected = False
+
+
+class EngineRegistry(metaclass=SingletonMeta):
+    """
+    Interfaces of open connections shared by windows: windows of the same database use one engine (with its
+    connection pool, statement profiler and metadata cache), and the engine is disposed when the last of them is
+    closed.
+    """
+
+    def __init__(self):
+        self._interfaces: dict[str, Interface] = {}
+        self._users: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, conn: "Connection") -> Interface:
+        """
+        Get interface of connection (not connected yet if nobody has used it) and register one more user of it.
+        """
+        key = conn.connection_string
+        with self._lock:
+            if key not in self._interfaces:
+                self._interfaces[key] = Interface("sqlite")  # TODO: Interface(conn.type)
+            self._users[key] = self._users.get(key, 0) + 1
+            return self._interfaces[key]
+
+    def release(self, conn: "Connection") -> None:
+        """
+        Unregister user of connection interface, disconnect it if there are no users left.
+        """
+        key = conn.connection_string
+        with self._lock:
+            self._users[key] = self._users.get(key, 1) - 1
+            if self._users[key] > 0:
+                return
+            del self._users[key]
+            interface = self._interfaces.pop(key, None)
+
+        if interface is not None and interface.connected:
+            interface.disconnect()
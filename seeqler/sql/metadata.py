@@ -0,0 +1,176 @@
+from dataclasses import dataclass, field
+from threading import RLock
+from typing import TYPE_CHECKING
+
+import sqlalchemy as sa
+
+from .references import Reference
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Inspector
+
+    from .profiling import TableProfile
+
+
+__all__ = ("TableMeta", "MetadataCache", "is_large_type")
+
+
+def is_large_type(type_: sa.types.TypeEngine) -> bool:
+    """
+    Check if column of the type may keep large values: unbounded text, binary and untyped columns.
+    """
+    if isinstance(type_, (sa.types._Binary, sa.types.NullType)):
+        return True
+    return isinstance(type_, sa.types.String) and not type_.length
+
+
+@dataclass
+class TableMeta:
+    name: str
+    schema: str | None
+    columns: list[dict]
+    primary_key: list[str] = field(default_factory=list)
+    foreign_keys: list[dict] = field(default_factory=list)
+    indexes: list[dict] = field(default_factory=list)
+    profile: "TableProfile | None" = field(default=None, repr=False)
+    row_key: list[str] | None = None  # columns identifying rows, see BaseSQL.row_key; None until requested
+
+    @property
+    def column_names(self) -> list[str]:
+        return [col["name"] for col in self.columns]
+
+    @property
+    def text_columns(self) -> list[str]:
+        return [col["name"] for col in self.columns if isinstance(col["type"], sa.types.String)]
+
+    @property
+    def large_columns(self) -> list[str]:
+        return [col["name"] for col in self.columns if is_large_type(col["type"])]
+
+    @property
+    def references(self) -> dict[str, Reference]:
+        """
+        Referred columns by columns of single-column foreign keys.
+        """
+        return {
+            fk["constrained_columns"][0]: Reference(
+                fk.get("referred_schema") or self.schema, fk["referred_table"], fk["referred_columns"][0]
+            )
+            for fk in self.foreign_keys
+            if len(fk["constrained_columns"]) == 1 and fk.get("referred_columns")
+        }
+
+    def is_indexed(self, column: str) -> bool:
+        """
+        Check if ``column`` leads primary key or some index, so sorting by it does not require full scan.
+        """
+        if self.primary_key[:1] == [column]:
+            return True
+        return any(index["column_names"][:1] == [column] for index in self.indexes)
+
+    def column(self, name: str) -> dict | None:
+        for col in self.columns:
+            if col["name"] == name:
+                return col
+        return None
+
+
+class MetadataCache:
+    """
+    Cache of inspector data: table names, columns, keys and indexes per schema.
+
+    Every SQL request made by ``Inspector`` is executed only once per table; the whole schema can be loaded in bulk
+    with ``load_schema`` to make name-based lookups (search, diff, ...) instant afterwards.
+    """
+
+    def __init__(self, inspector: "Inspector"):
+        self.inspector = inspector
+        self._lock = RLock()
+        self._tables: dict[str | None, list[str]] = {}
+        self._meta: dict[tuple[str | None, str], TableMeta] = {}
+        self._complete: set[str | None] = set()
+
+    @staticmethod
+    def _make_meta(name, schema, columns, pk, fkeys, indexes) -> TableMeta:
+        columns = [dict(col) for col in columns]
+        fk_names = {
+            fk["constrained_columns"][0]: "{referred_schema}.{referred_table}({referred_columns[0]})".format(**fk)
+            for fk in fkeys
+        }
+        for col in columns:
+            col["fkey"] = fk_names.get(col["name"])
+
+        return TableMeta(
+            name=name,
+            schema=schema,
+            columns=columns,
+            primary_key=list((pk or {}).get("constrained_columns") or []),
+            foreign_keys=list(fkeys),
+            indexes=list(indexes),
+        )
+
+    def invalidate(self, schema: str | None = None) -> None:
+        with self._lock:
+            self.inspector.info_cache.clear()  # Inspector.clear_cache is missing in SQLAlchemy 1.4
+            self._tables.pop(schema, None)
+            self._complete.discard(schema)
+            for key in [k for k in self._meta if k[0] == schema]:
+                del self._meta[key]
+
+    def tables(self, schema: str | None = None) -> list[str]:
+        with self._lock:
+            if schema not in self._tables:
+                self._tables[schema] = sorted(self.inspector.get_table_names(schema))
+            return self._tables[schema]
+
+    def table(self, name: str, schema: str | None = None) -> TableMeta:
+        with self._lock:
+            if (schema, name) not in self._meta:
+                self._meta[(schema, name)] = self._make_meta(
+                    name,
+                    schema,
+                    self.inspector.get_columns(name, schema=schema),
+                    self.inspector.get_pk_constraint(name, schema=schema),
+                    self.inspector.get_foreign_keys(name, schema=schema),
+                    self.inspector.get_indexes(name, schema=schema),
+                )
+            return self._meta[(schema, name)]
+
+    def is_loaded(self, schema: str | None = None) -> bool:
+        return schema in self._complete
+
+    def load_schema(self, schema: str | None = None) -> dict[str, TableMeta]:
+        """
+        Load metadata of every table of ``schema`` at once. Uses ``Inspector.get_multi_*`` bulk methods when dialect
+        provides them and falls back to per-table requests otherwise.
+
+        Args:
+            schema: schema name
+
+        Returns:
+            dict[str, TableMeta]: metadata by table name
+        """
+        with self._lock:
+            if schema in self._complete:
+                return {name: self._meta[(schema, name)] for name in self.tables(schema)}
+
+            names = self.tables(schema)
+            if hasattr(self.inspector, "get_multi_columns"):
+                columns = self.inspector.get_multi_columns(schema=schema)
+                pks = self.inspector.get_multi_pk_constraint(schema=schema)
+                fkeys = self.inspector.get_multi_foreign_keys(schema=schema)
+                indexes = self.inspector.get_multi_indexes(schema=schema)
+
+                for key, cols in columns.items():
+                    _, name = key
+                    if name not in names or (schema, name) in self._meta:
+                        continue  # views are not listed as tables, loaded tables are kept with their profiles
+                    self._meta[(schema, name)] = self._make_meta(
+                        name, schema, cols, pks.get(key), fkeys.get(key, []), indexes.get(key, [])
+                    )
+
+            for name in names:
+                self.table(name, schema)
+
+            self._complete.add(schema)
+            return {name: self._meta[(schema, name)] for name in names}
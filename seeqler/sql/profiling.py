@@ -0,0 +1,219 @@
+import hashlib
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import sqlalchemy as sa
+
+from .base import quote_table
+from .result import Column, ColumnarResult, DictionaryColumn, ObjectColumn
+
+if TYPE_CHECKING:
+    from PyQt6.QtCore import pyqtBoundSignal
+
+    from .interface import Interface
+
+
+__all__ = ("HyperLogLog", "TopK", "ColumnProfile", "TableProfile", "profile_table")
+
+
+PROFILE_BATCH = 10_000  # rows fetched from cursor at once
+PROFILE_SAMPLE_THRESHOLD = 1_000_000  # tables with more rows are profiled by sample
+PROFILE_SAMPLE_SIZE = 100_000
+TOP_K = 5
+
+
+class HyperLogLog:
+    """
+    Cardinality estimator: counts distinct values in fixed memory (``2 ** precision`` registers) with ~1.6% error for
+    default precision.
+    """
+
+    def __init__(self, precision: int = 12):
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(self.size)
+        self.alpha = 0.7213 / (1 + 1.079 / self.size)
+
+    def add(self, value: Any) -> None:
+        digest = hashlib.blake2b(repr(value).encode(), digest_size=8).digest()
+        hashed = int.from_bytes(digest, "big")
+        index = hashed >> (64 - self.precision)
+        rest = hashed & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self) -> int:
+        estimate = self.alpha * self.size**2 / sum(2.0**-r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.size and zeros:
+            estimate = self.size * math.log(self.size / zeros)  # linear counting for small cardinalities
+        return round(estimate)
+
+
+class TopK:
+    """
+    Misra-Gries heavy hitters counter: keeps at most ``capacity`` counters and reports the most frequent values.
+    When all counters are occupied, all of them are decreased by the smallest one, so reported counts are lower bounds
+    of real counts and values which are not guaranteed to repeat are not reported.
+    """
+
+    def __init__(self, k: int = TOP_K, capacity: int | None = None):
+        self.k = k
+        self.capacity = capacity or k * 20
+        self.counters: dict[Any, int] = {}
+
+    def add(self, value: Any, count: int = 1) -> None:
+        if value in self.counters:
+            self.counters[value] += count
+            return
+
+        if len(self.counters) >= self.capacity:
+            smallest = min(min(self.counters.values()), count)
+            self.counters = {k: v - smallest for k, v in self.counters.items() if v > smallest}
+            count -= smallest
+        if count:
+            self.counters[value] = count
+
+    def top(self) -> list[tuple[Any, int]]:
+        repeated = [(value, count) for value, count in self.counters.items() if count > 1]
+        return sorted(repeated, key=lambda x: x[1], reverse=True)[: self.k]
+
+
+def _sort_key(value: Any) -> tuple:
+    # SQLite-like ordering of mixed types: numbers < text < blobs
+    match value:
+        case bool() | int() | float():
+            return 0, value
+        case str():
+            return 1, value
+        case bytes():
+            return 2, value
+    return 3, str(value)
+
+
+@dataclass
+class ColumnProfile:
+    name: str
+    nulls: int = 0
+    min: Any = None
+    max: Any = None
+    distinct: HyperLogLog = field(default_factory=HyperLogLog, repr=False)
+    frequent: TopK = field(default_factory=TopK, repr=False)
+
+    def add(self, value: Any) -> None:
+        if value is None:
+            self.nulls += 1
+            return
+
+        if isinstance(value, memoryview):
+            value = bytes(value)
+
+        self._update_bounds(value)
+        self.distinct.add(value)
+        self.frequent.add(value)
+
+    def add_column(self, column: Column) -> None:
+        """
+        Add all values of result column at once: equal values are counted together, so every distinct value is
+        hashed once per column.
+        """
+        if isinstance(column, ObjectColumn):
+            for value in column:
+                self.add(value)
+            return
+
+        if isinstance(column, DictionaryColumn):
+            codes = Counter(column.codes)
+            self.nulls += codes.pop(-1, 0)
+            counts = {column.values[code]: count for code, count in codes.items()}
+        else:
+            counts = Counter(column)
+            self.nulls += counts.pop(None, 0)
+        if not counts:
+            return
+
+        # typed columns keep values of the same type, so they are compared directly
+        self._update_bounds(min(counts))
+        self._update_bounds(max(counts))
+        for value, count in counts.items():
+            self.distinct.add(value)
+            self.frequent.add(value, count)
+
+    def _update_bounds(self, value: Any) -> None:
+        key = _sort_key(value)
+        if self.min is None or key < _sort_key(self.min):
+            self.min = value
+        if self.max is None or key > _sort_key(self.max):
+            self.max = value
+
+
+@dataclass
+class TableProfile:
+    table: str
+    rows: int  # number of rows in table (estimated by driver if it is sampled)
+    scanned: int  # number of profiled rows
+    columns: list[ColumnProfile]
+
+    @property
+    def sampled(self) -> bool:
+        return self.scanned < self.rows
+
+
+def profile_table(
+    interface: "Interface",
+    table: str,
+    schema: str | None = None,
+    columns: list[str] | None = None,
+    signal: "pyqtBoundSignal | None" = None,
+) -> TableProfile:
+    """
+    Compute per-column statistics (null count, distinct estimate, min/max, most frequent values) in a single
+    streaming pass over table. Tables bigger than ``PROFILE_SAMPLE_THRESHOLD`` rows (as driver estimates without
+    counting them) are profiled by a driver-made sample of ``PROFILE_SAMPLE_SIZE`` rows. Result is cached in table
+    metadata.
+
+    Args:
+        interface: connected interface
+        table: table name
+        schema: schema name
+        columns: columns to profile (all columns by default)
+        signal: Retriever progress signal, receives count of scanned rows
+
+    Returns:
+        TableProfile: table statistics
+    """
+    meta = interface.metadata.table(table, schema)
+    columns = columns or meta.column_names
+    profiles = [ColumnProfile(col) for col in columns]
+
+    preparer = interface.engine.dialect.identifier_preparer
+    name = quote_table(interface.engine, table, schema)
+    what = ", ".join(preparer.quote(col) for col in columns)
+
+    def add_rows(data: ColumnarResult) -> int:
+        for profile, column in zip(profiles, data.data):
+            profile.add_column(column)
+        return len(data)
+
+    # table is not counted: count(*) scans it, that is what sampling avoids
+    rows, scanned = interface.estimate_rows(table, schema), 0
+    if rows is not None and rows > PROFILE_SAMPLE_THRESHOLD:
+        data, _ = interface.sample(table, what=what, size=PROFILE_SAMPLE_SIZE, schema=schema)
+        # estimate may be too big (e.g. rowids have gaps): short sample means that table is small enough to be scanned
+        if len(data) == PROFILE_SAMPLE_SIZE:
+            scanned = add_rows(data)
+
+    if not scanned:
+        with interface.engine.connect() as conn:
+            result = conn.execution_options(stream_results=True).execute(sa.text(f"select {what} from {name}"))
+            for partition in ColumnarResult.iter_cursor(result, PROFILE_BATCH):
+                scanned += add_rows(partition)
+                if signal is not None:
+                    signal.emit(scanned)
+        rows = scanned
+
+    meta.profile = TableProfile(table, rows, scanned, profiles)
+    return meta.profile
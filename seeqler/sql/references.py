@@ -0,0 +1,111 @@
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Iterable
+
+from .base import quote_table
+
+if TYPE_CHECKING:
+    from .interface import Interface
+
+
+__all__ = ("Reference", "ReferenceCache")
+
+
+REFERENCE_CACHE_SIZE = 10_000  # referred rows kept by tab
+REFERENCE_BATCH = 500  # values of one IN (...) list: number of bound parameters is limited by databases
+
+
+@dataclass(frozen=True)
+class Reference:
+    """
+    Column referred by single-column foreign key.
+    """
+
+    schema: str | None
+    table: str
+    column: str
+
+
+class ReferenceCache:
+    """
+    Rows referred by foreign key values (the most recent ones only). Referred rows of the whole page are requested at
+    once by ``prefetch``, one ``IN (...)`` request per foreign key, so they are shown instantly on hover. It is used by
+    worker threads, so it is guarded by lock.
+    """
+
+    def __init__(self, size: int = REFERENCE_CACHE_SIZE):
+        self.size = size
+        self.rows: OrderedDict[tuple[Reference, Any], dict] = OrderedDict()  # empty dict if there is no such row
+        self.nbytes = 0
+        self._lock = Lock()
+
+    def get(self, reference: Reference, value: Any) -> dict | None:
+        """
+        Get referred row by foreign key value: None if it is not requested yet, empty dict if there is no such row.
+        """
+        with self._lock:
+            return self.rows.get((reference, value))
+
+    def prefetch(
+        self, interface: "Interface", reference: Reference, values: Iterable[Any], columns: int | None = None
+    ) -> None:
+        """
+        Request referred rows which are not cached yet.
+
+        Args:
+            interface: interface of referred table
+            reference: referred column
+            values: foreign key values
+            columns: number of columns of referred rows to keep (the first ones besides large ones), all by default
+        """
+        with self._lock:
+            missing = list({x for x in values if x is not None and (reference, x) not in self.rows})
+        if not missing:
+            return
+
+        # large values (e.g. BLOBs) are not shown by tooltips, so they are not requested
+        meta = interface.metadata.table(reference.table, reference.schema)
+        large = set(meta.large_columns)
+        names = [x for x in meta.column_names if x not in large][:columns]
+        if reference.column not in names:
+            names.append(reference.column)
+
+        preparer = interface.engine.dialect.identifier_preparer
+        table = quote_table(interface.engine, reference.table, reference.schema)
+        what = ", ".join(map(preparer.quote, names))
+        for start in range(0, len(missing), REFERENCE_BATCH):
+            batch = missing[start : start + REFERENCE_BATCH]
+            params = {f"ref_{idx}": value for idx, value in enumerate(batch)}
+            where = f"{preparer.quote(reference.column)} in ({', '.join(f':{x}' for x in params)})"
+            data, columns = interface.select(what=what, from_=table, where=where, params=params)
+            if isinstance(columns, str):
+                return  # request failed: rows are not cached, so they are requested again with the next page
+
+            found = {}
+            for row in data:
+                record = dict(zip(columns, row))
+                found[record.get(reference.column)] = record
+            self._put(reference, {value: found.get(value, {}) for value in batch})
+
+    @staticmethod
+    def _row_size(row: dict) -> int:
+        return sys.getsizeof(row) + sum(map(sys.getsizeof, row.values()))
+
+    def _put(self, reference: Reference, rows: dict[Any, dict]) -> None:
+        with self._lock:
+            for value, row in rows.items():
+                # row may be requested by another thread at the same time: the previous copy is replaced
+                if (previous := self.rows.pop((reference, value), None)) is not None:
+                    self.nbytes -= self._row_size(previous)
+                self.rows[(reference, value)] = row
+                self.nbytes += self._row_size(row)
+            while len(self.rows) > self.size:
+                _, row = self.rows.popitem(last=False)
+                self.nbytes -= self._row_size(row)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.rows.clear()
+            self.nbytes = 0
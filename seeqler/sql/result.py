@@ -0,0 +1,388 @@
+import csv
+import sys
+from array import array
+from collections.abc import Sequence
+from itertools import accumulate
+from types import NoneType
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, TextIO
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import CursorResult
+
+__all__ = ("Column", "ColumnarResult", "DictionaryColumn", "NumberColumn", "ObjectColumn", "StringColumn")
+
+
+FETCH_BATCH = 5000  # rows fetched from cursor at once
+DICTIONARY_MIN = 1000  # string columns are dictionary-encoded until they have this many values...
+DICTIONARY_RATIO = 0.5  # ...and share of distinct values is lower than this
+
+
+# region columns
+
+
+class Column(Sequence):
+    """
+    Values of one result column.
+    """
+
+    nulls: bytearray | None  # 1 for NULL values, absent if there are no NULLs
+
+    @property
+    def nbytes(self) -> int:
+        raise NotImplementedError
+
+    @property
+    def null_count(self) -> int:
+        return self.nulls.count(1) if self.nulls is not None else 0
+
+    def take(self, start: int, stop: int) -> "Column":
+        raise NotImplementedError
+
+
+class NumberColumn(Column):
+    """
+    Integers (64 bit) or floats kept in ``array``.
+    """
+
+    def __init__(self, values: array, nulls: bytearray | None = None):
+        self.values = values
+        self.nulls = nulls
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, idx: int) -> int | float | None:
+        if self.nulls is not None and self.nulls[idx]:
+            return None
+        return self.values[idx]
+
+    def __iter__(self) -> Iterator[int | float | None]:
+        if self.nulls is None:
+            return iter(self.values)
+        return (None if null else value for value, null in zip(self.values, self.nulls))
+
+    def non_null(self) -> Iterable[int | float]:
+        if self.nulls is None:
+            return self.values
+        return (value for value, null in zip(self.values, self.nulls) if not null)
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.itemsize * len(self.values) + (len(self.nulls) if self.nulls is not None else 0)
+
+    def take(self, start: int, stop: int) -> "NumberColumn":
+        return NumberColumn(self.values[start:stop], self.nulls[start:stop] if self.nulls is not None else None)
+
+
+class DictionaryColumn(Column):
+    """
+    Strings with few distinct values: every distinct string is kept once, rows keep its index (-1 for NULL).
+    """
+
+    def __init__(self, values: list[str], codes: array):
+        self.values = values
+        self.codes = codes
+
+    @property
+    def nulls(self) -> bytearray | None:
+        return bytearray(code < 0 for code in self.codes) if -1 in self.codes else None
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, idx: int) -> str | None:
+        code = self.codes[idx]
+        return None if code < 0 else self.values[code]
+
+    def __iter__(self) -> Iterator[str | None]:
+        values = self.values
+        return (None if code < 0 else values[code] for code in self.codes)
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.itemsize * len(self.codes) + sum(sys.getsizeof(x) for x in self.values)
+
+    def take(self, start: int, stop: int) -> "DictionaryColumn":
+        return DictionaryColumn(self.values, self.codes[start:stop])
+
+
+class StringColumn(Column):
+    """
+    Strings kept as one UTF-8 buffer and offsets of every value in it.
+    """
+
+    def __init__(self, data: bytearray, offsets: array, nulls: bytearray | None = None):
+        self.data = data
+        self.offsets = offsets  # len(column) + 1 items
+        self.nulls = nulls
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, idx: int) -> str | None:
+        if idx < 0:
+            idx += len(self)
+        if self.nulls is not None and self.nulls[idx]:
+            return None
+        return self.data[self.offsets[idx] : self.offsets[idx + 1]].decode()
+
+    def __iter__(self) -> Iterator[str | None]:
+        data, offsets, nulls = self.data, self.offsets, self.nulls
+        for idx in range(len(offsets) - 1):
+            yield None if nulls is not None and nulls[idx] else data[offsets[idx] : offsets[idx + 1]].decode()
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.data) + self.offsets.itemsize * len(self.offsets) + (len(self.nulls) if self.nulls else 0)
+
+    def take(self, start: int, stop: int) -> "StringColumn":
+        start, stop, _ = slice(start, stop).indices(len(self))
+        stop = max(start, stop)
+        low, high = self.offsets[start], self.offsets[stop]
+        offsets = array("q", (offset - low for offset in self.offsets[start : stop + 1]))
+        return StringColumn(self.data[low:high], offsets, self.nulls[start:stop] if self.nulls is not None else None)
+
+
+class ObjectColumn(Column):
+    """
+    Values of mixed or other types (bytes, dates, decimals…) kept as they are.
+    """
+
+    def __init__(self, values: list):
+        self.values = values
+
+    @property
+    def nulls(self) -> bytearray | None:
+        return bytearray(value is None for value in self.values) if None in self.values else None
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, idx: int) -> Any:
+        return self.values[idx]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.values)
+
+    @property
+    def nbytes(self) -> int:
+        return sys.getsizeof(self.values) + sum(sys.getsizeof(x) for x in self.values if x is not None)
+
+    def take(self, start: int, stop: int) -> "ObjectColumn":
+        return ObjectColumn(self.values[start:stop])
+
+
+class ColumnBuilder:
+    """
+    Collects values of column batch by batch choosing the most compact representation that fits all of them.
+    """
+
+    def __init__(self):
+        self.kind: str | None = None  # "int", "float", "str" or "object"; None while there are only NULLs
+        self.length = 0
+        self.nulls = bytearray()
+        self.has_nulls = False
+        self.values: array | list | None = None
+        # strings
+        self.dictionary: dict[str, int] | None = None
+        self.codes: array | None = None
+        self.data: bytearray | None = None
+        self.offsets: array | None = None
+
+    @staticmethod
+    def _kind(types: set[type]) -> str | None:
+        # kind of batch by types of its non-NULL values
+        if not types:
+            return None
+        if len(types) == 1:
+            return {int: "int", float: "float", str: "str"}.get(next(iter(types)), "object")
+        return "object"
+
+    def _values(self) -> list:
+        # all the collected values as list
+        if self.kind is None:
+            return [None] * self.length
+        return list(self.build())
+
+    def _start(self, kind: str) -> None:
+        previous = self.length
+        self.kind = kind
+        match kind:
+            case "int" | "float":
+                self.values = array("q" if kind == "int" else "d", bytes(previous * 8))
+            case "str":
+                self.dictionary, self.codes = {}, array("i", [-1] * previous)
+            case "object":
+                self.values = [None] * previous
+
+    def _to_object(self) -> None:
+        values = self._values()
+        self.kind, self.values = "object", values
+        self.dictionary = self.codes = self.data = self.offsets = None
+
+    def _to_offsets(self) -> None:
+        # too many distinct strings: dictionary encoding does not save anything
+        values = list(self.dictionary)
+        self.data, self.offsets = bytearray(), array("q", [0])
+        for code in self.codes:
+            if code >= 0:
+                self.data += values[code].encode()
+            self.offsets.append(len(self.data))
+        self.dictionary = self.codes = None
+
+    def _distinct_batch(self, batch: Sequence[Any]) -> bool:
+        # batch is big enough to tell that column has mostly distinct strings: it is not worth dictionary encoding
+        return len(batch) >= DICTIONARY_MIN and len(set(batch)) > len(batch) * DICTIONARY_RATIO
+
+    def _add_offsets(self, batch: Sequence[str | None], has_nulls: bool) -> None:
+        encoded = list(map(str.encode, [x or "" for x in batch] if has_nulls else batch))
+        self.data += b"".join(encoded)
+        self.offsets.extend(list(accumulate(map(len, encoded), initial=self.offsets[-1]))[1:])
+
+    def extend(self, batch: Sequence[Any]) -> None:
+        types = set(map(type, batch))
+        has_nulls = NoneType in types
+        types.discard(NoneType)
+
+        kind = self._kind(types)
+        if kind is not None and kind != self.kind:
+            if self.kind is None:
+                self._start(kind)
+            elif self.kind != "object":
+                self._to_object()
+
+        # values are added by the whole batch, so the loops run in C
+        match self.kind:
+            case None:
+                pass
+            case "object":
+                self.values.extend(batch)
+            case "int" | "float":
+                length = len(self.values)
+                try:
+                    self.values.extend([0 if x is None else x for x in batch] if has_nulls else batch)
+                except OverflowError:
+                    # integers out of 64 bit range
+                    del self.values[length:]
+                    self._to_object()
+                    self.values.extend(batch)
+            case "str" if self.codes is not None and self._distinct_batch(batch):
+                self._to_offsets()
+                self._add_offsets(batch, has_nulls)
+            case "str" if self.codes is not None:
+                dictionary = self.dictionary
+                for value in set(batch).difference(dictionary, (None,)):
+                    dictionary[value] = len(dictionary)
+                dictionary[None] = -1  # temporarily, so codes are looked up by C loop
+                self.codes.extend(map(dictionary.__getitem__, batch))
+                del dictionary[None]
+            case "str":
+                self._add_offsets(batch, has_nulls)
+
+        if has_nulls:
+            self.has_nulls = True
+            self.nulls.extend([x is None for x in batch])
+        else:
+            self.nulls.extend(bytes(len(batch)))
+        self.length += len(batch)
+
+        if (
+            self.kind == "str"
+            and self.codes is not None
+            and self.length >= DICTIONARY_MIN
+            and len(self.dictionary) > self.length * DICTIONARY_RATIO
+        ):
+            self._to_offsets()
+
+    def build(self) -> Column:
+        nulls = self.nulls if self.has_nulls else None
+        match self.kind:
+            case None:
+                return ObjectColumn([None] * self.length)
+            case "int" | "float":
+                return NumberColumn(self.values, nulls)
+            case "str" if self.codes is not None:
+                return DictionaryColumn(list(self.dictionary), self.codes)
+            case "str":
+                return StringColumn(self.data, self.offsets, nulls)
+        return ObjectColumn(self.values)
+
+
+# endregion
+
+
+class ColumnarResult(Sequence):
+    """
+    Compact query result: values are kept by columns in typed buffers instead of row objects.
+
+    Behaves as a sequence of row tuples (indexing, iteration, ``len``), slicing returns ``ColumnarResult`` with the
+    same columns. Columns themselves are available via ``data`` and ``column``.
+    """
+
+    def __init__(self, columns: list[str], data: list[Column]):
+        self.columns = columns
+        self.data = data
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence[Any]], columns: Iterable[str], batch: int = FETCH_BATCH):
+        columns = list(columns)
+        builders = [ColumnBuilder() for _ in columns]
+        rows = iter(rows)
+        while True:
+            chunk = [row for _, row in zip(range(batch), rows)]
+            if not chunk:
+                break
+            for builder, values in zip(builders, zip(*chunk)):
+                builder.extend(values)
+        return cls(columns, [builder.build() for builder in builders])
+
+    @classmethod
+    def from_cursor(cls, cursor: "CursorResult", batch: int = FETCH_BATCH) -> "ColumnarResult":
+        """
+        Fetch all the rows of cursor by batches: only one batch of row objects exists at a time.
+        """
+        columns = list(cursor.keys())
+        builders = [ColumnBuilder() for _ in columns]
+        for partition in cursor.partitions(batch):
+            for builder, values in zip(builders, zip(*partition)):
+                builder.extend(values)
+        return cls(columns, [builder.build() for builder in builders])
+
+    @classmethod
+    def iter_cursor(cls, cursor: "CursorResult", batch: int = FETCH_BATCH) -> Iterator["ColumnarResult"]:
+        """
+        Fetch rows of cursor as ``ColumnarResult`` of ``batch`` rows each.
+        """
+        columns = list(cursor.keys())
+        for partition in cursor.partitions(batch):
+            yield cls.from_rows(partition, columns, batch)
+
+    def __len__(self) -> int:
+        return len(self.data[0]) if self.data else 0
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            start, stop, step = idx.indices(len(self))
+            if step != 1:
+                return ColumnarResult.from_rows((self[i] for i in range(start, stop, step)), self.columns)
+            return ColumnarResult(self.columns, [column.take(start, stop) for column in self.data])
+        return tuple(column[idx] for column in self.data)
+
+    def __iter__(self) -> Iterator[tuple]:
+        return zip(*self.data)
+
+    def keys(self) -> list[str]:
+        return self.columns
+
+    def column(self, key: str | int) -> Column:
+        return self.data[key if isinstance(key, int) else self.columns.index(key)]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in self.data)
+
+    def to_csv(self, file: TextIO, header: bool = True) -> None:
+        writer = csv.writer(file)
+        if header:
+            writer.writerow(self.columns)
+        writer.writerows(self)
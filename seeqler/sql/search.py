@@ -0,0 +1,168 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from threading import Event
+from typing import TYPE_CHECKING
+
+import sqlalchemy as sa
+
+from .base import quote_table
+from .filters import escape_like
+
+if TYPE_CHECKING:
+    from PyQt6.QtCore import pyqtBoundSignal
+
+    from .fulltext import FullTextIndex
+    from .interface import Interface
+    from .metadata import MetadataCache, TableMeta
+
+
+__all__ = ("SearchHit", "search_names", "search_data")
+
+
+DATA_SEARCH_WORKERS = 8  # parallel requests while searching in table data
+DATA_SEARCH_LIMIT = 20  # max rows to return per table
+
+
+@dataclass
+class SearchHit:
+    kind: str  # "table", "column" or "data"
+    table: str
+    schema: str | None = None
+    column: str | None = None
+    value: str | None = None
+
+
+def search_names(metadata: "MetadataCache", text: str, schema: str | None = None) -> list[SearchHit]:
+    """
+    Search for tables and columns which names contain ``text``. Works with cached metadata only: call
+    ``MetadataCache.load_schema`` before to get column names matched.
+
+    Args:
+        metadata: metadata cache of connection
+        text: text to search for (case-insensitive)
+        schema: schema to search in
+
+    Returns:
+        list[SearchHit]: found tables and columns
+    """
+    text = text.lower()
+    if not text:
+        return []
+
+    hits = []
+    for table in metadata.tables(schema):
+        if text in table.lower():
+            hits.append(SearchHit("table", table, schema))
+
+        if not metadata.is_loaded(schema):
+            continue
+
+        for column in metadata.table(table, schema).column_names:
+            if text in column.lower():
+                hits.append(SearchHit("column", table, schema, column))
+    return hits
+
+
+def _search_table(
+    interface: "Interface",
+    meta: "TableMeta",
+    text: str,
+    limit: int,
+    cancel: Event | None,
+    skip_columns: list[str] | None = None,
+) -> list[SearchHit]:
+    columns = [col for col in meta.text_columns if col not in (skip_columns or ())]
+    if not columns or cancel and cancel.is_set():
+        return []
+
+    preparer = interface.engine.dialect.identifier_preparer
+    request = sa.text(
+        "select {columns} from {table} where {where} limit :limit".format(
+            columns=", ".join(preparer.quote(col) for col in columns),
+            table=quote_table(interface.engine, meta.name, meta.schema),
+            where=" or ".join(f"{preparer.quote(col)} like :pattern escape '\\'" for col in columns),
+        )
+    )
+
+    with interface.engine.connect() as conn:
+        rows = conn.execute(request, {"pattern": f"%{escape_like(text)}%", "limit": limit}).all()
+
+    hits = []
+    lowered = text.lower()
+    for row in rows:
+        for column, value in zip(columns, row):
+            if value is not None and lowered in str(value).lower():
+                hits.append(SearchHit("data", meta.name, meta.schema, column, str(value)))
+    return hits
+
+
+def search_data(
+    interface: "Interface",
+    text: str,
+    schema: str | None = None,
+    tables: list[str] | None = None,
+    limit: int = DATA_SEARCH_LIMIT,
+    workers: int = DATA_SEARCH_WORKERS,
+    cancel: Event | None = None,
+    fulltext: "FullTextIndex | None" = None,
+    signal: "pyqtBoundSignal | None" = None,
+) -> list[SearchHit]:
+    """
+    Search for ``text`` in text columns of tables. Every table is requested with ``LIKE`` in its own thread, at most
+    ``limit`` rows per table; hits are emitted to ``signal`` table by table as soon as they are found.
+
+    If ``fulltext`` index is passed, its columns are searched in the index too. Indexed columns of tables which index
+    is complete and up to date are not requested from database; other tables (being indexed, not indexable) are
+    requested as usual, and hits already found by the index are not repeated.
+
+    Args:
+        interface: connected interface
+        text: text to search for
+        schema: schema to search in
+        tables: tables to search in (all tables of schema by default)
+        limit: max rows to fetch per table
+        workers: number of parallel requests
+        cancel: event to stop search
+        fulltext: local full-text index of connection
+        signal: Retriever progress signal
+
+    Returns:
+        list[SearchHit]: all found hits
+    """
+    if not text:
+        return []
+
+    metas = interface.metadata.load_schema(schema)
+    if tables is not None:
+        metas = {name: meta for name, meta in metas.items() if name in tables}
+
+    hits, indexed = [], {}
+    if fulltext is not None:
+        configured = {name for name in fulltext.tables(schema) if name in metas}
+        indexed = {name: table.columns for name, table in fulltext.complete(schema).items() if name in metas}
+        hits = [hit for hit in fulltext.search(text, schema, limit) if hit.table in configured]
+        if hits and signal is not None:
+            signal.emit(list(hits))
+    found_by_index = {(hit.table, hit.column, hit.value) for hit in hits}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_search_table, interface, meta, text, limit, cancel, indexed.get(name))
+            for name, meta in metas.items()
+        ]
+        for future in as_completed(futures):
+            if cancel and cancel.is_set():
+                for f in futures:
+                    f.cancel()
+                break
+
+            try:
+                found = future.result()
+            except sa.exc.DBAPIError:
+                continue  # e.g. virtual table without loaded module
+            found = [hit for hit in found if (hit.table, hit.column, hit.value) not in found_by_index]
+            if found:
+                hits.extend(found)
+                if signal is not None:
+                    signal.emit(found)
+    return hits
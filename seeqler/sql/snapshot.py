@@ -0,0 +1,243 @@
+import csv
+import os
+import sqlite3
+import tempfile
+import weakref
+from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Iterable, Sequence, TextIO
+
+from .filters import parse_filter
+from .result import ColumnarResult
+
+if TYPE_CHECKING:
+    from PyQt6.QtCore import pyqtBoundSignal
+
+    from .interface import Interface
+
+
+__all__ = ("ResultSnapshot", "materialize", "remove_orphans")
+
+
+DEFAULT_PATH = Path.home() / ".config" / "seeqler" / "snapshots"
+BATCH_SIZE = 5000  # rows fetched and written at once
+
+
+def _storable(value: Any) -> Any:
+    # SQLite keeps numbers, strings and bytes only, the rest is kept as text
+    match value:
+        case None | float() | str() | bytes():
+            return value
+        case int() if -(2**63) <= value < 2**63:
+            return value
+        case bytearray() | memoryview():
+            return bytes(value)
+    return str(value)
+
+
+def _remove(conn: sqlite3.Connection, path: Path) -> None:
+    conn.close()
+    path.unlink(missing_ok=True)
+
+
+def _process_alive(pid: int) -> bool:
+    if os.name == "nt":
+        return False  # files of running processes are open there, so they are not removed anyway
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # process of another user
+    return True
+
+
+def remove_orphans(path: Path = DEFAULT_PATH) -> int:
+    """
+    Remove snapshot files left by crashed processes. Names of files contain id of the process which made them, so
+    files of other running seeqler processes are kept.
+
+    Returns:
+        int: number of removed files
+    """
+    removed = 0
+    for file in path.glob("result-*.sqlite"):
+        pid = file.name.split("-")[1]
+        if pid.isdigit() and (int(pid) == os.getpid() or _process_alive(int(pid))):
+            continue
+        try:
+            file.unlink()
+            removed += 1
+        except OSError:
+            pass  # file is used by another process
+    return removed
+
+
+class ResultSnapshot:
+    """
+    Result of raw request materialized into local scratch SQLite file. Pages are read from the file, sorting and
+    filtering are done by SQLite, so the statement is not executed again and the result is not held in memory.
+    Columns are indexed the first time they are sorted or filtered by.
+
+    Snapshot is used by worker threads one at a time, it is guarded by lock. File is removed by ``close`` or when
+    snapshot is garbage collected.
+    """
+
+    def __init__(self, columns: Sequence[str], path: Path = DEFAULT_PATH):
+        path.mkdir(parents=True, exist_ok=True)
+        handle, name = tempfile.mkstemp(prefix=f"result-{os.getpid()}-", suffix=".sqlite", dir=path)
+        os.close(handle)
+
+        self.path = Path(name)
+        self.columns = list(columns)  # names of raw result may repeat, table columns are named by position
+        self.rows = 0
+        self._indexed: set[int] = set()
+        self._counts: dict[tuple, int] = {}  # row counts by filter
+        self._lock = Lock()
+
+        self._conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("pragma journal_mode = off")  # scratch file: nothing to recover after crash
+        self._conn.execute("pragma synchronous = off")
+        self._conn.execute(f"create table result ({', '.join(f'c{idx}' for idx in range(len(self.columns)))})")
+        self._finalizer = weakref.finalize(self, _remove, self._conn, self.path)
+
+    def quote(self, column: str) -> str:
+        """
+        Get name of table column by result column name, it is used to build conditions (see ``filters``).
+        """
+        return f"c{self.columns.index(column)}"
+
+    def append(self, rows: Iterable[Sequence[Any]]) -> int:
+        """
+        Write batch of rows.
+
+        Returns:
+            int: number of rows written
+        """
+        rows = rows if isinstance(rows, (list, ColumnarResult)) else list(rows)
+        request = f"insert into result values ({', '.join('?' * len(self.columns))})"
+        with self._lock:
+            self._conn.execute("begin")
+            try:
+                self._conn.executemany(request, rows)
+            except (sqlite3.InterfaceError, sqlite3.ProgrammingError, OverflowError):
+                # values of types unknown to SQLite are rare: batch is converted only when it has them
+                self._conn.execute("rollback")
+                self._conn.execute("begin")
+                self._conn.executemany(request, (tuple(map(_storable, row)) for row in rows))
+            self._conn.execute("commit")
+            self.rows += len(rows)
+            self._counts.clear()
+        return len(rows)
+
+    def _index(self, columns: Iterable[int]) -> None:
+        for idx in set(columns) - self._indexed:
+            self._conn.execute(f"create index result_c{idx} on result (c{idx})")
+            self._indexed.add(idx)
+
+    def page(
+        self, offset: int, limit: int, filters: dict[str, str] | None = None, order: tuple[str, bool] | None = None
+    ) -> tuple[ColumnarResult, int]:
+        """
+        Read page of snapshot.
+
+        Args:
+            offset: rows to skip
+            limit: rows of page
+            filters: filter texts by result column name (see ``filters.parse_filter``)
+            order: result column name and descending flag
+
+        Returns:
+            tuple[ColumnarResult, int]: page rows and number of rows matching filters
+        """
+        where, params, indexed = [], {}, set()
+        for idx, (column, text) in enumerate((filters or {}).items()):
+            if not text.strip():
+                continue
+            condition, param = parse_filter(self.quote(column), text, f"filter_{idx}")
+            where.append(condition)
+            params |= param
+            if " like " not in condition:  # substring search can not use index
+                indexed.add(self.columns.index(column))
+
+        condition, sorting = f" where {' and '.join(where)}" if where else "", ""
+        if order is not None:
+            sorting = f" order by {self.quote(order[0])} {'desc' if order[1] else 'asc'}, rowid"
+            indexed.add(self.columns.index(order[0]))
+
+        with self._lock:
+            self._index(indexed)
+            key = (tuple(where), tuple(params.items()))
+            if key not in self._counts:
+                count = f"select count(*) from result{condition}"
+                self._counts[key] = self._conn.execute(count, params).fetchone()[0] if where else self.rows
+
+            cursor = self._conn.execute(
+                f"select * from result{condition}{sorting} limit :limit offset :offset",
+                params | {"limit": limit, "offset": offset},
+            )
+            return ColumnarResult.from_rows(cursor, self.columns), self._counts[key]
+
+    def to_csv(self, file: TextIO, header: bool = True) -> None:
+        writer = csv.writer(file)
+        if header:
+            writer.writerow(self.columns)
+        with self._lock:
+            writer.writerows(self._conn.execute("select * from result order by rowid"))
+
+    @property
+    def size(self) -> int:
+        """
+        Size of snapshot file in bytes.
+        """
+        return self.path.stat().st_size if self.path.exists() else 0
+
+    @classmethod
+    def from_result(cls, result: ColumnarResult, path: Path = DEFAULT_PATH) -> "ResultSnapshot":
+        """
+        Write result fetched already to snapshot, so it is sorted and filtered without running statement again.
+        """
+        snapshot = cls(result.columns, path)
+        for start in range(0, len(result), BATCH_SIZE):
+            snapshot.append(result[start : start + BATCH_SIZE])
+        return snapshot
+
+    def close(self) -> None:
+        self._finalizer()
+
+
+def materialize(
+    interface: "Interface", request: str, signal: "pyqtBoundSignal | None" = None, path: Path = DEFAULT_PATH
+) -> tuple[ResultSnapshot | str | int, list | str]:
+    """
+    Execute raw request and write its rows to snapshot batch by batch, so only one batch is held in memory. Return
+    value is the same as ``raw`` one: snapshot and its columns, number of affected rows and "norows" or error text and
+    "error".
+
+    Args:
+        interface: connected interface
+        request: raw SQL
+        signal: Retriever progress signal, receives number of rows written so far
+        path: directory of snapshot files
+    """
+    # imported on demand: module is imported at startup by ``remove_orphans`` when SQLAlchemy is not loaded yet
+    import sqlalchemy as sa
+
+    try:
+        with interface.engine.connect() as conn:
+            cursor = conn.execution_options(stream_results=True).exec_driver_sql(request)
+            if not cursor.returns_rows:
+                return cursor.rowcount, "norows"
+
+            snapshot = ResultSnapshot(list(cursor.keys()), path)
+            try:
+                for partition in cursor.partitions(BATCH_SIZE):
+                    snapshot.append(partition)
+                    if signal is not None:
+                        signal.emit(snapshot.rows)
+            except BaseException:
+                snapshot.close()
+                raise
+            return snapshot, snapshot.columns
+    except sa.exc.OperationalError as e:
+        return str(e), "error"
@@ -1,17 +1,243 @@
+import math
+import random
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
 import sqlalchemy as sa
 
-from ..base import BaseSQL
+from ..base import BaseSQL, quote_table
+from ..diff import EXPRESSION, TableSnapshot, describe_column, row_hash
+from ..result import ColumnarResult
 
 __all__ = ("SQLite",)
 
 
+SAMPLE_MAX_STRATA = 250  # SQLite limits number of compound select terms with 500
+RESERVED_SCHEMAS = ("main", "temp")
+
+
 class SQLite(BaseSQL):
-    def connect(self, connection_string: str, *args, **kwargs) -> None:
+    # text values are read as UTF-8 bytes, so offsets are the same as for BLOB I/O
+    value_chunk_sql = "substr(cast({column} as blob), :start, :size)"
+    value_length_sql = "length(cast({column} as blob))"
+
+    row_hash_function = "seeqler_row_hash"
+
+    def connect(self, connection_string: str, *args, profile: bool = True, **kwargs) -> None:
+        self.attached: dict[str, str] = {}  # schema name: path of attached database file
+        self._attach_lock = threading.Lock()
+        self._watch_connection = None  # see change_marker
+        self._watch_lock = threading.Lock()
         self.engine = sa.create_engine(connection_string)
+        sa.event.listen(self.engine, "connect", self._prepare_connection)
+        if profile:
+            self.profile_statements()
         self.inspector = sa.inspect(self.engine)
 
+    def _prepare_connection(self, dbapi_connection: sqlite3.Connection, _) -> None:
+        dbapi_connection.create_function(self.row_hash_function, -1, row_hash, deterministic=True)
+        # attachment lasts for connection only, so every connection of pool attaches files
+        for name, path in list(self.attached.items()):
+            dbapi_connection.execute("attach database ? as ?", (path, name))
+
+    def attach(self, path: str, name: str) -> None:
+        """
+        Attach database file as schema ``name``: its tables are requested as ``name.table`` and joined with tables of
+        the main database inside SQLite. Open connections of pool are closed, so the next ones attach the file.
+
+        Raises:
+            ValueError: if schema name is taken
+            FileNotFoundError: if there is no such file (ATTACH would create an empty database)
+        """
+        with self._attach_lock:
+            if name.lower() in RESERVED_SCHEMAS or name.lower() in map(str.lower, self.attached):
+                raise ValueError(f"Schema {name} already exists")
+            if not Path(path).is_file():
+                raise FileNotFoundError(path)
+
+            self.attached[name] = str(Path(path).resolve())
+            self._release_watch_connection()
+            self.engine.dispose()
+            master = f"{self.engine.dialect.identifier_preparer.quote_schema(name)}.sqlite_master"
+            try:
+                with self.engine.connect() as conn:
+                    # file is not read by ATTACH itself, so it is checked to be a database right now
+                    conn.exec_driver_sql(f"select count(*) from {master}").scalar()
+            except sa.exc.DBAPIError:
+                del self.attached[name]
+                self.engine.dispose()
+                raise
+            self.inspector.info_cache.clear()  # Inspector.clear_cache is missing in SQLAlchemy 1.4
+
+    def detach(self, name: str) -> None:
+        with self._attach_lock:
+            if self.attached.pop(name, None) is None:
+                raise ValueError(f"Schema {name} is not attached")
+            self._release_watch_connection()
+            self.engine.dispose()
+            self.inspector.info_cache.clear()  # Inspector.clear_cache is missing in SQLAlchemy 1.4
+
+    def change_marker(self, table: str, schema: str | None = None) -> int:
+        """
+        ``data_version`` of database file: it changes after any other connection commits, so changes of other tables
+        are noticed too (page is compared then), but the table is not read. Value is tracked by connection, so it is
+        always asked from the same one.
+        """
+        name = self.engine.dialect.identifier_preparer.quote_schema(schema or "main")
+        with self._watch_lock:
+            if self._watch_connection is None:
+                self._watch_connection = self.engine.raw_connection()
+            cursor = self._watch_connection.cursor()
+            try:
+                cursor.execute(f"pragma {name}.data_version")
+                return cursor.fetchone()[0]
+            finally:
+                cursor.close()
+
+    def _release_watch_connection(self) -> None:
+        with self._watch_lock:
+            if self._watch_connection is not None:
+                self._watch_connection.close()
+                self._watch_connection = None
+
+    def sample(
+        self, from_: str, what: str = "*", size: int = 100, schema: str | None = None, stratified: bool = True
+    ) -> tuple[ColumnarResult, list]:
+        """
+        Rowid-range sampling: splits rowid range of table into strata and takes a short run of consecutive rows from
+        a random point of each one. Every run is found by rowid b-tree search, so table is never scanned.
+        """
+        table = quote_table(self.engine, from_, schema)
+        try:
+            with self.engine.connect() as conn:
+                low, high = conn.execute(
+                    sa.text(f"select (select min(rowid) from {table}), (select max(rowid) from {table})")
+                ).one()
+        except sa.exc.OperationalError:
+            # WITHOUT ROWID tables and views
+            return self.select(what=what, from_=table, limit=size)
+
+        if low is None or high - low < size:
+            return self.select(what=what, from_=table, limit=size)  # small table: nothing to sample
+
+        strata = min(size, SAMPLE_MAX_STRATA)
+        run = math.ceil(size / strata)
+        step = (high - low + 1) / strata
+
+        if stratified:
+            points = [low + int(i * step + random.random() * step) for i in range(strata)]
+        else:
+            points = sorted(random.randint(low, high) for _ in range(strata))
+
+        # runs of strata after rowid gaps start at the same row: rowids are deduplicated by UNION, then rows are read
+        parts = [
+            f"select * from (select rowid from {table} where rowid >= :p{i} order by rowid limit {run})"
+            for i in range(strata)
+        ]
+        request = sa.text(f"select {what} from {table} where rowid in ({' union '.join(parts)}) limit {size}")
+        return self.raw(request, {f"p{i}": point for i, point in enumerate(points)})
+
+    def estimate_rows(self, table: str, schema: str | None = None) -> int | None:
+        """
+        Number of rows saved by ANALYZE to ``sqlite_stat1`` or rowid range of table (its upper bound: rowids may have
+        gaps), both are read without scanning the table.
+        """
+        preparer = self.engine.dialect.identifier_preparer
+        stat = f"{preparer.quote_schema(schema)}.sqlite_stat1" if schema else "sqlite_stat1"
+        name = quote_table(self.engine, table, schema)
+        with self.engine.connect() as conn:
+            try:
+                # the first number of statistics of table or any of its indexes is number of rows
+                row = conn.execute(
+                    sa.text(f"select stat from {stat} where tbl = :name limit 1"), {"name": table}
+                ).first()
+                if row is not None and row[0]:
+                    return int(row[0].split()[0])
+            except (sa.exc.OperationalError, ValueError):
+                pass  # database is not analyzed
+            try:
+                low, high = conn.execute(
+                    sa.text(f"select (select min(rowid) from {name}), (select max(rowid) from {name})")
+                ).one()
+            except sa.exc.OperationalError:
+                return None  # WITHOUT ROWID tables and views
+        return 0 if low is None else high - low + 1
+
+    def schema_version(self, schema: str | None = None) -> int | None:
+        preparer = self.engine.dialect.identifier_preparer
+        with self.engine.connect() as conn:
+            return conn.exec_driver_sql(f"pragma {preparer.quote_schema(schema or 'main')}.schema_version").scalar()
+
+    def schema_snapshot(self, schema: str | None = None) -> dict[str, TableSnapshot] | None:
+        """
+        Definitions of all the tables are read by three requests to table-valued pragma functions, while inspector
+        makes several requests per table (each one looks table up in ``sqlite_master``). Column types are reported
+        as declared.
+        """
+        name = schema or "main"
+        tables = (
+            f"select name from {self.engine.dialect.identifier_preparer.quote_schema(name)}.sqlite_master "
+            "where type = 'table' and name not like 'sqlite~_%' escape '~'"
+        )
+        with self.engine.connect() as conn:
+            columns = conn.exec_driver_sql(
+                f'select m.name, p.name, p.type, p."notnull", p.dflt_value, p.pk from ({tables}) m '
+                "join pragma_table_info(m.name, ?) p order by m.name, p.cid",
+                (name,),
+            ).all()
+            indexes = conn.exec_driver_sql(
+                f'select m.name, l.name, l."unique", i.name from ({tables}) m join pragma_index_list(m.name, ?) l '
+                "join pragma_index_info(l.name, ?) i where l.origin = 'c' order by m.name, l.name, i.seqno",
+                (name, name),
+            ).all()
+            foreign_keys = conn.exec_driver_sql(
+                f'select m.name, f.id, f."table", f."from", f."to" from ({tables}) m '
+                "join pragma_foreign_key_list(m.name, ?) f order by m.name, f.id, f.seq",
+                (name,),
+            ).all()
+
+        definitions: dict[str, dict] = {}
+        for table, column, type_, not_null, default, pk in columns:
+            definition = definitions.setdefault(table, {"columns": {}, "pk": [], "indexes": {}, "fkeys": {}})
+            definition["columns"][column] = describe_column(
+                {"type": type_.upper(), "nullable": not not_null, "default": default}
+            )
+            if pk:
+                definition["pk"].append((pk, column))
+        for table, index, unique, column in indexes:
+            definition = definitions[table]["indexes"].setdefault(index, ([], bool(unique)))
+            definition[0].append(column if column is not None else EXPRESSION)  # expressions have no names
+        for table, idx, referred, column, referred_column in foreign_keys:
+            fkey = definitions[table]["fkeys"].setdefault(idx, (referred, [], []))
+            fkey[1].append(column)
+            fkey[2].append(referred_column)
+
+        def referred_key(referred: str, columns: list[str | None]) -> tuple:
+            # foreign key without column names refers to primary key
+            if None in columns and referred in definitions:
+                return tuple(column for _, column in sorted(definitions[referred]["pk"]))
+            return tuple(x or "" for x in columns)
+
+        return {
+            table: TableSnapshot(
+                columns=definition["columns"],
+                primary_key=tuple(column for _, column in sorted(definition["pk"])),
+                foreign_keys=frozenset(
+                    (tuple(columns), referred, referred_key(referred, referred_columns))
+                    for referred, columns, referred_columns in definition["fkeys"].values()
+                ),
+                indexes=frozenset((tuple(columns), unique) for columns, unique in definition["indexes"].values()),
+            )
+            for table, definition in definitions.items()
+        }
+
     def disconnect(self):
         if hasattr(self, "engine"):
+            self._release_watch_connection()
+            if self.statements is not None:
+                self.statements.detach(self.engine)
             self.engine.dispose()
             del self.inspector
             del self.engine
@@ -26,3 +252,51 @@ class SQLite(BaseSQL):
         if not hasattr(self, "connection"):
             return
         self.connection.close()
+
+    def row_key(self, table: str, schema: str | None = None) -> list[str]:
+        """
+        Rowid for ordinary tables, so their values are read by incremental BLOB I/O; primary key for WITHOUT ROWID
+        tables; nothing for views.
+        """
+        preparer = self.engine.dialect.identifier_preparer
+        master = f"{preparer.quote_schema(schema)}.sqlite_master" if schema else "sqlite_master"
+        with self.engine.connect() as conn:
+            kind = conn.execute(sa.text(f"select type from {master} where name = :name"), {"name": table}).scalar()
+            if kind == "table":
+                try:
+                    conn.exec_driver_sql(f"select rowid from {quote_table(self.engine, table, schema)} limit 0")
+                    return ["rowid"]
+                except sa.exc.OperationalError:
+                    pass  # WITHOUT ROWID table
+        return super().row_key(table, schema)
+
+    def read_value(
+        self,
+        table: str,
+        column: str,
+        key: dict[str, Any],
+        offset: int,
+        size: int,
+        schema: str | None = None,
+        length: int | None = None,
+    ) -> tuple[bytes | str, int]:
+        """
+        Values are read by incremental BLOB I/O: only the requested part is copied out of database pages.
+        """
+        if list(key) != ["rowid"] or not hasattr(sqlite3.Connection, "blobopen"):
+            # incremental BLOB I/O needs Python 3.11, otherwise parts are selected by ``value_chunk_sql``: SQLite
+            # loads (and casts) the whole value to take every part of it, so reading it all is quadratic by its size
+            return super().read_value(table, column, key, offset, size, schema, length)
+
+        raw = self.engine.raw_connection()
+        try:
+            with raw.driver_connection.blobopen(
+                table, column, key["rowid"], readonly=True, name=schema or "main"
+            ) as blob:
+                blob.seek(min(offset, len(blob)))
+                return blob.read(size), len(blob)
+        except sqlite3.Error:
+            # numbers and NULLs are not blobs
+            return super().read_value(table, column, key, offset, size, schema, length)
+        finally:
+            raw.close()
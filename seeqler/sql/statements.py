@@ -0,0 +1,131 @@
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import sqlalchemy as sa
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+
+__all__ = ("StatementProfiler", "StatementRecord", "StatementStats", "normalize_statement")
+
+
+MAX_RECORDS = 2000
+MAX_SHAPES = 5000
+
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_NUMBERS = re.compile(r"(?<![\w.\"])-?\d+(?:\.\d+)?(?:e[-+]?\d+)?\b", re.IGNORECASE)
+_PARAMS = re.compile(r"\?|:\w+|%\(\w+\)s|%s|\$\d+")
+_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    Get shape of statement: literals and bound parameters are replaced with ``?``, lists of them with ``(...)`` and
+    whitespaces are collapsed, so statements differing by values only have the same shape.
+    """
+    shape = _STRINGS.sub("?", statement)
+    shape = _NUMBERS.sub("?", shape)
+    shape = _PARAMS.sub("?", shape)
+    shape = _LISTS.sub("(...)", shape)
+    return _SPACES.sub(" ", shape).strip()
+
+
+@dataclass
+class StatementRecord:
+    statement: str
+    parameters: Any
+    started_at: float  # time.time()
+    duration: float
+    rows: int | None  # affected rows, unknown for selects of most DBAPI drivers
+
+
+@dataclass
+class StatementStats:
+    shape: str
+    count: int = 0
+    total: float = 0
+    max: float = 0
+    rows: int = 0
+
+    @property
+    def average(self) -> float:
+        return self.total / self.count if self.count else 0
+
+
+class StatementProfiler:
+    """
+    Collects every statement executed by engine: the most recent ones with their parameters and timings and aggregated
+    timings by statement shape. Uses ``before_cursor_execute``/``after_cursor_execute`` engine events, so statements
+    issued by inspector and other SQLAlchemy internals are counted too.
+    """
+
+    def __init__(self, size: int = MAX_RECORDS):
+        self.records: deque[StatementRecord] = deque(maxlen=size)
+        self.stats: dict[str, StatementStats] = {}
+        self._lock = threading.Lock()
+
+    def attach(self, engine: "Engine") -> None:
+        sa.event.listen(engine, "before_cursor_execute", self._before)
+        sa.event.listen(engine, "after_cursor_execute", self._after)
+        sa.event.listen(engine, "handle_error", self._failed)
+
+    def detach(self, engine: "Engine") -> None:
+        sa.event.remove(engine, "before_cursor_execute", self._before)
+        sa.event.remove(engine, "after_cursor_execute", self._after)
+        sa.event.remove(engine, "handle_error", self._failed)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("seeqler_started", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info["seeqler_started"].pop()
+        rows = cursor.rowcount if cursor.rowcount is not None and cursor.rowcount >= 0 else None
+        shape = normalize_statement(statement)
+
+        with self._lock:
+            self.records.append(StatementRecord(statement, parameters, time.time(), duration, rows))
+
+            stats = self.stats.get(shape)
+            if stats is None:
+                if len(self.stats) >= MAX_SHAPES:
+                    return
+                stats = self.stats[shape] = StatementStats(shape)
+            stats.count += 1
+            stats.total += duration
+            stats.max = max(stats.max, duration)
+            stats.rows += rows or 0
+
+    def _failed(self, context):
+        # ``after_cursor_execute`` is not emitted for failed statement: its start time is dropped here, otherwise start
+        # times would pile up on pooled connection
+        if context.connection is not None and (started := context.connection.info.get("seeqler_started")):
+            started.pop()
+
+    def clear(self) -> None:
+        with self._lock:
+            self.records.clear()
+            self.stats.clear()
+
+    def recent(self) -> list[StatementRecord]:
+        with self._lock:
+            return list(self.records)
+
+    def top(self, count: int = 20, by: str = "total") -> list[StatementStats]:
+        """
+        Get statement shapes with the biggest value of ``by`` attribute.
+
+        Args:
+            count: number of shapes to return
+            by: one of "total", "count", "max" and "average"
+
+        Returns:
+            list[StatementStats]: copies of statistics
+        """
+        with self._lock:
+            stats = [StatementStats(x.shape, x.count, x.total, x.max, x.rows) for x in self.stats.values()]
+        return sorted(stats, key=lambda x: getattr(x, by), reverse=True)[:count]
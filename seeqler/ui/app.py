@@ -1,40 +1,92 @@
-from types import SimpleNamespace
+from functools import cached_property
 
 import PyQt6.QtWidgets as widget
+from PyQt6.QtCore import QTimer
 from PyQt6.QtGui import QFontDatabase
 
-from .connection_list import ConnectionListWindow
-from .schema import SchemaWindow
+from ..common.resources import ResourceCache
+from ..common.startup import mark
+
+
+class Windows:
+    """
+    Application windows, every window is imported and built on first access. There may be several schema windows:
+    one for every open connection.
+    """
+
+    def __init__(self, main_window: "MainWindow", settings):
+        self.main_window = main_window
+        self.settings = settings
+        self.schema_windows: list = []
+
+    @cached_property
+    def connection_manager(self):
+        from .connection_list import ConnectionListWindow
+
+        return ConnectionListWindow(self.main_window, self.settings)
+
+    def open_schema_window(self, connection):
+        """
+        Show schema window of connection: closed windows are reused, the open ones keep working with their
+        connections.
+        """
+        # schema window depends on SQLAlchemy, the heaviest import of the app
+        from .schema import SchemaWindow
+
+        window = next((x for x in self.schema_windows if not x.initiated), None)
+        if window is None:
+            window = SchemaWindow(self.main_window)
+            self.schema_windows.append(window)
+        window.set_up(connection)
+        window.show()
+        return window
+
+    def schema_window_closed(self):
+        if not any(x.initiated for x in self.schema_windows):
+            self.connection_manager.show()
 
 
 class MainWindow(widget.QMainWindow):
     def __init__(self, settings):
         super().__init__()
 
-        self.windows = SimpleNamespace()
-        self.windows.connection_manager = ConnectionListWindow(self, settings)
-        self.windows.schema_window = SchemaWindow(self)
+        self.windows = Windows(self, settings)
 
         if settings.connection:
-            self.windows.schema_window.set_up(settings.connection)
-            self.windows.schema_window.show()
+            self.windows.open_schema_window(settings.connection)
         else:
             self.windows.connection_manager.show()
 
 
-def get_app(settings):
-    app = widget.QApplication([])
-
-    # load all needed fonts
+def load_fonts(app: widget.QApplication, settings):
     for font in settings.font_list:
         QFontDatabase.addApplicationFont(str(settings.resources_path / font))
+    # make widgets resolve font family of stylesheet again
+    app.setStyleSheet(app.styleSheet())
+    mark("fonts loaded")
+
+
+def remove_snapshot_orphans():
+    from ..sql.snapshot import remove_orphans
+
+    remove_orphans()
+    mark("orphaned snapshots removed")
+
+
+def get_app(settings):
+    app = widget.QApplication([])
+    mark("QApplication created")
 
-    with open(settings.resources_path / "app_style.qss", "r") as qss:
-        app.setStyleSheet(qss.read())
+    app.setStyleSheet(ResourceCache().stylesheet())
+    # fonts are parsed after the first window is shown, until then fallback font is used
+    QTimer.singleShot(0, lambda: load_fonts(app, settings))
+    # snapshot files of crashed processes are removed after the first window is shown too
+    QTimer.singleShot(0, remove_snapshot_orphans)
 
     screen_size = app.primaryScreen().size()
     settings.screen_width, settings.screen_height = screen_size.width(), screen_size.height()
 
     window = MainWindow(settings)
+    mark("first window built")
 
     return app, window
@@ -45,9 +45,9 @@ class ConnectionItem(widget.QWidget):
 
     def connect(self):
         connection = self._get_connection()
+        ConnectionManager().touch(connection)
         self.settings.connection = connection
-        self.daddy.main_window.windows.schema_window.set_up(connection=connection)
-        self.daddy.main_window.windows.schema_window.show()
+        self.daddy.main_window.windows.open_schema_window(connection)
         self.daddy.hide()
 
     def edit(self):
@@ -0,0 +1,95 @@
+from typing import Any, Callable
+
+from PyQt6 import QtCore as core
+from PyQt6 import QtGui as gui
+
+from seeqler.common.language import Language
+from seeqler.ui.formatting import FormattedPage
+
+__all__ = ("PageModel",)
+
+
+Role = core.Qt.ItemDataRole
+CHANGED_COLOR = gui.QColor(255, 200, 0, 70)  # translucent, so it suits both light and dark themes
+
+
+class PageModel(core.QAbstractTableModel):
+    """
+    Model of shown page. Cells are formatted by worker (see ``formatting.format_page``), so the model only hands them
+    out, and the whole page is replaced at once by ``set_page``.
+    """
+
+    def __init__(self, parent: core.QObject | None = None):
+        super().__init__(parent)
+        self.lang = Language()
+        self.columns: list[str] = []
+        self.page: FormattedPage | None = None
+        self.contents: Any = None  # page rows the texts are made of
+        self.placeholder_rows = 0  # empty rows shown until page is loaded
+        self.changed: set[int] = set()  # rows changed since the previous refresh of page (see watch mode)
+        self.link_columns: set[int] = set()  # foreign key columns, their cells open referred rows
+        self.link_tooltip: Callable[[int, int], str | None] | None = None  # description of referred row of cell
+
+    def set_columns(self, columns: list[str], placeholder_rows: int = 0) -> None:
+        self.beginResetModel()
+        self.columns, self.page, self.contents, self.changed = list(columns), None, None, set()
+        self.placeholder_rows = placeholder_rows
+        self.endResetModel()
+
+    def set_page(
+        self, page: FormattedPage, contents: Any, columns: list[str] | None = None, changed: set[int] | None = None
+    ) -> None:
+        self.beginResetModel()
+        if columns is not None:
+            self.columns = list(columns)
+        self.page, self.contents, self.placeholder_rows = page, contents, 0
+        self.changed = changed or set()
+        self.endResetModel()
+
+    def clear(self) -> None:
+        self.set_columns(self.columns)
+
+    def is_cut(self, row: int, col: int) -> bool:
+        return self.page is not None and (row, col) in self.page.cut
+
+    # region QAbstractTableModel
+
+    def rowCount(self, parent: core.QModelIndex = core.QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return self.page.rows if self.page is not None else self.placeholder_rows
+
+    def columnCount(self, parent: core.QModelIndex = core.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index: core.QModelIndex, role: int = Role.DisplayRole) -> Any:
+        if self.page is None or not index.isValid():
+            return None
+
+        row, col = index.row(), index.column()
+        match role:
+            case Role.DisplayRole:
+                return self.page.texts[col][row]
+            case Role.TextAlignmentRole:
+                return self.page.alignments[col]
+            case Role.ToolTipRole if (row, col) in self.page.cut:
+                return self.lang.qst_tip_cut_value
+            case Role.ToolTipRole if col in self.link_columns and self.link_tooltip is not None:
+                return self.link_tooltip(row, col)
+            case Role.ForegroundRole if col in self.link_columns:
+                return gui.QGuiApplication.palette().color(gui.QPalette.ColorRole.Link)
+            case Role.BackgroundRole if row in self.changed:
+                return CHANGED_COLOR
+        return None
+
+    def headerData(self, section: int, orientation: core.Qt.Orientation, role: int = Role.DisplayRole) -> Any:
+        if role != Role.DisplayRole:
+            return None
+        if orientation == core.Qt.Orientation.Horizontal:
+            return self.columns[section] if section < len(self.columns) else None
+        return str(section + 1)
+
+    def flags(self, index: core.QModelIndex) -> core.Qt.ItemFlag:
+        return core.Qt.ItemFlag.ItemIsSelectable | core.Qt.ItemFlag.ItemIsEnabled
+
+    # endregion
@@ -1,35 +1,69 @@
-from typing import TYPE_CHECKING, Any
+from dataclasses import dataclass
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable
 
 from PyQt6 import QtCore as core
 from PyQt6 import QtGui as gui
 from PyQt6 import QtWidgets as widget
 
 from seeqler.common.language import Language
+from seeqler.common.memory import MemoryBudget, estimate_rows, format_size
 from seeqler.settings import Settings
+from seeqler.sql.filters import build_filters, exact_filter
+from seeqler.sql.metadata import is_large_type
+from seeqler.sql.references import Reference, ReferenceCache
+from seeqler.sql.result import ColumnarResult
+from seeqler.sql.snapshot import ResultSnapshot
 from seeqler.ui.custom.texthighlight import TextHightlight
+from seeqler.ui.formatting import PREVIEW_LENGTH, FormattedPage, PageCache, column_kind
 
 from .checklist import CheckList
+from .pagemodel import PageModel
 from .utils import retain_place
+from .valueviewer import ValueViewer, memory_reader
 
 if TYPE_CHECKING:
+    from seeqler.sql.interface import Interface
+    from seeqler.sql.profiling import TableProfile
+
     from ..schema import SchemaWindow
 
 
 DEFAULT_ROW_COUNT = 5  # default row count until table is filled up
+REFERENCE_TOOLTIP_COLUMNS = 10  # columns of referred row shown on hover
 STATUSBAR_HEIGHT = 25  # SeeqlerTab bottom_layout QSpacerItem height
 
 
+@dataclass
+class CutValue:
+    """
+    Cell value shown partially.
+    """
+
+    column: str
+    preview: Any  # what is shown, the whole value if it is in memory
+    key: dict[str, Any] | None = None  # row_key of table row
+    value: Any = None  # the whole value of raw result
+
+
 class TabInputDialog(widget.QInputDialog):
     @staticmethod
-    def getInteger(parent: widget.QWidget, value: int = 0, min: int = 1, max: int = 2**31 - 1) -> tuple[int, bool]:
+    def getInteger(
+        parent: widget.QWidget,
+        value: int = 0,
+        min: int = 1,
+        max: int = 2**31 - 1,
+        title: str | None = None,
+        label: str | None = None,
+    ) -> tuple[int, bool]:
         lang = Language()
 
         inp = TabInputDialog(parent)
         inp.setInputMode(TabInputDialog.InputMode.IntInput)
         inp.setFixedSize(400, 200)
 
-        inp.setWindowTitle(lang.qst_inp_edit_limit)
-        inp.setLabelText(lang.qst_lbl_edit_limit)
+        inp.setWindowTitle(title or lang.qst_inp_edit_limit)
+        inp.setLabelText(label or lang.qst_lbl_edit_limit)
         inp.setIntMinimum(min)
         inp.setIntMaximum(max)
         inp.setIntValue(value)
@@ -94,6 +128,7 @@ class TabInputDialog(widget.QInputDialog):
 
 class PagedTable(widget.QWidget):
     onRequestedUpdate = core.pyqtSignal()
+    onRequestedValue = core.pyqtSignal(object)
 
     def __init__(self, parent, offset: int, limit: int, columns: list[dict], *args, **kwargs):
         super().__init__(parent, *args, **kwargs)
@@ -102,8 +137,22 @@ class PagedTable(widget.QWidget):
         self.default_columns = [x["name"] for x in columns]
         self.offset = offset
         self.limit = limit
-
-        self.table = widget.QTableWidget()
+        self.sample_mode = False
+        self.order: tuple[str, bool] | None = None  # column name and descending flag
+        self.filters: dict[str, str] = {}
+        self.exact_filters: dict[str, Any] = {}  # values compared as is, see filters.build_filters
+        self.data_size = 0  # estimated size of shown page
+        self.evicted = False
+        self.large_columns: set[str] = set()  # values are cut by database, see get_sql_select
+        self.row_key: list[str] = []  # columns to find row of cut value again
+        self.kinds: dict[str, str] = {}  # formatter kinds of columns, see formatting.column_kind
+        self.page_cache = PageCache()
+        self.refreshed = False  # page is requested again by watch mode: changed rows are highlighted
+
+        self.model = PageModel(self)
+        self.table = widget.QTableView()
+        self.table.setModel(self.model)
+        self.table.doubleClicked.connect(self.open_value)
         self.update_cols([x["name"] for x in columns])
 
         self.bottom_layout = widget.QHBoxLayout()
@@ -153,14 +202,126 @@ class PagedTable(widget.QWidget):
         self.setLayout(self.general_layout)
 
     def prepare_table(self):
-        self.table.setColumnCount(len(self.columns))
-        self.table.setHorizontalHeaderLabels(self.columns)
-        self.table.setRowCount(0)
-        self.table.setRowCount(DEFAULT_ROW_COUNT)
+        self.model.set_columns(self.columns, DEFAULT_ROW_COUNT)
         self.table.resizeColumnsToContents()
         self.table.horizontalHeader().setStretchLastSection(False)
         self.table.verticalHeader().setStretchLastSection(False)
         self.table.setWordWrap(False)
+        if hasattr(self, "filter_bar"):
+            self.prepare_filters()
+
+    # region server-side sorting and filtering
+
+    def init_sorting_filtering(self):
+        """
+        Add sorting by header click and filter inputs above columns, they are applied by database.
+        """
+        show_filters = gui.QAction(self.lang.qst_btn_filters, self.edit_config.menu())
+        show_filters.setCheckable(True)
+        show_filters.toggled.connect(self.config_menu_toggle_filters)
+        self.edit_config.menu().addAction(show_filters)
+        self.filters_action = show_filters
+
+        self.filters_shown = False
+        self.filter_inputs: list[widget.QLineEdit] = []
+        self.filter_bar = widget.QWidget()
+        filter_layout = widget.QHBoxLayout()
+        filter_layout.setContentsMargins(0, 0, 0, 0)
+        filter_layout.setSpacing(0)
+        self.filter_bar.setLayout(filter_layout)
+        self.filter_bar.setHidden(True)
+
+        self.warning = widget.QLabel()
+        self.warning.setProperty("class", "warning")
+        self.warning.setHidden(True)
+
+        header = self.table.horizontalHeader()
+        header.setSectionsClickable(True)
+        header.sectionClicked.connect(self.sort_by_column)
+        header.sectionResized.connect(self.resize_filter)
+
+        position = self.general_layout.indexOf(self.table)
+        self.general_layout.insertWidget(position, self.filter_bar)
+        self.general_layout.insertWidget(position, self.warning)
+        self.prepare_filters()
+
+    def prepare_filters(self):
+        # one input per selected column, filters of hidden columns are dropped
+        layout = self.filter_bar.layout()
+        while layout.count():
+            if (item := layout.takeAt(0)).widget() is not None:  # the last one is stretch
+                item.widget().deleteLater()
+
+        self.filters = {k: v for k, v in self.filters.items() if k in self.columns}
+        self.filter_inputs = []
+        for idx, column in enumerate(self.columns):
+            line = widget.QLineEdit(self.filters.get(column, ""))
+            line.setPlaceholderText(column)
+            line.setToolTip(self.lang.qst_tip_filter)
+            line.setFixedWidth(self.table.columnWidth(idx))
+            line.returnPressed.connect(self.apply_filters)
+            layout.addWidget(line)
+            self.filter_inputs.append(line)
+        layout.addStretch()
+
+        if self.order and self.order[0] not in self.columns:
+            self.order = None
+        self.update_sort_indicator()
+
+    def resize_filter(self, idx: int, _: int, size: int):
+        if idx < len(self.filter_inputs):
+            self.filter_inputs[idx].setFixedWidth(size)
+
+    def config_menu_toggle_filters(self, checked: bool):
+        self.filters_shown = checked
+        self.filter_bar.setVisible(checked)
+        self.filter_bar.layout().setContentsMargins(self.table.verticalHeader().width(), 0, 0, 0)
+        if not checked and any(self.filters.values()):
+            self.filters = {}
+            for line in self.filter_inputs:
+                line.clear()
+            self.offset = 0
+            self.onRequestedUpdate.emit()
+
+    def set_filters(self, filters: dict[str, str], exact: dict[str, Any] | None = None):
+        # filters are shown along with the page they are applied to
+        self.exact_filters = dict(exact or {})
+        self.filters = dict(filters) | {column: exact_filter(value) for column, value in self.exact_filters.items()}
+        self.offset = 0
+        self.prepare_filters()
+        self.filters_action.setChecked(True)
+
+    def apply_filters(self):
+        self.filters = {column: line.text() for column, line in zip(self.columns, self.filter_inputs) if line.text()}
+        self.offset = 0
+        self.onRequestedUpdate.emit()
+
+    def sort_by_column(self, idx: int):
+        # cycle: ascending → descending → no sorting
+        column = self.columns[idx]
+        if self.order is None or self.order[0] != column:
+            self.order = (column, False)
+        elif not self.order[1]:
+            self.order = (column, True)
+        else:
+            self.order = None
+
+        self.update_sort_indicator()
+        self.offset = 0
+        self.onRequestedUpdate.emit()
+
+    def update_sort_indicator(self):
+        header = self.table.horizontalHeader()
+        header.setSortIndicatorShown(self.order is not None)
+        if self.order is not None:
+            order = core.Qt.SortOrder.DescendingOrder if self.order[1] else core.Qt.SortOrder.AscendingOrder
+            header.setSortIndicator(self.columns.index(self.order[0]), order)
+
+    def show_warning(self, text: str | None = None):
+        self.warning.setText(text or "")
+        self.warning.setVisible(bool(text) and not self.table.isHidden())
+
+    # endregion
 
     def update_cols(self, columns: list[str]):
         self.columns = columns
@@ -169,15 +330,47 @@ class PagedTable(widget.QWidget):
     def get_column_names(self):
         return [(x in self.columns, x) for x in self.default_columns]
 
+    @staticmethod
+    def quote(name: str) -> str:
+        return '"{}"'.format(name.replace('"', '""'))
+
+    @property
+    def preview_columns(self) -> list[str]:
+        return [x for x in self.columns if x in self.large_columns]
+
     def get_sql_select(self):
         if not self.columns:
             return "''"
-        if self.columns == self.default_columns:
-            return "*"
-        return ", ".join(f'"{x}"' for x in self.columns)
+        previews = self.preview_columns
+        if not previews:
+            return "*" if self.columns == self.default_columns else ", ".join(self.quote(x) for x in self.columns)
+
+        # large values are cut by database, their lengths and row key go after shown columns;
+        # cut values have no aliases, so ordering by column name still uses the whole value (and its index)
+        what = [
+            f"substr({self.quote(x)}, 1, {PREVIEW_LENGTH})" if x in previews else self.quote(x) for x in self.columns
+        ]
+        what += [f"length({self.quote(x)})" for x in previews]
+        what += [self.quote(x) for x in self.row_key]
+        return ", ".join(what)
+
+    def get_sql_where(self) -> tuple[list[str], dict]:
+        return build_filters(self.filters, self.quote, self.exact_filters)
+
+    def get_sql_order(self) -> str | None:
+        if self.order is None:
+            return None
+        column, descending = self.order
+        return f"{self.quote(column)} {'desc' if descending else 'asc'}"
 
     def change_table_page(self, sign: int):
-        self.offset += sign * self.limit
+        if not self.sample_mode:
+            self.offset += sign * self.limit
+        self.onRequestedUpdate.emit()
+
+    def config_menu_toggle_sample(self, checked: bool):
+        self.sample_mode = checked
+        self.offset = 0
         self.onRequestedUpdate.emit()
 
     def config_menu_change_columns(self):
@@ -193,19 +386,41 @@ class PagedTable(widget.QWidget):
             self.limit = value
             self.onRequestedUpdate.emit()
 
-    def fillup_table(self, data: dict[str, int | list[Any]]):
+    def page_formatter(self, key: Any = None) -> Callable[[Any], FormattedPage]:
+        """
+        Get function formatting page of current columns, it is called by worker thread.
+
+        Args:
+            key: request of page besides offset and limit
+        """
+        kinds = [self.kinds.get(x, "text") for x in self.columns]
+        previews = [idx for idx, x in enumerate(self.columns) if x in self.large_columns]
+        return partial(self.page_cache.format, (key, self.offset, self.limit), kinds=kinds, previews=previews)
+
+    def fillup_table(self, data: dict[str, Any]):
         contents = data["contents"]
+        page: FormattedPage = data.get("page") or self.page_formatter()(contents)
         row_number = data["rows"]
-        table_rows = len(contents)
+        table_rows = page.rows
         current_rows = self.offset + table_rows
 
-        self.table.setRowCount(table_rows)
-        self.table.scrollToTop()
-
-        for row, data_row in enumerate(contents):
-            for col, cell in enumerate(data_row):
-                content = widget.QTableWidgetItem(str(cell))
-                self.table.setItem(row, col, content)
+        # page is formatted by worker: it only replaces the previous one here
+        if not self.refreshed:
+            self.model.set_page(page, contents, self.columns)
+            self.table.scrollToTop()
+        elif page is not self.model.page:  # the same page is returned by cache if its data has not changed
+            self.model.set_page(page, contents, self.columns, self.changed_rows(page))
+        self.refreshed = False
+
+        self.evicted = False
+        self.data_size = page.size
+
+        if row_number is None:
+            # sample: the next page is just another sample
+            self.btn_left.setDisabled(True)
+            self.btn_right.setEnabled(True)
+            self.statusbar.setText(self.lang.qst_statusbar_sample.format(rows=table_rows))
+            return
 
         methods = {True: "setEnabled", False: "setDisabled"}
 
@@ -217,13 +432,58 @@ class PagedTable(widget.QWidget):
         if row_number == 0:
             self.statusbar.setText(f"0 {self.lang.qst_statusbar_of} 0")
 
+    def changed_rows(self, page: FormattedPage) -> set[int]:
+        """
+        Get rows of page which are not shown now. Rows are compared by texts, so rows shifted by inserted or deleted
+        ones are not marked.
+        """
+        if self.model.page is None:
+            return set()
+        shown = set(zip(*self.model.page.texts))
+        return {row for row, texts in enumerate(zip(*page.texts)) if texts not in shown}
+
+    def cut_value(self, contents: Any, page: FormattedPage, row: int, col: int) -> CutValue:
+        name = self.columns[col]
+        value = contents.data[col][row] if isinstance(contents, ColumnarResult) else contents[row][col]
+        if name in self.large_columns:
+            # value is cut by database: row is found by key to read the whole value
+            return CutValue(name, value, key=dict(zip(self.row_key, page.keys[row])) if page.keys else None)
+        return CutValue(name, value, value=value)
+
+    def open_value(self, index: core.QModelIndex):
+        if self.model.is_cut(index.row(), index.column()):
+            self.onRequestedValue.emit(
+                self.cut_value(self.model.contents, self.model.page, index.row(), index.column())
+            )
+
+    def memory_usage(self) -> int:
+        # shown page is usually one of cached ones
+        shown = self.model.page
+        return self.page_cache.nbytes + (self.data_size if shown and not self.page_cache.holds(shown) else 0)
+
+    def evict(self):
+        # page is dropped, it is loaded again when tab is shown
+        self.model.clear()
+        self.page_cache.clear()
+        self.data_size = 0
+        self.evicted = True
+
     def focus(self):
         self.table.setFocus()
 
 
 class PagedTableWithMeta(PagedTable):
+    onRequestedProfile = core.pyqtSignal()
+    onRequestedWatch = core.pyqtSignal()
+    onRequestedReference = core.pyqtSignal(object)
+
     def __init__(self, parent, offset: int, limit: int, columns: list[dict], *args, **kwargs):
         super().__init__(parent, offset, limit, columns)
+        self.large_columns = {x["name"] for x in columns if is_large_type(x["type"])}
+        self.kinds = {x["name"]: column_kind(x["type"]) for x in columns}
+        self.references: dict[str, Reference] = {}  # see TableMeta.references
+        self.reference_cache = ReferenceCache()
+        self.model.link_tooltip = self.reference_tooltip
 
         headers = ["parameter", "type", "nullable", "default value", "foreign key"]
         self.meta_table = widget.QTableWidget()
@@ -236,39 +496,217 @@ class PagedTableWithMeta(PagedTable):
             for col, key in enumerate(("name", "type", "nullable", "default", "fkey")):
                 self.meta_table.setItem(row, col, widget.QTableWidgetItem(str(item[key])))
 
+        headers = ["parameter", "nulls", "distinct (≈)", "min", "max", "most frequent"]
+        self.profile_table = widget.QTableWidget()
+        self.profile_table.setColumnCount(len(headers))
+        self.profile_table.setHorizontalHeaderLabels(headers)
+        self.profile_table.setRowCount(0)
+        self.profile_table.setWordWrap(False)
+        self.profile_table.setHidden(True)
+        self.profile_requested = False
+
         config_layout = widget.QHBoxLayout()
 
         self.show_data = widget.QPushButton()
         self.show_data.setText(self.lang.qst_switchview_data)
         self.show_data.setProperty("class", "swButtonSwitch")
         self.show_data.setDisabled(True)
-        self.show_data.clicked.connect(lambda: self.switch_meta_info(False))
+        self.show_data.clicked.connect(lambda: self.switch_view("data"))
         self.show_data.setSizePolicy(retain_place)
 
         self.show_meta = widget.QPushButton()
         self.show_meta.setText(self.lang.qst_switchview_meta)
         self.show_meta.setProperty("class", "swButtonSwitch")
-        self.show_meta.clicked.connect(lambda: self.switch_meta_info(True))
+        self.show_meta.clicked.connect(lambda: self.switch_view("meta"))
         self.show_meta.setSizePolicy(retain_place)
 
+        self.show_profile = widget.QPushButton()
+        self.show_profile.setText(self.lang.qst_switchview_profile)
+        self.show_profile.setProperty("class", "swButtonSwitch")
+        self.show_profile.clicked.connect(lambda: self.switch_view("profile"))
+        self.show_profile.setSizePolicy(retain_place)
+
         config_layout.addWidget(self.show_data)
         config_layout.addWidget(self.show_meta)
+        config_layout.addWidget(self.show_profile)
+
+        sample = gui.QAction(self.lang.qst_btn_sample_mode, self.edit_config.menu())
+        sample.setCheckable(True)
+        sample.toggled.connect(self.config_menu_toggle_sample)
+        self.edit_config.menu().addAction(sample)
+
+        # watch mode: table is checked for changes by timer, page is requested again only if it has changed
+        watch = gui.QAction(self.lang.qst_btn_watch, self.edit_config.menu())
+        watch.setCheckable(True)
+        watch.toggled.connect(self.config_menu_toggle_watch)
+        self.edit_config.menu().addAction(watch)
+        watch_interval = gui.QAction(self.lang.qst_btn_watch_interval, self.edit_config.menu())
+        watch_interval.triggered.connect(self.config_menu_change_watch_interval)
+        self.edit_config.menu().addAction(watch_interval)
+
+        self.watch_marker: Any = None  # see BaseSQL.change_marker
+        self.watch_pending = False
+        self.watch_timer = core.QTimer(self)
+        self.watch_timer.setInterval(Settings().watch_interval * 1000)
+        self.watch_timer.timeout.connect(self.onRequestedWatch.emit)
 
         self.bottom_layout.addLayout(config_layout)
         self.general_layout.insertWidget(1, self.meta_table)
+        self.general_layout.insertWidget(2, self.profile_table)
+
+        self.init_sorting_filtering()
+
+    # region foreign keys
+
+    @property
+    def link_columns(self) -> dict[int, Reference]:
+        # values of large columns are cut by database, so they are not looked up
+        return {
+            idx: self.references[name]
+            for idx, name in enumerate(self.columns)
+            if name in self.references and name not in self.large_columns
+        }
+
+    def reference_prefetcher(self, interface: "Interface") -> Callable[[ColumnarResult], None] | None:
+        """
+        Get function requesting rows referred by foreign key values of page, it is called by worker thread.
+        """
+        links, cache = self.link_columns, self.reference_cache
+        if not links:
+            return None
+
+        def prefetch(contents: ColumnarResult):
+            for idx, reference in links.items():
+                cache.prefetch(interface, reference, contents.data[idx], columns=REFERENCE_TOOLTIP_COLUMNS)
+
+        return prefetch
+
+    def cell_reference(self, row: int, col: int) -> tuple[Reference, Any] | None:
+        reference, contents = self.link_columns.get(col), self.model.contents
+        if reference is None or contents is None:
+            return None
+        value = contents.data[col][row] if isinstance(contents, ColumnarResult) else contents[row][col]
+        return (reference, value) if value is not None else None
+
+    def reference_tooltip(self, row: int, col: int) -> str | None:
+        if (link := self.cell_reference(row, col)) is None:
+            return None
+
+        reference, value = link
+        record, title = self.reference_cache.get(reference, value), f"{reference.table}.{reference.column} = {value}"
+        if record is None:
+            return title  # request of referred rows has failed
+        if not record:
+            return f"{title}\n{self.lang.qst_tip_reference_missing}"
+
+        lines = []
+        for name, item in list(record.items())[:REFERENCE_TOOLTIP_COLUMNS]:
+            text = str(item)
+            lines.append(f"{name}: {text if len(text) <= 60 else text[:59] + '…'}")
+        return "\n".join([title, *lines, "", self.lang.qst_tip_reference_open])
+
+    def fillup_table(self, data: dict[str, Any]):
+        self.model.link_columns = set(self.link_columns)
+        super().fillup_table(data)
+
+    def open_value(self, index: core.QModelIndex):
+        if (link := self.cell_reference(index.row(), index.column())) is not None:
+            self.onRequestedReference.emit(link)
+            return
+        super().open_value(index)
+
+    def memory_usage(self) -> int:
+        return super().memory_usage() + self.reference_cache.nbytes
+
+    def evict(self):
+        super().evict()
+        self.reference_cache.clear()
+
+    # endregion
+
+    def config_menu_toggle_watch(self, checked: bool):
+        self.watch_marker = None
+        if checked:
+            self.watch_timer.start()
+            self.onRequestedWatch.emit()  # the first check only takes marker
+        else:
+            self.watch_timer.stop()
+            self.model.changed.clear()
+            self.table.viewport().update()
+
+    def config_menu_change_watch_interval(self):
+        value, ok = TabInputDialog.getInteger(
+            self,
+            value=self.watch_timer.interval() // 1000,
+            title=self.lang.qst_inp_watch_interval,
+            label=self.lang.qst_lbl_watch_interval,
+        )
+        if ok:
+            self.watch_timer.setInterval(value * 1000)
 
     def switch_meta_info(self, show_meta: bool = True):
-        self.table.setHidden(show_meta)
-        self.show_data.setEnabled(show_meta)
-        self.meta_table.setVisible(show_meta)
-        self.show_meta.setDisabled(show_meta)
-        self.statusbar.setHidden(show_meta)
-        self.btn_left.setHidden(show_meta)
-        self.btn_right.setHidden(show_meta)
-        self.edit_config.setHidden(show_meta)
+        self.switch_view("meta" if show_meta else "data")
+
+    def switch_view(self, view: str = "data"):
+        show_data = view == "data"
+        self.table.setVisible(show_data)
+        self.meta_table.setVisible(view == "meta")
+        self.profile_table.setVisible(view == "profile")
+
+        self.show_data.setDisabled(show_data)
+        self.show_meta.setDisabled(view == "meta")
+        self.show_profile.setDisabled(view == "profile")
+
+        self.filter_bar.setVisible(show_data and self.filters_shown)
+        self.warning.setVisible(show_data and bool(self.warning.text()))
+        self.statusbar.setHidden(not show_data)
+        self.btn_left.setHidden(not show_data)
+        self.btn_right.setHidden(not show_data)
+        self.edit_config.setHidden(not show_data)
+
+        if view == "profile" and not self.profile_requested:
+            self.profile_requested = True
+            self.onRequestedProfile.emit()
+
+    @core.pyqtSlot(object)
+    def profile_progress(self, scanned: int):
+        self.show_profile.setText(f"{self.lang.qst_switchview_profile} ({scanned})")
+
+    def fillup_profile(self, profile: "TableProfile"):
+        def short(value, length: int = 50) -> str:
+            text = str(value)
+            return text if len(text) <= length else text[: length - 1] + "…"
+
+        self.show_profile.setText(self.lang.qst_switchview_profile)
+        self.profile_table.clearSpans()  # error of the previous request
+        self.profile_table.setRowCount(len(profile.columns))
+        for row, column in enumerate(profile.columns):
+            frequent = ", ".join(f"{short(value, 20)} ({count})" for value, count in column.frequent.top())
+            cells = (column.name, column.nulls, column.distinct.count(), column.min, column.max, frequent)
+            for col, cell in enumerate(cells):
+                self.profile_table.setItem(row, col, widget.QTableWidgetItem(short("" if cell is None else cell)))
+        self.profile_table.resizeColumnsToContents()
+
+        if profile.sampled:
+            self.profile_table.setToolTip(
+                self.lang.qst_profile_sampled.format(scanned=profile.scanned, rows=profile.rows)
+            )
+
+    def profile_failed(self, error: Exception):
+        # profile is requested again next time the view is switched to it
+        self.profile_requested = False
+        self.show_profile.setText(self.lang.qst_switchview_profile)
+        self.profile_table.clearSpans()
+        self.profile_table.setRowCount(1)
+        self.profile_table.setSpan(0, 0, 1, self.profile_table.columnCount())
+        self.profile_table.setItem(0, 0, widget.QTableWidgetItem(self.lang.qst_profile_error.format(error=error)))
 
 
 class PagedTableWithEditor(PagedTable):
+    onRequestedPage = core.pyqtSignal()
+    onRequestedSnapshot = core.pyqtSignal()
+    onRequestedExport = core.pyqtSignal(str)
+
     def __init__(self, parent, offset, limit, columns, *args, **kwargs):
         super().__init__(parent, offset, limit, columns, *args, **kwargs)
 
@@ -285,34 +723,168 @@ class PagedTableWithEditor(PagedTable):
         self.run.clicked.connect(self.execute)
         self.bottom_layout.addWidget(self.run)
 
+        export_csv = gui.QAction(self.lang.qst_btn_export_csv, self.edit_config.menu())
+        export_csv.triggered.connect(self.config_menu_export_csv)
+        self.edit_config.menu().addAction(export_csv)
+
+        snapshot = gui.QAction(self.lang.qst_btn_snapshot, self.edit_config.menu())
+        snapshot.setCheckable(True)
+        snapshot.setToolTip(self.lang.qst_tip_snapshot)
+        snapshot.toggled.connect(self.config_menu_toggle_snapshot)
+        self.edit_config.menu().addAction(snapshot)
+        self.edit_config.menu().setToolTipsVisible(True)
+
+        # results are sorted and filtered only when they are materialized to snapshot
+        self.init_sorting_filtering()
+
+        self.result: tuple[ColumnarResult, list[str]] | None = None  # all the rows of last result with column names
+        self.result_size = 0
+        self.snapshot_mode = False  # results of the next runs are written to snapshot
+        self.snapshot: ResultSnapshot | None = None
+
     def update_cols(self, columns: list[str]):
         self.default_columns = columns
         super().update_cols(columns)
 
+    @property
+    def source(self) -> ColumnarResult | ResultSnapshot | None:
+        """
+        Rows of the last result pages are cut from: snapshot or result in memory.
+        """
+        if self.snapshot is not None:
+            return self.snapshot
+        return self.result[0] if self.result is not None else None
+
     def execute(self):
         self.label_result.hide()
         self.table.show()
+        self.offset = 0
+        self.result, self.result_size = None, 0
+        # file of the previous snapshot is removed as soon as running tasks drop it
+        self.snapshot, self.filters, self.order = None, {}, None
+        self.show_warning()
+        self.page_cache.clear()
         self.prepare_table()
         self.onRequestedUpdate.emit()
 
-    def fillup_table(self, data: tuple[dict[str, int | list[Any]], list[str]]):
-        data, columns = data
+    def change_table_page(self, sign: int):
+        if self.source is None:
+            if not self.evicted:  # dropped result is requested again by Run button only
+                super().change_table_page(sign)
+            return
+        # pages of result are shown from memory or snapshot, statement is not executed again
+        self.offset += sign * self.limit
+        self.show_page()
+
+    def config_menu_change_limit(self):
+        value, ok = TabInputDialog.getInteger(self, value=self.limit)
+        if ok:
+            self.limit = value
+            if self.source is not None:
+                self.show_page()
+            elif not self.evicted:  # dropped result is requested again by Run button only
+                self.onRequestedUpdate.emit()
+
+    def config_menu_toggle_snapshot(self, checked: bool):
+        self.snapshot_mode = checked
+        if checked and self.snapshot is None and self.result is not None:
+            # result fetched already is written to snapshot instead of running statement again
+            self.onRequestedSnapshot.emit()
+
+    def config_menu_export_csv(self):
+        if self.source is None:
+            widget.QMessageBox.information(self, self.lang.qst_btn_export_csv, self.lang.qst_export_no_result)
+            return
+
+        path, _ = widget.QFileDialog.getSaveFileName(self, self.lang.qst_btn_export_csv, "", "CSV (*.csv)")
+        if path:
+            # the whole result is written by worker thread
+            self.onRequestedExport.emit(path)
+
+    def export_finished(self, path: str):
+        self.statusbar.setText(self.lang.qst_export_done.format(path=path))
+
+    def apply_filters(self):
+        if self.snapshot is None:
+            self.show_warning(self.lang.qst_warn_snapshot_required)
+            return
+        super().apply_filters()
+
+    def sort_by_column(self, idx: int):
+        if self.snapshot is None:
+            self.show_warning(self.lang.qst_warn_snapshot_required)
+            return
+        super().sort_by_column(idx)
+
+    def memory_usage(self) -> int:
+        return super().memory_usage() + self.result_size
+
+    def evict(self):
+        # snapshot is kept: it takes no memory
+        super().evict()
+        self.result, self.result_size = None, 0
+        if self.snapshot is None:
+            # statement is not executed again by itself: text may be changed already, statement may change data
+            self.table.hide()
+            self.btn_left.setDisabled(True)
+            self.btn_right.setDisabled(True)
+            self.label_result.setText(self.lang.qst_tab_raw_evicted)
+            self.label_result.show()
+
+    def prepare_page(self) -> Callable[[ColumnarResult | ResultSnapshot], dict[str, Any]]:
+        """
+        Get function cutting current page out of result or reading it from snapshot (sorted and filtered) and
+        formatting it, it is called by worker thread.
+        """
+        cache, offset, limit, filters, order = self.page_cache, self.offset, self.limit, dict(self.filters), self.order
+
+        def prepare(result: ColumnarResult | ResultSnapshot) -> dict[str, Any]:
+            if isinstance(result, ResultSnapshot):
+                contents, rows = result.page(offset, limit, filters, order)
+            else:
+                contents, rows = result[offset : offset + limit], len(result)
+            # columns of raw result have no known types: formatters are chosen by values
+            key = (tuple(filters.items()), order, offset, limit)
+            page = cache.format(key, contents, ["auto"] * len(result.columns), [])
+            return {"contents": contents, "rows": rows, "page": page}
+
+        return prepare
+
+    def show_page(self):
+        self.onRequestedPage.emit()
+
+    @core.pyqtSlot(object)
+    def snapshot_progress(self, rows: int):
+        self.statusbar.setText(self.lang.qst_snapshot_progress.format(rows=rows))
+
+    def fillup_table(self, data: dict[str, Any]):
+        if "result" not in data:
+            # another page of stored result
+            super().fillup_table(data)
+            return
 
+        result, columns = data["result"], data["columns"]
         if isinstance(columns, str):
             self.table.hide()
             self.label_result.show()
-            text = str(data)
+            text = str(result)
             if columns == "error":
-                text = f"{self.lang.qst_tab_raw_col_error}\n\n{data}"
+                text = f"{self.lang.qst_tab_raw_col_error}\n\n{result}"
             if columns == "norows":
-                text = f"{self.lang.qst_tab_raw_col_result}\n\n{self.lang.qst_tab_raw_matched_rows.format(rows=data)}"
+                text = f"{self.lang.qst_tab_raw_col_result}\n\n{self.lang.qst_tab_raw_matched_rows.format(rows=result)}"
             self.label_result.setText(text)
             return
 
-        table_rows = len(data)
-        data = data[self.offset : self.offset + self.limit]
-        self.update_cols([x for x in columns])
-        super().fillup_table({"contents": data, "rows": table_rows})
+        if isinstance(result, ResultSnapshot):
+            # snapshot replaces result in memory
+            self.snapshot, self.result, self.result_size = result, None, 0
+            self.show_warning()
+        else:
+            self.result, self.result_size = (result, list(columns)), estimate_rows(result)
+        # columns of new result are shown along with its first page
+        self.columns = self.default_columns = list(columns)
+        super().fillup_table(data["page"])
+        self.prepare_filters()
 
     def focus(self):
         self.textarea.focusInEvent(gui.QFocusEvent(core.QEvent.Type.FocusIn))
@@ -321,12 +893,20 @@ class PagedTableWithEditor(PagedTable):
 
 class SeeqlerTab(widget.QWidget):
     def __init__(
-        self, parent: "SchemaWindow", table_name: str, columns: list[dict] = None, raw: bool = False, *args, **kwargs
+        self,
+        parent: "SchemaWindow",
+        table_name: str,
+        columns: list[dict] = None,
+        schema: str | None = None,
+        raw: bool = False,
+        *args,
+        **kwargs,
     ):
         super().__init__(parent, *args, **kwargs)
         self.daddy = parent
         self.settings = Settings()
         self.table_name = table_name
+        self.schema = schema
         self.raw = raw
 
         self.general_layout = widget.QVBoxLayout()
@@ -338,24 +918,162 @@ class SeeqlerTab(widget.QWidget):
     def init_ui_raw(self, _):
         self.paged_table = PagedTableWithEditor(self, 0, self.settings.rows_per_page, [])
         self.paged_table.onRequestedUpdate.connect(self.load_table_contents)
+        self.paged_table.onRequestedPage.connect(self.load_result_page)
+        self.paged_table.onRequestedSnapshot.connect(self.load_snapshot)
+        self.paged_table.onRequestedExport.connect(self.export_csv)
+        self.paged_table.onRequestedValue.connect(self.open_value)
         self.general_layout.addWidget(self.paged_table)
 
     def init_ui_normal(self, columns):
         self.paged_table = PagedTableWithMeta(self, 0, self.settings.rows_per_page, columns)
+        meta = self.daddy.interface.metadata.table(self.table_name, self.schema)
+        self.paged_table.row_key = meta.row_key or []
+        self.paged_table.references = meta.references
         self.paged_table.onRequestedUpdate.connect(self.load_table_contents)
+        self.paged_table.onRequestedProfile.connect(self.load_table_profile)
+        self.paged_table.onRequestedWatch.connect(self.check_changes)
+        self.paged_table.onRequestedReference.connect(self.open_reference)
+        self.paged_table.onRequestedValue.connect(self.open_value)
         self.general_layout.addWidget(self.paged_table)
 
+    @property
+    def key(self) -> tuple[str | None, str]:
+        return self.schema, self.table_name
+
     def focus(self):
         self.paged_table.focus()
 
     def load_table_contents(self):
         if self.raw:
-            self.daddy.sql_run_raw_sql(self.table_name, self.paged_table.textarea.toPlainText())
-        else:
-            self.daddy.sql_get_table_contents(
-                self.table_name, self.paged_table.offset, self.paged_table.limit, self.paged_table.get_sql_select()
+            if self.paged_table.snapshot is not None:
+                self.load_result_page()  # sorting and filtering of snapshot
+                return
+            self.daddy.sql_run_raw_sql(
+                self.key,
+                self.paged_table.textarea.toPlainText(),
+                prepare=self.paged_table.prepare_page(),
+                snapshot=self.paged_table.snapshot_mode,
+                progress=self.paged_table.snapshot_progress,
             )
+            return
+
+        where, params = self.paged_table.get_sql_where()
+        select, order, sample = (
+            self.paged_table.get_sql_select(),
+            self.paged_table.get_sql_order(),
+            self.paged_table.sample_mode,
+        )
+        self.check_sort_index()
+        self.daddy.sql_get_table_contents(
+            self.key,
+            self.paged_table.offset,
+            self.paged_table.limit,
+            select,
+            sample=sample,
+            where=where,
+            order=order,
+            params=params,
+            prepare=self.paged_table.page_formatter((select, tuple(where), tuple(params.items()), order, sample)),
+            prefetch=self.paged_table.reference_prefetcher(self.daddy.interface),
+        )
+
+    def load_result_page(self):
+        # page of raw result which is already fetched
+        self.daddy.sql_prepare_page(self.key, self.paged_table.prepare_page(), self.paged_table.source)
+
+    def load_snapshot(self):
+        self.daddy.sql_snapshot_result(self.key, self.paged_table.prepare_page(), self.paged_table.result[0])
+
+    def export_csv(self, path: str):
+        self.daddy.sql_export_csv(self.key, self.paged_table.source, path)
+
+    def check_sort_index(self):
+        # sorting by column without index makes database sort the whole table to get any page
+        order = self.paged_table.order
+        meta = self.daddy.interface.metadata.table(self.table_name, self.schema)
+        if order is not None and not self.paged_table.sample_mode and not meta.is_indexed(order[0]):
+            self.paged_table.show_warning(self.settings.lang.qst_warn_sort_scan.format(column=order[0]))
+        else:
+            self.paged_table.show_warning()
+
+    def open_value(self, cut: CutValue):
+        if cut.value is not None:
+            reader = memory_reader(cut.value)
+        elif cut.key:
+            interface, schema = self.daddy.interface, self.schema
+            length = None  # size of value is computed by the first read only
+
+            def reader(offset: int, size: int):
+                nonlocal length
+                chunk, length = interface.read_value(self.table_name, cut.column, cut.key, offset, size, schema, length)
+                return chunk, length
+
+        else:
+            widget.QMessageBox.information(self, cut.column, self.settings.lang.qst_no_row_key)
+            return
+
+        title = cut.column if self.raw else f"{self.table_name}.{cut.column}"
+        ValueViewer(self.daddy, title, reader, text=isinstance(cut.preview, str)).show()
+
+    def open_reference(self, link: tuple[Reference, Any]):
+        # referred table is opened with filter by the value
+        reference, value = link
+        # key is passed to database as it is: text of filter would turn "007" into 7
+        self.daddy.open_table(reference.table, exact={reference.column: value}, schema=reference.schema or self.schema)
+
+    def check_changes(self):
+        # only shown tabs are watched, check is skipped while the previous one is not done
+        table = self.paged_table
+        if table.watch_pending or table.sample_mode or table.evicted or not self.isVisible():
+            return
+        table.watch_pending = True
+        self.daddy.sql_check_changes(self.key)
+
+    def watch_checked(self, marker: Any):
+        table = self.paged_table
+        table.watch_pending = False
+        if not table.watch_timer.isActive():
+            return  # watch mode is turned off
+
+        changed = table.watch_marker is not None and marker != table.watch_marker
+        table.watch_marker = marker
+        if changed:
+            table.refreshed = True
+            self.load_table_contents()
+
+    def watch_failed(self, error: Exception):
+        # table is checked again by the next poll
+        self.paged_table.watch_pending = False
+        self.paged_table.statusbar.setText(self.settings.lang.qst_watch_error.format(error=error))
+
+    def load_table_profile(self):
+        self.daddy.sql_get_table_profile(self.key)
 
     def fillup_table(self, data):
         # this method is called from sql_get_table_contents' after
-        return self.paged_table.fillup_table(data)
+        result = self.paged_table.fillup_table(data)
+        MemoryBudget().touch(self)
+        self.daddy.enforce_memory_budget()
+        return result
+
+    # region memory accounting
+
+    def memory_usage(self) -> int:
+        return self.paged_table.memory_usage()
+
+    def evict(self):
+        self.paged_table.evict()
+
+    def activate(self):
+        """
+        Tab became current: load its data again if it was evicted. Statement of raw tab is not executed again, only its
+        snapshot is read.
+        """
+        MemoryBudget().touch(self)
+        if self.paged_table.evicted and (not self.raw or self.paged_table.snapshot is not None):
+            self.load_table_contents()
+
+    def memory_tooltip(self) -> str:
+        return self.settings.lang.qst_tip_memory.format(size=format_size(self.memory_usage()))
+
+    # endregion
@@ -0,0 +1,174 @@
+import codecs
+from typing import TYPE_CHECKING, Callable
+
+from PyQt6 import QtCore as core
+from PyQt6 import QtGui as gui
+from PyQt6 import QtWidgets as widget
+
+from seeqler.common.language import Language
+from seeqler.common.memory import format_size
+
+if TYPE_CHECKING:
+    from PyQt6.QtCore import pyqtBoundSignal
+
+    from ..schema import SchemaWindow
+
+__all__ = ("ValueViewer", "memory_reader")
+
+
+VIEW_CHUNK = 64 * 1024  # bytes shown at once
+SAVE_CHUNK = 1024 * 1024  # bytes written to file at once
+
+Reader = Callable[[int, int], tuple[bytes | str, int]]  # (offset, size) -> part of value and size of the whole value
+
+
+def memory_reader(value: str | bytes | bytearray | memoryview) -> Reader:
+    """
+    Get reader of value which is already fetched: parts are sliced out of it without copying the whole value.
+    """
+    if isinstance(value, str):
+        return lambda offset, size: (value[offset : offset + size], len(value))
+
+    view = memoryview(value)
+    return lambda offset, size: (bytes(view[offset : offset + size]), len(view))
+
+
+def hex_dump(chunk: bytes, offset: int) -> str:
+    lines = []
+    for start in range(0, len(chunk), 16):
+        part = chunk[start : start + 16]
+        printable = "".join(chr(x) if 32 <= x < 127 else "." for x in part)
+        lines.append(f"{offset + start:08x}  {part.hex(' '):<47}  |{printable}|\n")
+    return "".join(lines)
+
+
+def save_value(reader: Reader, path: str, signal: "pyqtBoundSignal | None" = None) -> int:
+    """
+    Write value to file part by part.
+
+    Args:
+        reader: reader of value
+        path: file path
+        signal: Retriever progress signal, receives number of bytes written so far
+
+    Returns:
+        int: size of value in bytes
+    """
+    with open(path, "wb") as file:
+        offset = 0
+        while True:
+            chunk, size = reader(offset, SAVE_CHUNK)
+            if not chunk:
+                break
+            offset += len(chunk)
+            file.write(chunk.encode() if isinstance(chunk, str) else chunk)
+            if signal is not None:
+                signal.emit((offset, size))
+            if offset >= size:
+                break
+    return offset
+
+
+class ValueViewer(widget.QDialog):
+    """
+    Viewer of a single (large) value: the value is read by parts on demand, so it is never loaded completely. Parts
+    are read by background tasks of schema window.
+    """
+
+    def __init__(self, parent: "SchemaWindow", title: str, reader: Reader, text: bool):
+        super().__init__(parent)
+        self.daddy = parent
+        self.lang = Language()
+        self.reader = reader
+        self.offset = 0
+        self.size: int | None = None
+        # text read as bytes may be cut in the middle of a character
+        self.decoder = codecs.getincrementaldecoder("utf-8")(errors="replace") if text else None
+
+        self.setWindowTitle(title)
+        self.resize(core.QSize(800, 600))
+
+        self.view = widget.QPlainTextEdit()
+        self.view.setReadOnly(True)
+        if not text:
+            self.view.setFont(gui.QFontDatabase.systemFont(gui.QFontDatabase.SystemFont.FixedFont))
+
+        self.statusbar = widget.QLabel()
+
+        self.btn_more = widget.QPushButton(self.lang.val_btn_more)
+        self.btn_more.clicked.connect(self.load_more)
+        self.btn_save = widget.QPushButton(self.lang.val_btn_save)
+        self.btn_save.clicked.connect(self.save)
+
+        buttons_layout = widget.QHBoxLayout()
+        buttons_layout.addWidget(self.statusbar)
+        buttons_layout.addStretch()
+        buttons_layout.addWidget(self.btn_more)
+        buttons_layout.addWidget(self.btn_save)
+
+        layout = widget.QVBoxLayout()
+        layout.addWidget(self.view)
+        layout.addLayout(buttons_layout)
+        self.setLayout(layout)
+
+        self.load_more()
+
+    def load_more(self):
+        self.btn_more.setDisabled(True)
+        self.daddy.run_parallel_task(
+            self.reader, method_args=(self.offset, VIEW_CHUNK), at_end=self.load_more_after, at_error=self.task_failed
+        )
+
+    @core.pyqtSlot(object)
+    def load_more_after(self, data: tuple[bytes | str, int]):
+        chunk, self.size = data
+        start, self.offset = self.offset, self.offset + len(chunk)
+        finished = not chunk or self.offset >= self.size
+
+        match chunk:
+            case str():
+                text = chunk
+            case _ if self.decoder is not None:
+                text = self.decoder.decode(chunk, final=finished)
+            case _:
+                text = hex_dump(chunk, start)
+
+        cursor = self.view.textCursor()
+        cursor.movePosition(gui.QTextCursor.MoveOperation.End)
+        cursor.insertText(text)
+
+        self.btn_more.setDisabled(finished)
+        self.statusbar.setText(
+            self.lang.val_status.format(shown=format_size(self.offset), total=format_size(self.size))
+        )
+
+    def save(self):
+        path, _ = widget.QFileDialog.getSaveFileName(self, self.lang.val_btn_save)
+        if not path:
+            return
+
+        self.btn_save.setDisabled(True)
+        self.daddy.run_parallel_task(
+            save_value,
+            method_args=(self.reader, path),
+            progress=self.save_progress,
+            at_end=self.save_after,
+            at_error=self.task_failed,
+            extra_data={"path": path},
+        )
+
+    @core.pyqtSlot(object)
+    def save_progress(self, data: tuple[int, int]):
+        saved, total = data
+        self.statusbar.setText(self.lang.val_saving.format(saved=format_size(saved), total=format_size(total)))
+
+    @core.pyqtSlot(object)
+    def save_after(self, data: dict):
+        self.btn_save.setDisabled(False)
+        self.statusbar.setText(self.lang.val_saved.format(path=data["path"]))
+
+    @core.pyqtSlot(object)
+    def task_failed(self, data: dict):
+        self.btn_more.setDisabled(self.size is not None and self.offset >= self.size)
+        self.btn_save.setDisabled(False)
+        self.statusbar.setText(self.lang.val_error.format(error=data.get("error")))
@@ -0,0 +1,195 @@
+from typing import TYPE_CHECKING
+
+from PyQt6 import QtCore as core
+from PyQt6 import QtGui as gui
+from PyQt6 import QtWidgets as widget
+
+from ..common.language import Language
+from ..common.tracing import Tracer
+
+if TYPE_CHECKING:
+    from ..sql.statements import StatementProfiler
+    from .schema import SchemaWindow
+
+
+def _ms(value: float | None) -> str:
+    return "" if value is None else f"{value * 1000:.1f}"
+
+
+class DevPanel(widget.QWidget):
+    """
+    Developer panel: timings of background tasks and statements executed over the current connection.
+    """
+
+    TASK_HEADERS = ("task", "wait", "execution", "rendering", "rows", "bytes", "error")
+    STATEMENT_HEADERS = ("shape", "count", "total", "average", "max", "affected")
+    STATEMENT_ORDERS = ("total", "count", "max", "average")
+    TOP_STATEMENTS = 50
+    REFRESH_DELAY = 500  # ms: finished tasks are shown at most that often, rebuilding the tables takes time
+
+    def __init__(self, parent: "SchemaWindow"):
+        super().__init__()
+
+        self.daddy = parent
+        self.lang = Language()
+        self.tracer = Tracer()
+
+        self.setWindowTitle(self.lang.dev_win_title)
+        self.resize(core.QSize(900, 450))
+
+        self.btn_refresh = widget.QPushButton(self.lang.dev_btn_refresh)
+        self.btn_refresh.clicked.connect(self.refresh)
+        self.btn_clear = widget.QPushButton(self.lang.dev_btn_clear)
+        self.btn_clear.clicked.connect(self.clear)
+        self.btn_json = widget.QPushButton(self.lang.dev_btn_json)
+        self.btn_json.clicked.connect(lambda: self.dump(chrome=False))
+        self.btn_chrome = widget.QPushButton(self.lang.dev_btn_chrome)
+        self.btn_chrome.clicked.connect(lambda: self.dump(chrome=True))
+
+        buttons_layout = widget.QHBoxLayout()
+        buttons_layout.addWidget(self.btn_refresh)
+        buttons_layout.addWidget(self.btn_clear)
+        buttons_layout.addStretch()
+        buttons_layout.addWidget(self.btn_json)
+        buttons_layout.addWidget(self.btn_chrome)
+
+        self.tasks = widget.QTableWidget()
+        self.tasks.setColumnCount(len(self.TASK_HEADERS))
+        self.tasks.setHorizontalHeaderLabels([self.lang.get(f"dev_hdr_{x}") for x in self.TASK_HEADERS])
+        self.tasks.horizontalHeader().setStretchLastSection(True)
+        self.tasks.setEditTriggers(widget.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.tasks.setSelectionBehavior(widget.QAbstractItemView.SelectionBehavior.SelectRows)
+        self.tasks.setWordWrap(False)
+
+        self.statements_order = widget.QComboBox()
+        self.statements_order.addItems([self.lang.get(f"dev_order_{x}") for x in self.STATEMENT_ORDERS])
+        self.statements_order.currentIndexChanged.connect(self.refresh_statements)
+
+        self.statements = widget.QTableWidget()
+        self.statements.setColumnCount(len(self.STATEMENT_HEADERS))
+        self.statements.setHorizontalHeaderLabels([self.lang.get(f"dev_hdr_{x}") for x in self.STATEMENT_HEADERS])
+        self.statements.horizontalHeader().setSectionResizeMode(0, widget.QHeaderView.ResizeMode.Stretch)
+        self.statements.setEditTriggers(widget.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.statements.setSelectionBehavior(widget.QAbstractItemView.SelectionBehavior.SelectRows)
+        self.statements.setWordWrap(False)
+
+        statements_layout = widget.QVBoxLayout()
+        statements_layout.addWidget(self.statements_order, alignment=core.Qt.AlignmentFlag.AlignLeft)
+        statements_layout.addWidget(self.statements)
+        statements_layout.setContentsMargins(0, 0, 0, 0)
+        statements_tab = widget.QWidget()
+        statements_tab.setLayout(statements_layout)
+
+        self.tabs = widget.QTabWidget()
+        self.tabs.addTab(self.tasks, self.lang.dev_tab_tasks)
+        self.tabs.addTab(statements_tab, self.lang.dev_tab_statements)
+
+        self.statusbar = widget.QLabel()
+
+        self.refresh_timer = core.QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(self.REFRESH_DELAY)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+        layout = widget.QVBoxLayout()
+        layout.addLayout(buttons_layout)
+        layout.addWidget(self.tabs)
+        layout.addWidget(self.statusbar)
+        self.setLayout(layout)
+
+    def show(self):
+        super().show()
+        self.raise_()
+        self.refresh()
+
+    @property
+    def profiler(self) -> "StatementProfiler | None":
+        interface = self.daddy.interface
+        return interface.statements if interface is not None and interface.connected else None
+
+    def schedule_refresh(self):
+        """
+        Refresh panel soon: tasks finished before that are shown by one refresh.
+        """
+        if self.isVisible() and not self.refresh_timer.isActive():
+            self.refresh_timer.start()
+
+    def refresh(self):
+        self.refresh_timer.stop()
+        self.refresh_tasks()
+        self.refresh_statements()
+
+    def refresh_tasks(self):
+        traces = self.tracer.snapshot()[::-1]  # the most recent go first
+        self.tasks.setRowCount(0)
+        self.tasks.setRowCount(len(traces))
+
+        align_right = core.Qt.AlignmentFlag.AlignRight | core.Qt.AlignmentFlag.AlignVCenter
+        for idx, trace in enumerate(traces):
+            values = (
+                trace.name,
+                _ms(trace.wait),
+                _ms(trace.execution),
+                _ms(trace.rendering),
+                "" if trace.rows is None else str(trace.rows),
+                "" if trace.bytes is None else str(trace.bytes),
+                trace.error or "",
+            )
+            for col, value in enumerate(values):
+                item = widget.QTableWidgetItem(value)
+                if 0 < col < len(values) - 1:
+                    item.setTextAlignment(align_right)
+                if trace.error:
+                    item.setForeground(gui.QBrush(gui.QColor("red")))
+                    item.setToolTip(trace.traceback or trace.error)
+                self.tasks.setItem(idx, col, item)
+        self.tasks.resizeColumnsToContents()
+
+        total = {
+            name: sum(getattr(trace, name) or 0 for trace in traces) for name in ("wait", "execution", "rendering")
+        }
+        self.statusbar.setText(
+            self.lang.dev_status_total.format(
+                count=len(traces), **{name: value * 1000 for name, value in total.items()}
+            )
+        )
+
+    def refresh_statements(self, *_):
+        profiler = self.profiler
+        order = self.STATEMENT_ORDERS[self.statements_order.currentIndex()]
+        top = profiler.top(self.TOP_STATEMENTS, by=order) if profiler else []
+
+        self.statements.setRowCount(0)
+        self.statements.setRowCount(len(top))
+        align_right = core.Qt.AlignmentFlag.AlignRight | core.Qt.AlignmentFlag.AlignVCenter
+        for idx, stats in enumerate(top):
+            values = (
+                stats.shape,
+                str(stats.count),
+                _ms(stats.total),
+                _ms(stats.average),
+                _ms(stats.max),
+                str(stats.rows),
+            )
+            for col, value in enumerate(values):
+                item = widget.QTableWidgetItem(value)
+                if col:
+                    item.setTextAlignment(align_right)
+                else:
+                    item.setToolTip(value)
+                self.statements.setItem(idx, col, item)
+        for col in range(1, len(self.STATEMENT_HEADERS)):
+            self.statements.resizeColumnToContents(col)
+
+    def clear(self):
+        self.tracer.clear()
+        if profiler := self.profiler:
+            profiler.clear()
+        self.refresh()
+
+    def dump(self, chrome: bool = False):
+        path, _ = widget.QFileDialog.getSaveFileName(
+            self, self.lang.dev_btn_chrome if chrome else self.lang.dev_btn_json, "", "JSON (*.json)"
+        )
+        if path:
+            self.tracer.dump(path, chrome=chrome)
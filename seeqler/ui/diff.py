@@ -0,0 +1,370 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from typing import TYPE_CHECKING
+
+import sqlalchemy as sa
+from PyQt6 import QtCore as core
+from PyQt6 import QtGui as gui
+from PyQt6 import QtWidgets as widget
+
+from ..common.connection_manager import Connection, ConnectionManager
+from ..common.language import Language
+from ..common.storage import Storage
+from ..sql.diff import (
+    DIFF_SAMPLE,
+    SchemaDiff,
+    TableDiff,
+    TableSnapshot,
+    diff_schemas,
+    diff_tables,
+    snapshot_schema,
+)
+from ..sql.interface import EngineRegistry
+
+if TYPE_CHECKING:
+    from ..sql.interface import Interface
+    from .schema import SchemaWindow
+
+
+KIND_COLORS = {"added": "darkgreen", "removed": "red", "changed": "darkorange"}
+
+
+def fill_connections(box: widget.QComboBox, current: Connection) -> None:
+    """
+    Fill combobox with connections to compare with, the current connection goes first.
+    """
+    box.clear()
+    box.addItem(Language().diff_item_current.format(label=current.label), current)
+    for connection in ConnectionManager():
+        if connection.connection_string != current.connection_string:
+            box.addItem(connection.label, connection)
+
+
+def load_snapshot(interface: "Interface", connection: Connection, schema: str | None) -> dict[str, TableSnapshot]:
+    """
+    Get snapshots of tables of schema. Snapshots are saved to application database and reused while database reports
+    the same schema version (see ``BaseSQL.schema_version``), so schema is introspected only after it is changed.
+    """
+    version, key = interface.schema_version(schema), f"schema:{schema}"
+    saved = Storage().get_cached(connection.connection_string, key)
+    if version is not None and saved is not None:
+        if saved[0] == version:
+            return saved[1]
+        interface.metadata.invalidate(schema)  # metadata in memory may be outdated as well
+
+    snapshot = snapshot_schema(interface, schema)
+    if version is not None:
+        Storage().set_cached(connection.connection_string, key, (version, snapshot))
+    return snapshot
+
+
+class TableDiffWindow(widget.QWidget):
+    """
+    Comparison of table of the current connection with table of another connection (or with another table of the
+    current one).
+    """
+
+    HEADERS = ("kind", "key", "columns")
+
+    def __init__(self, parent: "SchemaWindow"):
+        super().__init__()
+        from .schema import TaskQueue  # schema window module imports this one
+
+        self.daddy = parent
+        self.lang = Language()
+        self.cancel = None
+        # comparison may take long, so it does not hold tasks of schema window
+        self.tasks = TaskQueue(parent)
+
+        self.setWindowTitle(self.lang.diff_win_title)
+        self.resize(core.QSize(800, 450))
+
+        self.table = widget.QComboBox()
+        self.table.setEditable(True)
+        self.connection = widget.QComboBox()
+        self.other_table = widget.QLineEdit()
+        self.other_table.setPlaceholderText(self.lang.diff_inp_same_table)
+
+        self.btn_compare = widget.QPushButton(self.lang.diff_btn_compare)
+        self.btn_compare.clicked.connect(self.compare)
+        self.btn_stop = widget.QPushButton(self.lang.diff_btn_stop)
+        self.btn_stop.clicked.connect(self.stop)
+        self.btn_stop.setDisabled(True)
+
+        input_layout = widget.QHBoxLayout()
+        input_layout.addWidget(self.table, 2)
+        input_layout.addWidget(widget.QLabel(self.lang.diff_lbl_with))
+        input_layout.addWidget(self.connection, 2)
+        input_layout.addWidget(self.other_table, 2)
+        input_layout.addWidget(self.btn_compare)
+        input_layout.addWidget(self.btn_stop)
+
+        self.results = widget.QTableWidget()
+        self.results.setColumnCount(len(self.HEADERS))
+        self.results.setHorizontalHeaderLabels([self.lang.get(f"diff_hdr_{x}") for x in self.HEADERS])
+        self.results.horizontalHeader().setStretchLastSection(True)
+        self.results.setEditTriggers(widget.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.results.setSelectionBehavior(widget.QAbstractItemView.SelectionBehavior.SelectRows)
+        self.results.setWordWrap(False)
+
+        self.statusbar = widget.QLabel()
+        self.statusbar.setWordWrap(True)
+
+        layout = widget.QVBoxLayout()
+        layout.addLayout(input_layout)
+        layout.addWidget(self.results)
+        layout.addWidget(self.statusbar)
+        self.setLayout(layout)
+
+    def show(self, table: str | None = None):
+        self.table.clear()
+        self.table.addItems(getattr(self.daddy, "result_table_names", []))
+        if table:
+            self.table.setCurrentText(table)
+
+        fill_connections(self.connection, self.daddy.connection)
+
+        super().show()
+        self.raise_()
+
+    def compare(self):
+        table = self.table.currentText()
+        if not table or self.cancel is not None:
+            return
+
+        connection: Connection = self.connection.currentData()
+        other_table = self.other_table.text() or table
+        same = connection.connection_string == self.daddy.connection.connection_string
+        if same and other_table == table:
+            return
+
+        schema = self.daddy.params_get_schema()
+        # windows of the other connection would share its engine as well, engine of schema window is kept until
+        # comparison is finished even if the window is closed
+        left, right = EngineRegistry().acquire(self.daddy.connection), EngineRegistry().acquire(connection)
+        cancel = self.cancel = Event()
+
+        def method(signal):
+            try:
+                right.connect(connection)
+                return diff_tables(
+                    left, right, table, other_table, schema, schema if same else None, cancel=cancel, signal=signal
+                )
+            except (ValueError, sa.exc.SQLAlchemyError) as e:
+                return str(e)
+
+        self.results.setRowCount(0)
+        self.btn_compare.setDisabled(True)
+        self.btn_stop.setEnabled(True)
+        self.statusbar.setText(self.lang.diff_status_started)
+
+        self.tasks.run_parallel_task(
+            method,
+            progress=self.compare_progress,
+            at_end=self.compare_after,
+            at_error=self.compare_failed,
+            extra_data={"connections": (self.daddy.connection, connection)},
+        )
+
+    @core.pyqtSlot(object)
+    def compare_progress(self, data: dict):
+        self.statusbar.setText(self.lang.diff_status_progress.format(**data))
+
+    def compare_finished(self, data: dict):
+        # engines are released and window is ready for the next comparison in any case
+        for connection in data["connections"]:
+            EngineRegistry().release(connection)
+        self.cancel = None
+        self.btn_compare.setEnabled(True)
+        self.btn_stop.setDisabled(True)
+
+    @core.pyqtSlot(object)
+    def compare_failed(self, data: dict):
+        self.compare_finished(data)
+        self.statusbar.setText(self.lang.diff_status_error.format(error=data["error"]))
+
+    @core.pyqtSlot(object)
+    def compare_after(self, data: dict):
+        self.compare_finished(data)
+
+        result: TableDiff | str = data["data"]
+        if isinstance(result, str):
+            self.statusbar.setText(self.lang.diff_status_error.format(error=result))
+            return
+        self.fill_results(result)
+
+    def fill_results(self, result: TableDiff):
+        self.results.setRowCount(len(result.rows))
+        for row, diff in enumerate(result.rows):
+            kind = widget.QTableWidgetItem(self.lang.get(f"diff_kind_{diff.kind}"))
+            kind.setForeground(gui.QBrush(gui.QColor(KIND_COLORS[diff.kind])))
+            key = widget.QTableWidgetItem(", ".join(f"{name}={value}" for name, value in zip(result.key, diff.key)))
+            columns = widget.QTableWidgetItem(", ".join(diff.columns))
+            for col, item in enumerate((kind, key, columns)):
+                self.results.setItem(row, col, item)
+        self.results.resizeColumnToContents(0)
+        self.results.resizeColumnToContents(1)
+
+        text = self.lang.diff_status_done.format(
+            rows=result.checked,
+            added=result.added,
+            removed=result.removed,
+            changed=result.changed,
+            skipped=result.skipped,
+            segments=result.segments,
+        )
+        if result.identical:
+            text = f"{self.lang.diff_status_identical}\n{text}"
+        if result.only_left or result.only_right:
+            text += "\n" + self.lang.diff_status_columns.format(
+                left=", ".join(result.only_left) or "—", right=", ".join(result.only_right) or "—"
+            )
+        if max(result.added, result.removed, result.changed) > DIFF_SAMPLE:
+            text += "\n" + self.lang.diff_status_sample.format(count=DIFF_SAMPLE)
+        if result.cancelled:
+            text += "\n" + self.lang.diff_status_cancelled
+        self.statusbar.setText(text)
+
+    def stop(self):
+        if self.cancel is not None:
+            self.cancel.set()
+
+    def closeEvent(self, event):
+        self.stop()
+        super().closeEvent(event)
+
+
+class SchemaDiffWindow(widget.QWidget):
+    """
+    Comparison of schema of the current connection with schema of another connection: missing tables, column
+    definitions, keys and indexes.
+    """
+
+    HEADERS = ("table", "kind", "name", "left", "right")
+
+    def __init__(self, parent: "SchemaWindow"):
+        super().__init__()
+        from .schema import TaskQueue  # schema window module imports this one
+
+        self.daddy = parent
+        self.lang = Language()
+        self.running = False
+        # comparison may take long, so it does not hold tasks of schema window
+        self.tasks = TaskQueue(parent)
+
+        self.setWindowTitle(self.lang.diff_win_title_schema)
+        self.resize(core.QSize(900, 500))
+
+        self.connection = widget.QComboBox()
+        self.other_schema = widget.QLineEdit()
+        self.other_schema.setPlaceholderText(self.lang.diff_inp_default_schema)
+
+        self.btn_compare = widget.QPushButton(self.lang.diff_btn_compare)
+        self.btn_compare.clicked.connect(self.compare)
+
+        input_layout = widget.QHBoxLayout()
+        input_layout.addWidget(widget.QLabel(self.lang.diff_lbl_schema_with))
+        input_layout.addWidget(self.connection, 2)
+        input_layout.addWidget(self.other_schema, 1)
+        input_layout.addWidget(self.btn_compare)
+
+        self.results = widget.QTableWidget()
+        self.results.setColumnCount(len(self.HEADERS))
+        self.results.setHorizontalHeaderLabels([self.lang.get(f"diff_hdr_schema_{x}") for x in self.HEADERS])
+        self.results.horizontalHeader().setStretchLastSection(True)
+        self.results.setEditTriggers(widget.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.results.setSelectionBehavior(widget.QAbstractItemView.SelectionBehavior.SelectRows)
+        self.results.setWordWrap(False)
+        self.results.doubleClicked.connect(self.open_table)
+
+        self.statusbar = widget.QLabel()
+
+        layout = widget.QVBoxLayout()
+        layout.addLayout(input_layout)
+        layout.addWidget(self.results)
+        layout.addWidget(self.statusbar)
+        self.setLayout(layout)
+
+    def show(self):
+        fill_connections(self.connection, self.daddy.connection)
+        super().show()
+        self.raise_()
+
+    def compare(self):
+        if self.running:
+            return
+
+        connection, left_connection = self.connection.currentData(), self.daddy.connection
+        schema, other_schema = self.daddy.params_get_schema(), self.other_schema.text() or None
+        left, right = EngineRegistry().acquire(left_connection), EngineRegistry().acquire(connection)
+
+        def method():
+            try:
+                right.connect(connection)
+                # both schemas are introspected at once
+                with ThreadPoolExecutor(max_workers=2) as pool:
+                    first = pool.submit(load_snapshot, left, left_connection, schema)
+                    second = pool.submit(load_snapshot, right, connection, other_schema)
+                    return diff_schemas(first.result(), second.result())
+            except sa.exc.SQLAlchemyError as e:
+                return str(e)
+
+        self.running = True
+        self.results.setRowCount(0)
+        self.btn_compare.setDisabled(True)
+        self.statusbar.setText(self.lang.diff_status_started)
+
+        self.tasks.run_parallel_task(
+            method,
+            at_end=self.compare_after,
+            at_error=self.compare_failed,
+            extra_data={"connections": (left_connection, connection)},
+        )
+
+    def compare_finished(self, data: dict):
+        # engines are released and window is ready for the next comparison in any case
+        for connection in data["connections"]:
+            EngineRegistry().release(connection)
+        self.running = False
+        self.btn_compare.setEnabled(True)
+
+    @core.pyqtSlot(object)
+    def compare_failed(self, data: dict):
+        self.compare_finished(data)
+        self.statusbar.setText(self.lang.diff_status_error.format(error=data["error"]))
+
+    @core.pyqtSlot(object)
+    def compare_after(self, data: dict):
+        self.compare_finished(data)
+
+        result: SchemaDiff | str = data["data"]
+        if isinstance(result, str):
+            self.statusbar.setText(self.lang.diff_status_error.format(error=result))
+            return
+        self.fill_results(result)
+
+    def fill_results(self, result: SchemaDiff):
+        exists = self.lang.diff_val_exists
+        rows = [(table, "table", "", exists, None) for table in result.only_left]
+        rows += [(table, "table", "", None, exists) for table in result.only_right]
+        rows += [(x.table, x.kind, x.name, x.left, x.right) for x in result.changes]
+
+        self.results.setRowCount(len(rows))
+        for row, (table, kind, name, left, right) in enumerate(rows):
+            values = (table, self.lang.get(f"diff_kind_{kind}"), name, left or "—", right or "—")
+            for col, value in enumerate(values):
+                self.results.setItem(row, col, widget.QTableWidgetItem(value))
+        for col in range(len(self.HEADERS) - 1):
+            self.results.resizeColumnToContents(col)
+
+        text = self.lang.diff_status_schema.format(
+            tables=result.tables, left=len(result.only_left), right=len(result.only_right), changes=len(result.changes)
+        )
+        if result.identical:
+            text = f"{self.lang.diff_status_schema_identical}\n{text}"
+        self.statusbar.setText(text)
+
+    def open_table(self, idx: core.QModelIndex):
+        table = self.results.item(idx.row(), 0).text()
+        if table in getattr(self.daddy, "result_table_names", []):
+            self.daddy.open_table(table)
@@ -0,0 +1,289 @@
+import datetime
+import decimal
+import hashlib
+import json
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Sequence
+
+import sqlalchemy as sa
+from PyQt6 import QtCore as core
+
+from ..common.language import Language
+from ..sql.result import (
+    Column,
+    ColumnarResult,
+    DictionaryColumn,
+    NumberColumn,
+    StringColumn,
+)
+
+__all__ = ("FormattedPage", "PageCache", "column_kind", "format_page", "storage_kind")
+
+
+PREVIEW_LENGTH = 256  # characters (bytes) of large values shown in cells
+PAGE_CACHE_SIZE = 8  # formatted pages kept by tab
+
+ALIGN_RIGHT = core.Qt.AlignmentFlag.AlignRight | core.Qt.AlignmentFlag.AlignVCenter
+ALIGNMENTS = {"integer": ALIGN_RIGHT, "number": ALIGN_RIGHT}
+
+
+def column_kind(type_: sa.types.TypeEngine) -> str:
+    """
+    Get kind of formatter for column type reported by inspector.
+    """
+    match type_:
+        case sa.types.Boolean():
+            return "boolean"
+        case sa.types.Integer():
+            return "integer"
+        case sa.types.Numeric():  # Float is Numeric too
+            return "number"
+        case sa.types.Date() | sa.types.DateTime() | sa.types.Time():
+            return "datetime"
+        case sa.types.JSON():
+            return "json"
+        case sa.types._Binary():
+            return "binary"
+        case sa.types.NullType():
+            return "auto"  # untyped column, e.g. SQLite one without declared type
+    return "text"
+
+
+def storage_kind(column: Column | Sequence[Any]) -> str:
+    """
+    Get kind of formatter for column without known type by its values.
+    """
+    match column:
+        case NumberColumn() if column.values.typecode == "q":
+            return "integer"
+        case NumberColumn():
+            return "number"
+        case StringColumn() | DictionaryColumn():
+            return "text"
+    # mixed or special values: the first of them tells
+    return _value_kind(next((x for x in column if x is not None), None))
+
+
+def _value_kind(value: Any) -> str:
+    match value:
+        case bool():
+            return "boolean"
+        case int():
+            return "integer"
+        case float() | decimal.Decimal():
+            return "number"
+        case datetime.date() | datetime.time():
+            return "datetime"
+        case dict() | list():
+            return "json"
+        case bytes() | bytearray() | memoryview():
+            return "binary"
+    return "text"
+
+
+# region formatters
+# every formatter gets value and length of the whole value (if database has cut it) and returns text and cut flag;
+# values not matching column type (SQLite does not enforce types) are formatted as text
+
+
+def _text(value: Any, length: int | None, locale: core.QLocale) -> tuple[str, bool]:
+    match value:
+        case str() if (length or len(value)) > PREVIEW_LENGTH:
+            return value[:PREVIEW_LENGTH] + "…", True
+        case str() | None:
+            return str(value), False
+    if (kind := _value_kind(value)) != "text":
+        return FORMATTERS[kind](value, length, locale)
+    return str(value), False
+
+
+def _integer(value: Any, length: int | None, locale: core.QLocale) -> tuple[str, bool]:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return locale.toString(value) if -(2**63) <= value < 2**63 else str(value), False
+    return _text(value, length, locale)
+
+
+def _number(value: Any, length: int | None, locale: core.QLocale) -> tuple[str, bool]:
+    match value:
+        case float():
+            return locale.toString(value, "g", core.QLocale.FloatingPointPrecisionOption.FloatingPointShortest), False
+        case decimal.Decimal():
+            return str(value).replace(".", locale.decimalPoint()), False
+    return _integer(value, length, locale)
+
+
+def _datetime(value: Any, length: int | None, locale: core.QLocale) -> tuple[str, bool]:
+    match value:
+        case datetime.datetime():
+            return value.isoformat(sep=" "), False
+        case datetime.date() | datetime.time():
+            return value.isoformat(), False
+    return _text(value, length, locale)
+
+
+def _json(value: Any, length: int | None, locale: core.QLocale) -> tuple[str, bool]:
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    return _text(value, length, locale)
+
+
+def _binary(value: Any, length: int | None, locale: core.QLocale) -> tuple[str, bool]:
+    if not isinstance(value, (bytes, bytearray, memoryview)):
+        return _text(value, length, locale)
+    # hex preview of the beginning of value, the rest is not copied
+    cut = (length or len(value)) > PREVIEW_LENGTH // 2
+    text = bytes(memoryview(value)[: PREVIEW_LENGTH // 2]).hex(" ")
+    return (text + " …", True) if cut else (text, False)
+
+
+def _boolean(value: Any, length: int | None, locale: core.QLocale) -> tuple[str, bool]:
+    if isinstance(value, bool):
+        return str(value).lower(), False
+    return _integer(value, length, locale)  # SQLite keeps booleans as 0 and 1
+
+
+FORMATTERS: dict[str, Callable[[Any, int | None, core.QLocale], tuple[str, bool]]] = {
+    "text": _text,
+    "integer": _integer,
+    "number": _number,
+    "datetime": _datetime,
+    "json": _json,
+    "binary": _binary,
+    "boolean": _boolean,
+}
+
+# endregion
+
+
+@dataclass
+class FormattedPage:
+    """
+    Texts of page cells prepared by worker thread.
+    """
+
+    texts: list[list[str]]  # by columns
+    cut: set[tuple[int, int]]  # (row, column) of values shown partially
+    alignments: list["core.Qt.AlignmentFlag | None"]
+    keys: list[tuple] = field(default_factory=list)  # row keys of rows (hidden columns of page)
+    fingerprint: bytes = b""
+    size: int = 0  # estimated memory taken by texts
+
+    @property
+    def rows(self) -> int:
+        return len(self.texts[0]) if self.texts else 0
+
+
+def fingerprint(contents: ColumnarResult | Sequence[Sequence[Any]]) -> bytes:
+    """
+    Get hash of page data: it is much cheaper than formatting, so formatted page is reused while data is the same.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if not isinstance(contents, ColumnarResult):
+        digest.update(repr(list(contents)).encode())
+        return digest.digest()
+
+    for column in contents.data:
+        digest.update(type(column).__name__.encode())
+        match column:
+            case NumberColumn():
+                digest.update(column.values)
+                digest.update(column.nulls or b"")
+            case StringColumn():
+                digest.update(column.data)
+                digest.update(column.offsets)
+                digest.update(column.nulls or b"")
+            case DictionaryColumn():
+                digest.update(column.codes)
+                digest.update(repr(column.values).encode())
+            case _:
+                digest.update(repr(column.values).encode())
+    return digest.digest()
+
+
+def format_page(
+    contents: ColumnarResult | Sequence[Sequence[Any]], kinds: list[str], previews: list[int]
+) -> FormattedPage:
+    """
+    Format page cells. Columns of ``contents`` after ``len(kinds)`` are hidden: lengths of whole values of
+    ``previews`` columns (which database has cut) and then row key.
+
+    Args:
+        contents: page rows
+        kinds: formatter kinds of shown columns
+        previews: indexes of columns cut by database
+
+    Returns:
+        FormattedPage: texts of cells
+    """
+    locale = core.QLocale(Language().lang.replace("-", "_"))
+    locale.setNumberOptions(core.QLocale.NumberOption.OmitGroupSeparator)
+
+    columns = list(contents.data if isinstance(contents, ColumnarResult) else zip(*contents))
+    columns, hidden = columns[: len(kinds)], columns[len(kinds) :]
+    lengths = dict(zip(previews, hidden)) if hidden else {}
+
+    # untyped columns are formatted by their values
+    kinds = [storage_kind(column) if kind == "auto" else kind for column, kind in zip(columns, kinds)]
+    page = FormattedPage([], set(), [ALIGNMENTS.get(kind) for kind in kinds])
+    page.keys = list(zip(*hidden[len(lengths) :])) if hidden else []
+    for col, (values, kind) in enumerate(zip(columns, kinds)):
+        formatter, column_lengths = FORMATTERS.get(kind, _text), lengths.get(col)
+        texts = []
+        for row, value in enumerate(values):
+            text, is_cut = formatter(value, column_lengths[row] if column_lengths is not None else None, locale)
+            texts.append(text)
+            if is_cut:
+                page.cut.add((row, col))
+        page.texts.append(texts)
+        page.size += sys.getsizeof(texts) + sum(map(sys.getsizeof, texts))
+    return page
+
+
+class PageCache:
+    """
+    Formatted pages of tab by page key (the most recent ones only). Page is reused only if its data has not changed,
+    which is checked by fingerprint. It is used by worker threads, so it is guarded by lock.
+    """
+
+    def __init__(self, size: int = PAGE_CACHE_SIZE):
+        self.size = size
+        self.pages: OrderedDict[Any, FormattedPage] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def format(
+        self, key: Any, contents: ColumnarResult | Sequence[Sequence[Any]], kinds: list[str], previews: list[int]
+    ) -> FormattedPage:
+        """
+        Get formatted page from cache or format it, see ``format_page``.
+        """
+        key = (key, tuple(kinds), tuple(previews))
+        hashed = fingerprint(contents)
+        with self._lock:
+            page = self.pages.get(key)
+            if page is not None and page.fingerprint == hashed:
+                self.pages.move_to_end(key)
+                return page
+
+        page = format_page(contents, kinds, previews)
+        page.fingerprint = hashed
+        with self._lock:
+            self.pages[key] = page
+            while len(self.pages) > self.size:
+                self.pages.popitem(last=False)
+        return page
+
+    def clear(self) -> None:
+        with self._lock:
+            self.pages.clear()
+
+    def holds(self, page: FormattedPage) -> bool:
+        with self._lock:
+            return any(x is page for x in self.pages.values())
+
+    @property
+    def nbytes(self) -> int:
+        with self._lock:
+            return sum(page.size for page in self.pages.values())
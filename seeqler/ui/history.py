@@ -0,0 +1,131 @@
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from PyQt6 import QtCore as core
+from PyQt6 import QtGui as gui
+from PyQt6 import QtWidgets as widget
+
+from ..common.history import HistoryEntry, QueryHistory
+from ..common.language import Language
+
+if TYPE_CHECKING:
+    from .schema import SchemaWindow
+
+
+class HistoryWindow(widget.QWidget):
+    """
+    Statements executed over the current connection with their timings.
+    """
+
+    HEADERS = ("statement", "started", "duration", "rows")
+
+    def __init__(self, parent: "SchemaWindow"):
+        super().__init__()
+
+        self.daddy = parent
+        self.lang = Language()
+        self.history = QueryHistory()
+        self.entries: list[HistoryEntry] = []
+
+        self.setWindowTitle(self.lang.hist_win_title)
+        self.resize(core.QSize(800, 450))
+
+        self.input = widget.QLineEdit()
+        self.input.setPlaceholderText(self.lang.hist_inp_placeholder)
+        self.input.textChanged.connect(self.search)
+        self.input.returnPressed.connect(self.run_selected)
+
+        self.btn_run = widget.QPushButton(self.lang.hist_btn_run)
+        self.btn_run.clicked.connect(self.run_selected)
+        self.btn_clear = widget.QPushButton(self.lang.hist_btn_clear)
+        self.btn_clear.clicked.connect(self.clear_history)
+
+        input_layout = widget.QHBoxLayout()
+        input_layout.addWidget(self.input)
+        input_layout.addWidget(self.btn_run)
+        input_layout.addWidget(self.btn_clear)
+
+        self.results = widget.QTableWidget()
+        self.results.setColumnCount(len(self.HEADERS))
+        self.results.setHorizontalHeaderLabels([self.lang.get(f"hist_hdr_{x}") for x in self.HEADERS])
+        self.results.horizontalHeader().setSectionResizeMode(0, widget.QHeaderView.ResizeMode.Stretch)
+        self.results.setEditTriggers(widget.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.results.setSelectionBehavior(widget.QAbstractItemView.SelectionBehavior.SelectRows)
+        self.results.setSelectionMode(widget.QAbstractItemView.SelectionMode.SingleSelection)
+        self.results.setWordWrap(False)
+        self.results.doubleClicked.connect(self.run_selected)
+
+        self.statusbar = widget.QLabel()
+
+        layout = widget.QVBoxLayout()
+        layout.addLayout(input_layout)
+        layout.addWidget(self.results)
+        layout.addWidget(self.statusbar)
+        self.setLayout(layout)
+
+    def show(self):
+        super().show()
+        self.raise_()
+        self.input.setFocus()
+        self.search()
+
+    @property
+    def connection(self) -> str:
+        return self.daddy.connection.connection_string
+
+    def search(self, *_):
+        # history is kept in local database and only recent statements are searched in, so it is fast enough for UI
+        self.entries = self.history.search(self.input.text(), self.connection)
+        self.results.setRowCount(0)
+        self.results.setRowCount(len(self.entries))
+
+        for idx, entry in enumerate(self.entries):
+            statement = widget.QTableWidgetItem(" ".join(entry.statement.split()))
+            statement.setToolTip(entry.statement)
+            started = widget.QTableWidgetItem(datetime.fromtimestamp(entry.started_at).strftime("%Y-%m-%d %H:%M:%S"))
+            duration = widget.QTableWidgetItem("" if entry.duration is None else f"{entry.duration * 1000:.1f} ms")
+            duration.setTextAlignment(core.Qt.AlignmentFlag.AlignRight | core.Qt.AlignmentFlag.AlignVCenter)
+            duration.setToolTip(self.timings_tip(entry))
+            if entry.error is not None:
+                rows = widget.QTableWidgetItem(self.lang.hist_status_error)
+                rows.setToolTip(entry.error)
+                rows.setForeground(gui.QBrush(gui.QColor("red")))
+            else:
+                rows = widget.QTableWidgetItem("" if entry.row_count is None else str(entry.row_count))
+            if entry.slow:
+                duration.setForeground(gui.QBrush(gui.QColor("darkorange")))
+
+            for col, item in enumerate((statement, started, duration, rows)):
+                self.results.setItem(idx, col, item)
+
+        self.results.resizeColumnToContents(1)
+        self.results.resizeColumnToContents(2)
+        if self.entries:
+            self.results.selectRow(0)
+        self.statusbar.setText(self.lang.hist_status_found.format(count=len(self.entries)))
+
+    def timings_tip(self, entry: HistoryEntry) -> str:
+        if entry.stats is None:
+            return ""
+
+        text = self.lang.hist_tip_timings.format(
+            runs=entry.stats.runs,
+            min=entry.stats.min * 1000,
+            median=entry.stats.median * 1000,
+            max=entry.stats.max * 1000,
+        )
+        if entry.slow:
+            text = f"{self.lang.hist_tip_slow}\n{text}"
+        return text
+
+    def run_selected(self, *_):
+        rows = self.results.selectionModel().selectedRows()
+        if not rows or rows[0].row() >= len(self.entries):
+            return
+        self.daddy.open_raw_tab(self.entries[rows[0].row()].statement, execute=True)
+
+    def clear_history(self):
+        answer = widget.QMessageBox.question(self, self.lang.hist_win_title, self.lang.hist_msg_clear)
+        if answer == widget.QMessageBox.StandardButton.Yes:
+            self.history.clear(self.connection)
+            self.search()
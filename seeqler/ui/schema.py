@@ -1,21 +1,45 @@
+import re
+import threading
+import time
+import traceback
+from collections import deque
+from functools import partial
 from inspect import signature
+from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable, Iterable
 
+import sqlalchemy as sa
 from PyQt6 import QtCore as core
 from PyQt6 import QtGui as gui
 from PyQt6 import QtWidgets as widget
 
+from ..common.history import QueryHistory
 from ..common.language import Language
+from ..common.memory import MemoryBudget
+from ..common.storage import Storage
+from ..common.tracing import TaskTrace, Tracer, measure_result, task_name
+from ..common.types import SingletonMeta
 from ..settings import Settings
-from ..sql.interface import Interface
+from ..sql.base import quote_table
+from ..sql.interface import EngineRegistry
+from ..sql.profiling import profile_table
+from ..sql.snapshot import ResultSnapshot, materialize
 from .custom import SeeqlerTab
+from .devpanel import DevPanel
+from .diff import SchemaDiffWindow, TableDiffWindow
+from .history import HistoryWindow
+from .search import SearchWindow
 from .utils import clear_layout
 
 if TYPE_CHECKING:
     from ..common.connection_manager import Connection
+    from ..sql.result import ColumnarResult
+    from .formatting import FormattedPage
 
 
 BTN_AT_RIGHT = widget.QTabBar.ButtonPosition.RightSide
+PROFILE_CACHE_TIME = 24 * 60 * 60  # seconds to keep table profiles in application database
+MIN_WORKERS = 2  # threads of background tasks of all the windows
 
 
 class ConnStates:
@@ -32,7 +56,7 @@ class Retriever(core.QObject):
     started = core.pyqtSignal()
     finished = core.pyqtSignal(object)
     progress = core.pyqtSignal(object)
-    # TODO: signal to emit after exception raised
+    error = core.pyqtSignal(object)
 
     def __init__(
         self,
@@ -40,6 +64,7 @@ class Retriever(core.QObject):
         mth_args: Iterable | None = None,
         mth_kwargs: dict | None = None,
         extra_data: dict | None = None,
+        trace: TaskTrace | None = None,
         *args,
         **kwargs,
     ):
@@ -51,11 +76,16 @@ class Retriever(core.QObject):
         Method can have ``signal`` argument — it can be used to emit ``progress`` signal to show some data while
         main task is still executing.
 
+        If method raises an exception, ``error`` signal is emitted instead of ``finished`` one with copy of
+        ``extra_data``, the exception as "error" key and its formatted traceback as "traceback" key (it is saved to
+        trace too).
+
         Args:
             method: method to run
             mth_args: positional arguments
             mth_kwargs: keyword arguments
             extra_data: dict of extra data to pass to finished signal
+            trace: trace to save execution time, size of result and error to
         """
         super().__init__(*args, **kwargs)
 
@@ -63,18 +93,30 @@ class Retriever(core.QObject):
         self.method_args = mth_args or list()
         self.method_kwargs = mth_kwargs or dict()
         self.extra_data = extra_data
+        self.trace = trace or TaskTrace(-1, task_name(method), time.perf_counter())
 
     def run(self) -> None:
         """
         Run method from worker.
         """
         self.started.emit()
+        self.trace.started_at, self.trace.thread = time.perf_counter(), threading.get_ident()
 
-        # check if method accepts "signal" argument
-        if "signal" in signature(self.method).parameters:
-            data = self.method(*self.method_args, **self.method_kwargs, signal=self.progress)
-        else:
-            data = self.method(*self.method_args, **self.method_kwargs)
+        try:
+            # check if method accepts "signal" argument
+            if "signal" in signature(self.method).parameters:
+                data = self.method(*self.method_args, **self.method_kwargs, signal=self.progress)
+            else:
+                data = self.method(*self.method_args, **self.method_kwargs)
+        except Exception as e:
+            self.trace.finished_at = time.perf_counter()
+            self.trace.error = f"{type(e).__name__}: {e}"
+            self.trace.traceback = traceback.format_exc()
+            self.error.emit((self.extra_data or {}) | {"error": e, "traceback": self.trace.traceback})
+            return
+
+        self.trace.finished_at = time.perf_counter()
+        self.trace.rows, self.trace.bytes = measure_result(data)
 
         if self.extra_data:
             data = self.extra_data | {"data": data}
@@ -82,12 +124,207 @@ class Retriever(core.QObject):
         self.finished.emit(data)
 
 
-class SchemaWindow(widget.QWidget):
-    _state = ConnStates.DISCONNECTED
-    _query, _executing_query = [], False
-    _raw_sql_counter = -1
-    to_clean = []
+class WorkerPool(metaclass=SingletonMeta):
+    """
+    Threads of background tasks shared by all the windows. Every window runs its own tasks one by one (see
+    ``TaskQueue``), and the pool limits number of tasks of all the windows running at once.
+    It is used by GUI thread only.
+    """
+
+    def __init__(self, size: int | None = None):
+        self.size = size or max(core.QThread.idealThreadCount(), MIN_WORKERS)
+        self.running = 0
+        self._waiting: deque[Callable[[], None]] = deque()
+
+    def submit(self, start: Callable[[], None]) -> None:
+        """
+        Start task by ``start`` function when there is a free thread.
+        """
+        if self.running < self.size:
+            self.running += 1
+            start()
+        else:
+            self._waiting.append(start)
+
+    def release(self) -> None:
+        """
+        Mark thread of finished task as free: the first waiting task takes it.
+        """
+        if self._waiting:
+            self._waiting.popleft()()
+        else:
+            self.running -= 1
+
+
+class TaskQueue(core.QObject):
+    """
+    Background tasks run one by one, each one at a thread of WorkerPool. Every schema window has its own queue, long
+    tasks (e.g. comparisons of diff windows) have queues of their own as well, so they do not hold tasks of tabs.
+    Failed tasks are reported by warning of the window (see ``run_parallel_task`` to change it).
+    """
+
+    def __init__(self, window: "SchemaWindow"):
+        super().__init__()
+        self.window = window
+        self._query: list[dict] = []
+        self._executing = False
+
+    @property
+    def idle(self) -> bool:
+        return not self._executing and not self._query
+
+    def clear(self) -> None:
+        """
+        Drop tasks waiting in queue, the running one is finished.
+        """
+        self._query.clear()
+
+    def _run_next(self) -> None:
+        """
+        Run next element of task query when the previous one is finished.
+        """
+        if self._executing:
+            return
+
+        try:
+            el = self._query.pop(0)
+        except IndexError:
+            return
+
+        # task waits for a free thread of the pool shared by all the windows
+        self._executing = True
+        WorkerPool().submit(partial(self._start_task, el))
+
+    def _start_task(self, el: dict) -> None:
+        """
+        Run element of task query at new thread.
+        """
+        method, method_args, method_kwargs = el["method"], el.get("args", list()), el.get("kwargs", dict())
+        at_start, progress = el.get("at_start"), el.get("progress")
+        extra_data = el.get("extra_data")
+
+        # create thread and worker, move worker to thread
+        self.thread = core.QThread()
+        self.worker = Retriever(
+            method, mth_args=method_args, mth_kwargs=method_kwargs, extra_data=extra_data, trace=el["trace"]
+        )
+        self.worker.moveToThread(self.thread)
+        self.task = el
+
+        # "at_end" callback is run by task_finished slot to measure time spent on rendering results
+        self.worker.finished.connect(self.task_finished)
+        self.worker.error.connect(self.task_failed)
+
+        # connect Qt-signals to start work and clean up after it
+        self.thread.started.connect(self.worker.run)
+        self.worker.finished.connect(self.thread.quit)
+        self.worker.error.connect(self.thread.quit)
+        # qt deletion
+        self.worker.finished.connect(self.worker.deleteLater)
+        self.worker.error.connect(self.worker.deleteLater)
+        self.thread.finished.connect(self.thread.deleteLater)
+
+        # manual deletion and run next step
+        self.thread.finished.connect(self._clean_up)
+
+        # connect callbacks to signals
+        if at_start:
+            self.worker.started.connect(at_start)
+        if progress:
+            self.worker.progress.connect(progress)
 
+        # start thread and worker
+        self.thread.start()
+
+    def _clean_up(self) -> None:
+        """
+        Delete obsolete threads and workers. Stop executing query and try to execute next element of it.
+        """
+        del self.thread
+        del self.worker
+        del self.task
+        self._executing = False
+        WorkerPool().release()
+        self._run_next()
+
+    @core.pyqtSlot(object)
+    def task_finished(self, data: Any) -> None:
+        if at_end := self.task.get("at_end"):
+            # as Qt does with slots, result is not passed to callback without arguments
+            at_end(data) if signature(at_end).parameters else at_end()
+        self.task["trace"].rendered_at = time.perf_counter()
+
+        if hasattr(self.window, "dev_panel"):
+            self.window.dev_panel.schedule_refresh()
+
+    @core.pyqtSlot(object)
+    def task_failed(self, data: dict) -> None:
+        if hasattr(self.window, "dev_panel"):
+            self.window.dev_panel.schedule_refresh()
+
+        if at_error := self.task.get("at_error"):
+            at_error(data)
+            return
+        widget.QMessageBox.warning(
+            self.window,
+            self.window.lang.sw_task_error_title,
+            self.window.lang.sw_task_error.format(error=data.get("error")),
+        )
+
+    def run_parallel_task(
+        self,
+        method: Callable,
+        method_args: Iterable | None = None,
+        method_kwargs: dict | None = None,
+        *,
+        at_start: Callable | None = None,
+        progress: Callable | None = None,
+        at_end: Callable | None = None,
+        at_error: Callable | None = None,
+        extra_data: dict | None = None,
+    ) -> None:
+        """
+        Adds new element to query of background tasks to run to. All the elements will be executed one by one at new
+        threads using Retriever-class workers.
+
+        If query is executing at the moment, new element will be just pushed to end of it. Otherwise, new element
+        will be run as soon as WorkerPool has a free thread (it is shared with other queues).
+
+        Args:
+            method: function to run
+            method_args: positional arguments to pass to function
+            method_kwargs: keyword arguments to pass to function
+            at_start: function to run when Retriever.started signal is emitted
+            progress: function to run when Retriever.progress signal is emitted
+            at_end: function to run when Retriever.finished signal is emitted
+            at_error: function to run instead of showing warning when Retriever.error signal is emitted
+            extra_data: data to pass to "at_end" function besides task result
+
+        Time spent by task in query, in worker and on "at_end" function are saved by Tracer.
+        """
+
+        query_element = {"method": method, "trace": Tracer().queued(task_name(method))}
+        if method_args:
+            query_element["args"] = method_args
+        if method_kwargs:
+            query_element["kwargs"] = method_kwargs
+        if at_start:
+            query_element["at_start"] = at_start
+        if progress:
+            query_element["progress"] = progress
+        if at_end:
+            query_element["at_end"] = at_end
+        if at_error:
+            query_element["at_error"] = at_error
+        if extra_data:
+            query_element["extra_data"] = extra_data
+
+        self._query.append(query_element)
+        if not self._executing:
+            self._run_next()
+
+
+class SchemaWindow(widget.QWidget):
     # region initial
 
     @property
@@ -120,6 +357,12 @@ class SchemaWindow(widget.QWidget):
         self.main_window = main_window
         self.settings = Settings()
         self.lang = Language()
+
+        self._state = ConnStates.DISCONNECTED
+        # every window has its own task queue, threads are shared with other windows by WorkerPool
+        self.tasks = TaskQueue(self)
+        self._raw_sql_counter = -1
+        self.to_clean = []
         self.set_defaults()
 
         self.resize(core.QSize(int(self.settings.screen_width * 0.65), int(self.settings.screen_height * 0.65)))
@@ -127,8 +370,15 @@ class SchemaWindow(widget.QWidget):
         layout.addWidget(self._get_loader())
         self.setLayout(layout)
 
+        gui.QShortcut(gui.QKeySequence("Ctrl+Shift+D"), self, self.event_open_dev_panel)
+
     def clear(self):
+        for tab in getattr(self, "widget_tabs", {}).values():
+            MemoryBudget().forget(tab)
         clear_layout(self.layout())
+        for window in ("search_window", "history_window", "diff_window", "schema_diff_window", "dev_panel"):
+            if hasattr(self, window):
+                getattr(self, window).close()
         for item in self.to_clean:
             if hasattr(self, item):
                 delattr(self, item)
@@ -140,16 +390,25 @@ class SchemaWindow(widget.QWidget):
         self.interface = None
 
     def set_up(self, connection: "Connection"):
+        if geometry := Storage().get_state("schema_window.geometry"):
+            self.restoreGeometry(core.QByteArray.fromBase64(geometry.encode()))
+
         self.initiated = True
         self.connection = connection
-        self.interface = Interface("sqlite")  # TODO: self.interface = Interface(connection.type)
+        # windows of the same database share engine and metadata cache
+        self.interface = EngineRegistry().acquire(connection)
         self.state = ConnStates.DISCONNECTED
         self.sql_connect()
 
     def closeEvent(self, event):
+        Storage().set_state("schema_window.geometry", bytes(self.saveGeometry().toBase64()).decode())
+        # queued tasks are not needed anymore, engine is released after the running one
+        self.tasks.clear()
+        if self.connection is not None:
+            self.run_parallel_task(EngineRegistry().release, method_args=(self.connection,))
         self.set_defaults()
         self.clear()
-        self.main_window.windows.connection_manager.show()
+        self.main_window.windows.schema_window_closed()
         super().hide()
 
     def show(self, *args, **kwargs):
@@ -185,7 +444,26 @@ class SchemaWindow(widget.QWidget):
         left_pane.addWidget(self.widget_filter)
         left_pane.addWidget(self.widget_table_list)
         # left_pane.addWidget(self.widget_disconnect_btn)
-        left_pane.addWidget(self.widget_schema_box)
+        if self.interface.supports("attach"):
+            # other database files are attached as schemas, so their tables are joined inside one engine
+            attach = widget.QToolButton()
+            attach.setText("+")
+            attach.setToolTip(self.lang.sw_tip_attach)
+            attach.setPopupMode(widget.QToolButton.ToolButtonPopupMode.InstantPopup)
+            attach_menu = widget.QMenu(attach)
+            attach_menu.addAction(self.lang.sw_act_attach, self.event_attach_database)
+            detach = attach_menu.addAction(self.lang.sw_act_detach, self.event_detach_database)
+            attach_menu.aboutToShow.connect(
+                lambda: detach.setEnabled(self.params_get_schema() in self.saved_attachments())
+            )
+            attach.setMenu(attach_menu)
+
+            schema_row = widget.QHBoxLayout()
+            schema_row.addWidget(self.widget_schema_box, 1)
+            schema_row.addWidget(attach)
+            left_pane.addLayout(schema_row)
+        else:
+            left_pane.addWidget(self.widget_schema_box)
         # endregion
 
         # region right_pane
@@ -193,10 +471,11 @@ class SchemaWindow(widget.QWidget):
         self.widget_tab_holder.setObjectName("WidgetTabHolder")
         self.widget_tab_holder.setTabsClosable(True)
         self.widget_tab_holder.tabCloseRequested.connect(self.tab_close)
+        self.widget_tab_holder.currentChanged.connect(self.event_change_tab)
 
         self.widget_tab_holder.addTab(self.create_tab(default=True), self.lang.sw_widget_tab_holder_empty)
         self.widget_tab_holder.tabBar().setTabButton(0, BTN_AT_RIGHT, None)
-        self.widget_tabs: dict[str, SeeqlerTab] = dict()
+        self.widget_tabs: dict[tuple[str | None, str], SeeqlerTab] = dict()
 
         self.to_clean.extend(("widget_tab_holder", "widget_tabs"))
 
@@ -229,9 +508,37 @@ class SchemaWindow(widget.QWidget):
         self.toolbar_wrapper.setFrameShape(widget.QFrame.Shape.StyledPanel)
         sql_raw = widget.QToolButton(self.toolbar_wrapper)
         sql_raw.setIcon(gui.QIcon(str(self.settings.resources_path / "icons" / "raw_sql.png")))
-        sql_raw.clicked.connect(
-            lambda: self.create_tab(f"__sql_raw_{self.raw_sql}", raw=True, title=self.lang.sw_widget_tab_holder_raw)
-        )
+        sql_raw.clicked.connect(lambda: self.open_raw_tab())
+        search = widget.QToolButton(self.toolbar_wrapper)
+        search.setText(self.lang.sw_btn_search)
+        search.setShortcut(gui.QKeySequence.StandardKey.Find)
+        search.clicked.connect(self.event_open_search)
+        history = widget.QToolButton(self.toolbar_wrapper)
+        history.setText(self.lang.sw_btn_history)
+        history.setShortcut(gui.QKeySequence("Ctrl+H"))
+        history.clicked.connect(self.event_open_history)
+        diff = widget.QToolButton(self.toolbar_wrapper)
+        diff.setText(self.lang.sw_btn_diff)
+        diff.setPopupMode(widget.QToolButton.ToolButtonPopupMode.InstantPopup)
+        diff_menu = widget.QMenu(diff)
+        diff_menu.addAction(self.lang.sw_act_diff_tables, self.event_open_diff)
+        diff_menu.addAction(self.lang.sw_act_diff_schemas, self.event_open_schema_diff)
+        diff.setMenu(diff_menu)
+        connections = widget.QToolButton(self.toolbar_wrapper)
+        connections.setText(self.lang.sw_btn_connections)
+        connections.setShortcut(gui.QKeySequence.StandardKey.New)
+        connections.clicked.connect(self.event_open_connections)
+
+        toolbar_layout = widget.QHBoxLayout()
+        toolbar_layout.addWidget(sql_raw)
+        toolbar_layout.addWidget(search)
+        toolbar_layout.addWidget(history)
+        toolbar_layout.addWidget(diff)
+        toolbar_layout.addWidget(connections)
+        toolbar_layout.addStretch()
+        toolbar_layout.setSpacing(2)
+        toolbar_layout.setContentsMargins(0, 0, 0, 0)
+        self.toolbar_wrapper.setLayout(toolbar_layout)
         self.toolbar_wrapper.setMaximumHeight(22)
         self.toolbar_wrapper.setMinimumHeight(22)
         # endregion
@@ -251,7 +558,7 @@ class SchemaWindow(widget.QWidget):
     # region Events
 
     def event_disconnect(self):
-        self.interface.disconnect()
+        # engine may be used by other windows, registry disconnects it
         self.closeEvent(None)
 
     def event_change_schema(self, idx: int = None):
@@ -260,12 +567,82 @@ class SchemaWindow(widget.QWidget):
         self.sql_get_tables_from_schema(self.widget_schema_box.currentText())
 
     def event_change_table(self, idx: core.QModelIndex):
-        text = self.widget_table_list.item(idx.row()).text()
+        self.open_table(self.widget_table_list.item(idx.row()).text())
 
-        if text in getattr(self, "widget_tabs", {}):
-            self.widget_tab_holder.setCurrentWidget(self.widget_tabs[text])
-        else:
-            self.sql_get_table_meta(text)
+    def event_change_tab(self, idx: int):
+        tab = self.widget_tab_holder.widget(idx)
+        if isinstance(tab, SeeqlerTab):
+            tab.activate()
+
+    def event_attach_database(self):
+        path, _ = widget.QFileDialog.getOpenFileName(self, self.lang.sw_act_attach, "")
+        if not path:
+            return
+        name, ok = widget.QInputDialog.getText(
+            self, self.lang.sw_act_attach, self.lang.sw_lbl_attach_name, text=re.sub(r"\W", "_", Path(path).stem)
+        )
+        if ok and name:
+            self.sql_attach(path, name)
+
+    def event_detach_database(self):
+        if (schema := self.params_get_schema()) in self.saved_attachments():
+            self.sql_detach(schema)
+
+    def event_open_search(self):
+        if not hasattr(self, "search_window"):
+            self.search_window = SearchWindow(self)
+            self.to_clean.append("search_window")
+        self.search_window.show()
+
+    def event_open_history(self):
+        if not hasattr(self, "history_window"):
+            self.history_window = HistoryWindow(self)
+            self.to_clean.append("history_window")
+        self.history_window.show()
+
+    def event_open_diff(self):
+        if not hasattr(self, "diff_window"):
+            self.diff_window = TableDiffWindow(self)
+            self.to_clean.append("diff_window")
+        # table of the current tab is compared by default
+        tab = self.widget_tab_holder.currentWidget()
+        same_schema = isinstance(tab, SeeqlerTab) and not tab.raw and tab.schema == self.params_get_schema()
+        self.diff_window.show(tab.table_name if same_schema else None)
+
+    def event_open_schema_diff(self):
+        if not hasattr(self, "schema_diff_window"):
+            self.schema_diff_window = SchemaDiffWindow(self)
+            self.to_clean.append("schema_diff_window")
+        self.schema_diff_window.show()
+
+    def event_open_connections(self):
+        # connection of another window is chosen there
+        self.main_window.windows.connection_manager.show()
+
+    def event_open_dev_panel(self):
+        if not hasattr(self, "dev_panel"):
+            self.dev_panel = DevPanel(self)
+            self.to_clean.append("dev_panel")
+        self.dev_panel.show()
+
+    def open_table(
+        self,
+        name: str,
+        filters: dict[str, str] | None = None,
+        schema: str | None = None,
+        exact: dict[str, Any] | None = None,
+    ):
+        # tables of different schemas may have the same name, so tabs are kept by both of them
+        key = (schema or self.params_get_schema(), name)
+        if key not in getattr(self, "widget_tabs", {}):
+            self.sql_get_table_meta(key, filters, exact)
+            return
+
+        tab = self.widget_tabs[key]
+        self.widget_tab_holder.setCurrentWidget(tab)
+        if filters is not None or exact is not None:
+            tab.paged_table.set_filters(filters or {}, exact)
+            tab.load_table_contents()
 
     def filter_table_list(self, text):
         for index in range(self.widget_table_list.count()):
@@ -277,27 +654,56 @@ class SchemaWindow(widget.QWidget):
     # region Tab GUI
 
     def create_tab(
-        self, table_name: str = None, columns: list[dict] = None, *, raw=False, default=False, title: str = None
+        self,
+        table_name: str = None,
+        columns: list[dict] = None,
+        *,
+        schema: str | None = None,
+        raw=False,
+        default=False,
+        title: str = None,
     ):
         if default or columns is None and not raw or table_name is None:
             return self.get_default_tab_widget()
 
-        tab = SeeqlerTab(self, table_name, columns, raw=raw)
+        tab = SeeqlerTab(self, table_name, columns, schema=schema, raw=raw)
+        if title is None and schema not in (None, getattr(self, "current_schema", None)):
+            title = f"{schema}.{table_name}"  # tables of default schema are shown by name only
 
         if not getattr(self, "widget_tabs", None):
             self.widget_tab_holder.removeTab(0)
-            self.widget_tabs: dict[str, SeeqlerTab] = dict()
+            self.widget_tabs: dict[tuple[str | None, str], SeeqlerTab] = dict()
 
-        self.widget_tabs[table_name] = tab
+        self.widget_tabs[tab.key] = tab
         self.widget_tab_holder.addTab(tab, title if title else table_name)
         self.widget_tab_holder.setCurrentWidget(tab)
         tab.focus()
         return tab
 
-    def fillup_table(self, table_name: str, data: list[list[Any]]):
-        tab = self.widget_tabs[table_name]
+    def open_raw_tab(self, request: str = "", execute: bool = False) -> SeeqlerTab:
+        tab = self.create_tab(f"__sql_raw_{self.raw_sql}", raw=True, title=self.lang.sw_widget_tab_holder_raw)
+        tab.paged_table.textarea.setPlainText(request)
+        if execute:
+            tab.paged_table.execute()
+        return tab
+
+    def fillup_table(self, key: tuple[str | None, str], data: list[list[Any]]):
+        tab = self.widget_tabs[key]
         tab.fillup_table(data)
 
+    def enforce_memory_budget(self):
+        """
+        Evict data of background tabs if all the tabs take more memory than the budget, update tabs' tooltips.
+        """
+        # tabs shown by all the windows are kept
+        windows = self.main_window.windows.schema_windows
+        MemoryBudget().enforce(
+            *(x.widget_tab_holder.currentWidget() for x in windows if hasattr(x, "widget_tab_holder"))
+        )
+        for idx in range(self.widget_tab_holder.count()):
+            if isinstance(tab := self.widget_tab_holder.widget(idx), SeeqlerTab):
+                self.widget_tab_holder.setTabToolTip(idx, tab.memory_tooltip())
+
     def get_default_tab_widget(self):
         tab = widget.QWidget()
         layout = widget.QVBoxLayout()
@@ -307,7 +713,10 @@ class SchemaWindow(widget.QWidget):
 
     def tab_close(self, idx: int):
         tab: SeeqlerTab = self.widget_tab_holder.widget(idx)
-        del self.widget_tabs[tab.table_name]
+        del self.widget_tabs[tab.key]
+        if not tab.raw:
+            tab.paged_table.watch_timer.stop()
+        MemoryBudget().forget(tab)
 
         self.widget_tab_holder.removeTab(idx)
 
@@ -328,60 +737,6 @@ class SchemaWindow(widget.QWidget):
 
     # region Background tasks
 
-    def _run_next(self) -> None:
-        """
-        Run next element of task query.
-        """
-
-        try:
-            el = self._query.pop(0)
-        except IndexError:
-            self._executing_query = False
-            return
-
-        if self._executing_query:
-            return
-
-        method, method_args, method_kwargs = el["method"], el.get("args", list()), el.get("kwargs", dict())
-        at_start, progress, at_end = el.get("at_start"), el.get("progress"), el.get("at_end")
-        extra_data = el.get("extra_data")
-
-        # create thread and worker, move worker to thread
-        self.thread = core.QThread()
-        self.worker = Retriever(method, mth_args=method_args, mth_kwargs=method_kwargs, extra_data=extra_data)
-        self.worker.moveToThread(self.thread)
-
-        # connect Qt-signals to start work and clean up after it
-        self.thread.started.connect(self.worker.run)
-        self.worker.finished.connect(self.thread.quit)
-        # qt deletion
-        self.worker.finished.connect(self.worker.deleteLater)
-        self.thread.finished.connect(self.thread.deleteLater)
-
-        # manual deletion and run next step
-        self.thread.finished.connect(self._clean_up)
-
-        # connect callbacks to signals
-        if at_start:
-            self.worker.started.connect(at_start)
-        if progress:
-            self.worker.progress.connect(progress)
-        if at_end:
-            self.worker.finished.connect(at_end)
-
-        # start thread and worker
-        self.thread.start()
-        self._executing_query = True
-
-    def _clean_up(self) -> None:
-        """
-        Delete obsolete threads and workers. Stop executing query and try to execute next element of it.
-        """
-        del self.thread
-        del self.worker
-        self._executing_query = False
-        self._run_next()
-
     def run_parallel_task(
         self,
         method: Callable,
@@ -391,42 +746,22 @@ class SchemaWindow(widget.QWidget):
         at_start: Callable | None = None,
         progress: Callable | None = None,
         at_end: Callable | None = None,
+        at_error: Callable | None = None,
         extra_data: dict | None = None,
     ) -> None:
         """
-        Adds new element to query of background tasks to run to. All the elements will be executed one by one at new
-        threads using Retriever-class workers.
-
-        If query is executing at the moment, new element will be just pushed to end of it. Otherwise, new element
-        will be run immediately.
-
-        Args:
-            method: function to run
-            method_args: positional arguments to pass to function
-            method_kwargs: keyword arguments to pass to function
-            at_start: function to run when Retriever.started signal is emitted
-            progress: function to run when Retriever.progress signal is emitted
-            at_end: function to run when Retriever.finished signal is emitted
-            extra_data: data to pass to "at_end" function besides task result
+        Add task to queue of the window, see ``TaskQueue.run_parallel_task``.
         """
-
-        query_element = {"method": method}
-        if method_args:
-            query_element["args"] = method_args
-        if method_kwargs:
-            query_element["kwargs"] = method_kwargs
-        if at_start:
-            query_element["at_start"] = at_start
-        if progress:
-            query_element["progress"] = progress
-        if at_end:
-            query_element["at_end"] = at_end
-        if extra_data:
-            query_element["extra_data"] = extra_data
-
-        self._query.append(query_element)
-        if not self._executing_query:
-            self._run_next()
+        self.tasks.run_parallel_task(
+            method,
+            method_args,
+            method_kwargs,
+            at_start=at_start,
+            progress=progress,
+            at_end=at_end,
+            at_error=at_error,
+            extra_data=extra_data,
+        )
 
     # endregion
 
@@ -440,10 +775,91 @@ class SchemaWindow(widget.QWidget):
     @core.pyqtSlot(object)
     def sql_connect_after(self):
         self.state = ConnStates.CONNECTED
+        if self.interface.supports("attach") and (attachments := self.saved_attachments()):
+            self.run_parallel_task(
+                self.sql_restore_attachments, method_args=(attachments,), at_end=self.sql_restore_attachments_after
+            )
         self.sql_get_schema_names()
 
     # -----
 
+    def saved_attachments(self) -> dict[str, str]:
+        """
+        Get database files attached to connection (schema name: path), they are attached again on connect.
+        """
+        return Storage().get_state(f"attachments:{self.connection.connection_string}", {})
+
+    def sql_restore_attachments(self, attachments: dict[str, str]) -> dict[str, str]:
+        failed = {}
+        for name, path in attachments.items():
+            try:
+                self.interface.attach(path, name)
+            except ValueError:
+                pass  # engine is shared with another window of the connection, it has attached the file already
+            except (OSError, sa.exc.DBAPIError) as e:
+                failed[name] = str(e)  # file is moved or broken: connection works without it
+        return failed
+
+    @core.pyqtSlot(object)
+    def sql_restore_attachments_after(self, failed: dict[str, str]):
+        if failed:
+            errors = "\n".join(f"{name}: {error}" for name, error in failed.items())
+            widget.QMessageBox.warning(
+                self, self.lang.sw_task_error_title, self.lang.sw_attach_restore_error.format(errors=errors)
+            )
+
+    def sql_attach(self, path: str, name: str):
+        self.run_parallel_task(
+            self.interface.attach,
+            method_args=(path, name),
+            at_end=self.sql_attach_after,
+            extra_data={"path": path, "name": name},
+        )
+
+    @core.pyqtSlot(object)
+    def sql_attach_after(self, data: dict):
+        attachments = self.saved_attachments()
+        attachments[data["name"]] = data["path"]
+        Storage().set_state(f"attachments:{self.connection.connection_string}", attachments)
+        self.interface.metadata.invalidate(data["name"])
+        self.sql_refresh_schema_names(select=data["name"])
+
+    def sql_detach(self, name: str):
+        self.run_parallel_task(
+            self.interface.detach, method_args=(name,), at_end=self.sql_detach_after, extra_data={"name": name}
+        )
+
+    @core.pyqtSlot(object)
+    def sql_detach_after(self, data: dict):
+        attachments = self.saved_attachments()
+        attachments.pop(data["name"], None)
+        Storage().set_state(f"attachments:{self.connection.connection_string}", attachments)
+        self.interface.metadata.invalidate(data["name"])
+        self.sql_refresh_schema_names()
+
+    def sql_refresh_schema_names(self, select: str | None = None):
+        self.run_parallel_task(
+            self.interface.inspector.get_schema_names,
+            at_end=self.sql_refresh_schema_names_after,
+            extra_data={"select": select},
+        )
+
+    @core.pyqtSlot(object)
+    def sql_refresh_schema_names_after(self, data: dict):
+        # unlike ``sql_get_schema_names_after``, layout and open tabs are kept
+        self.result_schema_names, current = data["data"], self.params_get_schema()
+        selected = data["select"] if data["select"] in self.result_schema_names else current
+
+        self.widget_schema_box.blockSignals(True)
+        self.widget_schema_box.clear()
+        self.widget_schema_box.addItems(self.result_schema_names)
+        self.widget_schema_box.setCurrentIndex(max(self.widget_schema_box.findText(selected), 0))
+        self.widget_schema_box.blockSignals(False)
+        if self.widget_schema_box.currentText() != current:
+            self.event_change_schema()
+
+    # -----
+
     def sql_get_schema_names(self):
         self.run_parallel_task(method=self.interface.inspector.get_schema_names, at_end=self.sql_get_schema_names_after)
 
@@ -473,60 +889,205 @@ class SchemaWindow(widget.QWidget):
 
     # -----
 
-    def sql_get_table_meta(self, name):
-        def method(table, schema=None):
-            cols = self.interface.inspector.get_columns(table, schema=schema)
-            fkeys = {
-                fk["constrained_columns"][0]: "{referred_schema}.{referred_table}({referred_columns[0]})".format(**fk)
-                for fk in self.interface.inspector.get_foreign_keys(table, schema=schema)
-            }
-
-            for col in cols:
-                col["fkey"] = fkeys.get(col["name"])
-            return cols
+    def sql_get_table_meta(
+        self, key: tuple[str | None, str], filters: dict[str, str] | None = None, exact: dict[str, Any] | None = None
+    ):
+        def method(schema, table):
+            meta = self.interface.metadata.table(table, schema)
+            if meta.row_key is None:
+                meta.row_key = self.interface.row_key(table, schema)
+            return meta.columns
 
         self.run_parallel_task(
             method=method,
-            method_args=(name, self.params_get_schema()),
+            method_args=key,
             at_end=self.sql_get_table_meta_after,
-            extra_data={"name": name},
+            extra_data={"key": key, "filters": filters, "exact": exact},
         )
 
     @core.pyqtSlot(object)
     def sql_get_table_meta_after(self, data: dict):
-        table = data.get("name")
+        schema, table = data.get("key")
         columns = data.get("data")
-        tab = self.create_tab(table, columns)
+        tab = self.create_tab(table, columns, schema=schema)
+        if data.get("filters") or data.get("exact"):
+            tab.paged_table.set_filters(data.get("filters") or {}, data.get("exact"))
         tab.load_table_contents()
 
     # -----
 
-    def sql_get_table_contents(self, name, offset: int = 0, limit: int = 100, select: str = "*"):
-        def get_table_data(table: str, limit_: int, offset_: int, select_: str):
-            data, _ = self.interface.select(what=select_, from_=table, limit=limit_, offset=offset_)
-            (rows,) = self.interface.select(what="count(*) ", from_=table)[0][0]
-            return {"contents": data, "rows": rows}
+    def sql_get_table_contents(
+        self,
+        key: tuple[str | None, str],
+        offset: int = 0,
+        limit: int = 100,
+        select: str = "*",
+        sample: bool = False,
+        where: list[str] | None = None,
+        order: str | None = None,
+        params: dict | None = None,
+        prepare: Callable[[Any], "FormattedPage"] | None = None,
+        prefetch: Callable[[Any], None] | None = None,
+    ):
+        where = where or None
+
+        def get_table_data(table: str, limit_: int, offset_: int, select_: str, schema: str | None):
+            if sample:
+                # no count(*) here: sampling must not scan the table
+                data, _ = self.interface.sample(table, what=select_, size=limit_, schema=schema)
+                if prefetch is not None:
+                    prefetch(data)
+                return {"contents": data, "rows": None, "page": prepare(data) if prepare else None}
+
+            # sorting and filtering are done by database only, with user input passed as bound parameters
+            from_ = quote_table(self.interface.engine, table, schema)
+            data, _ = self.interface.select(
+                what=select_, from_=from_, where=where, order=order, limit=limit_, offset=offset_, params=params
+            )
+            (rows,) = self.interface.select(what="count(*) ", from_=from_, where=where, params=params)[0][0]
+            if prefetch is not None:
+                prefetch(data)  # rows referred by foreign keys of the whole page are requested at once
+            # cells are formatted here too, so GUI thread only shows them
+            return {"contents": data, "rows": rows, "page": prepare(data) if prepare else None}
 
         self.run_parallel_task(
             method=get_table_data,
-            method_kwargs={"table": name, "offset_": offset, "limit_": limit, "select_": select},
+            method_kwargs={
+                "table": key[1],
+                "offset_": offset,
+                "limit_": limit,
+                "select_": select,
+                "schema": key[0],
+            },
             at_end=self.sql_filling_table,
-            extra_data={"name": name},
+            extra_data={"key": key},
+        )
+
+    def sql_check_changes(self, key: tuple[str | None, str]):
+        schema, name = key
+        self.run_parallel_task(
+            self.interface.change_marker,
+            method_args=(name, schema),
+            at_end=self.sql_check_changes_after,
+            at_error=self.sql_check_changes_failed,
+            extra_data={"key": key},
         )
 
-    def sql_run_raw_sql(self, tab_name: str, request: str):
+    @core.pyqtSlot(object)
+    def sql_check_changes_after(self, data: dict):
+        if tab := getattr(self, "widget_tabs", {}).get(data["key"]):
+            tab.watch_checked(data["data"])
+
+    @core.pyqtSlot(object)
+    def sql_check_changes_failed(self, data: dict):
+        # polls are repeated by timer, so they are reported by tab instead of warning on every poll
+        if tab := getattr(self, "widget_tabs", {}).get(data["key"]):
+            tab.watch_failed(data["error"])
+
+    def sql_get_table_profile(self, key: tuple[str | None, str]):
+        schema, name = key
+        tab = self.widget_tabs[key]
+        meta = self.interface.metadata.table(name, schema)
+        cache_key = f"profile:{meta.schema}.{name}"
+        if not meta.profile:
+            # profiles computed by previous sessions are kept in application database for a day
+            meta.profile = Storage().get_cached(
+                self.connection.connection_string, cache_key, max_age=PROFILE_CACHE_TIME
+            )
+
+        if meta.profile:
+            tab.paged_table.fillup_profile(meta.profile)
+            return
+
         self.run_parallel_task(
-            self.interface.raw,
-            method_args=(request,),
+            method=profile_table,
+            method_args=(self.interface, name, meta.schema),
+            progress=tab.paged_table.profile_progress,
+            at_end=self.sql_get_table_profile_after,
+            at_error=self.sql_get_table_profile_failed,
+            extra_data={"key": key, "cache_key": cache_key},
+        )
+
+    @core.pyqtSlot(object)
+    def sql_get_table_profile_failed(self, data: dict):
+        if tab := getattr(self, "widget_tabs", {}).get(data["key"]):
+            tab.paged_table.profile_failed(data["error"])
+
+    @core.pyqtSlot(object)
+    def sql_get_table_profile_after(self, data: dict):
+        Storage().set_cached(self.connection.connection_string, data["cache_key"], data.get("data"))
+
+        if tab := getattr(self, "widget_tabs", {}).get(data.get("key")):
+            tab.paged_table.fillup_profile(data.get("data"))
+
+    def sql_run_raw_sql(
+        self,
+        key: tuple[str | None, str],
+        request: str,
+        prepare: Callable[[Any], dict] | None = None,
+        snapshot: bool = False,
+        progress: Callable | None = None,
+    ):
+        def method(request_: str, connection: str, signal):
+            started_at, start = time.time(), time.perf_counter()
+            if snapshot:
+                # rows are written to local file batch by batch instead of being kept in memory
+                data, columns = materialize(self.interface, request_, signal=signal)
+            else:
+                data, columns = self.interface.raw(request_)
+            duration = time.perf_counter() - start
+
+            match columns:
+                case "error":
+                    row_count, error = None, str(data)
+                case "norows":
+                    row_count, error = data, None
+                case _:
+                    row_count, error = data.rows if snapshot else len(data), None
+            QueryHistory().record(connection, request_, started_at, duration, row_count, error)
+            page = prepare(data) if prepare is not None and not isinstance(columns, str) else None
+            return {"result": data, "columns": columns, "page": page}
+
+        self.run_parallel_task(
+            method,
+            method_args=(request, self.connection.connection_string),
+            progress=progress,
             at_end=self.sql_filling_table,
-            extra_data={"name": tab_name},
+            extra_data={"key": key},
         )
 
+    def sql_prepare_page(self, key: tuple[str | None, str], prepare: Callable[[Any], dict], result: Any):
+        self.run_parallel_task(prepare, method_args=(result,), at_end=self.sql_filling_table, extra_data={"key": key})
+
+    def sql_snapshot_result(self, key: tuple[str | None, str], prepare: Callable[[Any], dict], result: Any):
+        def method(result_: Any):
+            snapshot = ResultSnapshot.from_result(result_)
+            return {"result": snapshot, "columns": snapshot.columns, "page": prepare(snapshot)}
+
+        self.run_parallel_task(method, method_args=(result,), at_end=self.sql_filling_table, extra_data={"key": key})
+
+    def sql_export_csv(self, key: tuple[str | None, str], result: "ColumnarResult | ResultSnapshot", path: str):
+        def method(result_: "ColumnarResult | ResultSnapshot", path_: str):
+            with open(path_, "w", newline="", encoding="utf-8") as file:
+                result_.to_csv(file)
+
+        self.run_parallel_task(
+            method,
+            method_args=(result, path),
+            at_end=self.sql_export_csv_after,
+            extra_data={"key": key, "path": path},
+        )
+
+    @core.pyqtSlot(object)
+    def sql_export_csv_after(self, data: dict):
+        if tab := getattr(self, "widget_tabs", {}).get(data["key"]):
+            tab.paged_table.export_finished(data["path"])
+
     @core.pyqtSlot(object)
     def sql_filling_table(self, data: dict):
-        table_name = data.get("name")
+        key = data.get("key")
         contents = data.get("data")
 
-        self.fillup_table(table_name, contents)
+        self.fillup_table(key, contents)
 
     # endregion
@@ -0,0 +1,242 @@
+from threading import Event
+from typing import TYPE_CHECKING
+
+from PyQt6 import QtCore as core
+from PyQt6 import QtWidgets as widget
+
+from ..common.language import Language
+from ..sql.fulltext import FullTextIndex
+from ..sql.search import SearchHit, search_data, search_names
+from .custom import CheckList
+
+if TYPE_CHECKING:
+    from .schema import SchemaWindow
+
+
+class SearchWindow(widget.QWidget):
+    """
+    Search for tables, columns and values over the current connection.
+    """
+
+    HEADERS = ("kind", "table", "column", "value")
+
+    def __init__(self, parent: "SchemaWindow"):
+        super().__init__()
+
+        self.daddy = parent
+        self.lang = Language()
+        self.cancel = None
+        self.indexing = False
+        self.fulltext = FullTextIndex(parent.connection.connection_string)
+
+        self.setWindowTitle(self.lang.srch_win_title)
+        self.resize(core.QSize(700, 450))
+
+        self.input = widget.QLineEdit()
+        self.input.setPlaceholderText(self.lang.srch_inp_placeholder)
+        self.input.textChanged.connect(self.search_names)
+        self.input.returnPressed.connect(self.search_data)
+
+        self.btn_data = widget.QPushButton(self.lang.srch_btn_data)
+        self.btn_data.clicked.connect(self.search_data)
+        self.btn_stop = widget.QPushButton(self.lang.srch_btn_stop)
+        self.btn_stop.clicked.connect(self.stop)
+        self.btn_stop.setDisabled(True)
+        self.btn_index = widget.QPushButton(self.lang.srch_btn_index)
+        self.btn_index.clicked.connect(self.configure_index)
+
+        input_layout = widget.QHBoxLayout()
+        input_layout.addWidget(self.input)
+        input_layout.addWidget(self.btn_data)
+        input_layout.addWidget(self.btn_stop)
+        input_layout.addWidget(self.btn_index)
+
+        self.results = widget.QTableWidget()
+        self.results.setColumnCount(len(self.HEADERS))
+        self.results.setHorizontalHeaderLabels([self.lang.get(f"srch_hdr_{x}") for x in self.HEADERS])
+        self.results.horizontalHeader().setStretchLastSection(True)
+        self.results.setEditTriggers(widget.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.results.setSelectionBehavior(widget.QAbstractItemView.SelectionBehavior.SelectRows)
+        self.results.doubleClicked.connect(self.open_hit)
+
+        self.statusbar = widget.QLabel()
+
+        layout = widget.QVBoxLayout()
+        layout.addLayout(input_layout)
+        layout.addWidget(self.results)
+        layout.addWidget(self.statusbar)
+        self.setLayout(layout)
+
+    def show(self):
+        super().show()
+        self.raise_()
+        self.input.setFocus()
+        self.warm_up()
+
+    def warm_up(self):
+        # load columns of every table in background, so search by names becomes instant
+        metadata = self.daddy.interface.metadata
+        schema = self.daddy.params_get_schema()
+        if not metadata.is_loaded(schema):
+            self.statusbar.setText(self.lang.srch_status_loading)
+            self.daddy.run_parallel_task(method=metadata.load_schema, method_args=(schema,), at_end=self.warm_up_after)
+        elif self.fulltext.tables(schema):
+            self.update_index()
+
+    @core.pyqtSlot(object)
+    def warm_up_after(self, _):
+        self.statusbar.clear()
+        self.search_names()
+        if self.fulltext.tables(self.daddy.params_get_schema()):
+            self.update_index()
+
+    # region Full-text index
+
+    def configure_index(self):
+        schema = self.daddy.params_get_schema()
+        metadata = self.daddy.interface.metadata
+        if not metadata.is_loaded(schema):
+            return
+
+        indexed = self.fulltext.tables(schema)
+        choices = [
+            (table, column) for table, meta in metadata.load_schema(schema).items() for column in meta.text_columns
+        ]
+
+        dialog = widget.QDialog(self)
+        dialog.setWindowTitle(self.lang.srch_win_title_index)
+        dialog.setFixedSize(400, 500)
+
+        items = [
+            (table in indexed and column in indexed[table].columns, f"{table}.{column}") for table, column in choices
+        ]
+        checklist = CheckList(items, show_header=self.lang.srch_hdr_index)
+
+        ok_btn = widget.QPushButton(self.lang.qst_inp_ok)
+        ok_btn.clicked.connect(dialog.accept)
+        cancel_btn = widget.QPushButton(self.lang.qst_inp_cancel)
+        cancel_btn.clicked.connect(dialog.reject)
+
+        btn_layout = widget.QHBoxLayout()
+        btn_layout.addStretch()
+        btn_layout.addWidget(ok_btn)
+        btn_layout.addWidget(cancel_btn)
+
+        layout = widget.QVBoxLayout()
+        layout.addWidget(widget.QLabel(self.lang.srch_lbl_index))
+        layout.addWidget(checklist)
+        note = widget.QLabel(self.lang.srch_lbl_index_updates)
+        note.setWordWrap(True)
+        layout.addWidget(note)
+        layout.addLayout(btn_layout)
+        dialog.setLayout(layout)
+
+        if dialog.exec() == widget.QDialog.DialogCode.Accepted:
+            selection: dict[str, list[str]] = {}
+            for (table, column), (checked, _) in zip(choices, checklist.getValue()):
+                if checked:
+                    selection.setdefault(table, []).append(column)
+            self.fulltext.configure(schema, selection)
+            self.update_index()
+        dialog.deleteLater()
+
+    def update_index(self):
+        if self.indexing:
+            return
+
+        self.indexing = True
+        self.fulltext.start_update()
+        self.index_step()
+
+    def index_step(self):
+        self.daddy.run_parallel_task(
+            method=self.fulltext.index_step,
+            method_args=(self.daddy.interface, self.daddy.params_get_schema()),
+            at_end=self.index_step_after,
+            at_error=self.index_step_failed,
+        )
+
+    @core.pyqtSlot(object)
+    def index_step_failed(self, data: dict):
+        # index is updated again next time the window is shown
+        self.indexing = False
+        self.statusbar.setText(self.lang.srch_status_index_error.format(error=data["error"]))
+
+    @core.pyqtSlot(object)
+    def index_step_after(self, data: dict | None):
+        if data is None:
+            self.indexing = False
+            self.statusbar.setText(self.lang.srch_status_indexed)
+            return
+
+        self.statusbar.setText(self.lang.srch_status_indexing.format(**data))
+        self.index_step()
+
+    # endregion
+
+    @core.pyqtSlot(object)
+    def add_hits(self, hits: list[SearchHit]):
+        row = self.results.rowCount()
+        self.results.setRowCount(row + len(hits))
+        for row, hit in enumerate(hits, start=row):
+            for col, value in enumerate((self.lang.get(f"srch_kind_{hit.kind}"), hit.table, hit.column, hit.value)):
+                item = widget.QTableWidgetItem("" if value is None else value)
+                item.setData(core.Qt.ItemDataRole.UserRole, hit)
+                self.results.setItem(row, col, item)
+        self.statusbar.setText(self.lang.srch_status_found.format(count=self.results.rowCount()))
+
+    def search_names(self, *_):
+        if self.cancel is not None:
+            return  # do not mess up data search results
+
+        text = self.input.text()
+        self.results.setRowCount(0)
+        self.add_hits(search_names(self.daddy.interface.metadata, text, self.daddy.params_get_schema()))
+
+    def search_data(self):
+        text = self.input.text()
+        if not text or self.cancel is not None:
+            return
+
+        self.search_names()
+        self.cancel = Event()
+        self.btn_data.setDisabled(True)
+        self.btn_stop.setEnabled(True)
+        self.statusbar.setText(self.lang.srch_status_searching)
+
+        self.daddy.run_parallel_task(
+            method=search_data,
+            method_args=(self.daddy.interface, text, self.daddy.params_get_schema()),
+            method_kwargs={"cancel": self.cancel, "fulltext": self.fulltext},
+            progress=self.add_hits,
+            at_end=self.search_data_after,
+            at_error=self.search_data_failed,
+        )
+
+    def search_data_finished(self):
+        # window is ready for the next search in any case
+        self.cancel = None
+        self.btn_data.setEnabled(True)
+        self.btn_stop.setDisabled(True)
+
+    @core.pyqtSlot(object)
+    def search_data_failed(self, data: dict):
+        self.search_data_finished()
+        self.statusbar.setText(self.lang.srch_status_error.format(error=data["error"]))
+
+    @core.pyqtSlot(object)
+    def search_data_after(self, _):
+        self.search_data_finished()
+        self.statusbar.setText(self.lang.srch_status_done.format(count=self.results.rowCount()))
+
+    def stop(self):
+        if self.cancel is not None:
+            self.cancel.set()
+
+    def open_hit(self, idx: core.QModelIndex):
+        hit: SearchHit = self.results.item(idx.row(), 0).data(core.Qt.ItemDataRole.UserRole)
+        self.daddy.open_table(hit.table)
+
+    def closeEvent(self, event):
+        self.stop()
+        super().closeEvent(event)